@@ -1,37 +1,201 @@
 from backend.core.logger import logger
-from backend.core.context import request_id_ctx_var
-from backend.core.exceptions import AppError
-import uuid
+from backend.core.context import request_id_ctx_var, deadline_ctx_var, metadata_value, new_request_id, MAX_DEADLINE_SECONDS
+from backend.core.exceptions import AppError, DeadlineExceededError
+from backend.core import metrics
+from backend.core.tracing import tracer
+from backend.core.config import Config
+from backend.core.database import diagnostics
+from backend.core import profiling
+from backend.core.admission import AdmissionController, enqueued_at
+from backend.core.ratelimit import RateLimiter, client_identity
+from backend.core.grpc_options import CompressionPolicy
+from contextlib import ExitStack, nullcontext
+from typing import Dict, Optional, Tuple
+import time
 import grpc
 
+# Reusable stand-in for tracer.server_span() when tracing is off; yields None like an unsampled span
+_NO_TRACE = nullcontext()
+
+def _status_name(e: Exception) -> str:
+    return e.grpc_status.name if isinstance(e, AppError) else "INTERNAL"
+
+def _deadline(context):
+    """Converts the RPC's remaining time into an absolute monotonic deadline (None without one)."""
+    remaining = context.time_remaining()
+    if remaining is None or remaining > MAX_DEADLINE_SECONDS:
+        return None
+    return time.monotonic() + remaining
+
+def _check_deadline(deadline) -> None:
+    # The call may have waited in the executor queue past its deadline; skip the work
+    if deadline is not None and deadline <= time.monotonic():
+        raise DeadlineExceededError()
+
+def _mark_span(span, code: str, e: Exception) -> None:
+    if span is not None:
+        span.set_error(e.message if isinstance(e, AppError) else code)
+
+def _server_span(method: str, request_id: str, metadata):
+    if tracer.exporter is None:
+        return _NO_TRACE
+    return tracer.server_span(method, request_id, metadata_value(metadata, "traceparent"))
+
 class GlobalGrpcInterceptor(grpc.ServerInterceptor):
+    def __init__(self, admission_controller: Optional[AdmissionController] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 compression: Optional[CompressionPolicy] = None):
+        # Admission/rate-limit state and the compression policy are shared by every RPC (None disables each)
+        self.admission = admission_controller
+        self.rate_limiter = rate_limiter
+        self.compression = compression
+        # method -> (servicer handler, wrapped handler); wrappers are built once per method
+        self._handlers: Dict[str, Tuple[grpc.RpcMethodHandler, grpc.RpcMethodHandler]] = {}
+
     def intercept_service(self, continuation, handler_call_details):
         handler = continuation(handler_call_details)
         if handler is None:
             return None
-            
-        def wrapper(request, context):
-            # Extract request ID from metadata
-            metadata = dict(context.invocation_metadata())
-            request_id = metadata.get('x-request-id', str(uuid.uuid4()))
-            
-            # Set context variable
-            token = request_id_ctx_var.set(request_id)
-            
-            try:
-                logger.info(f"Processing request: {handler_call_details.method}")
-                return handler.unary_unary(request, context)
-            except AppError as e:
-                logger.warning(f"Domain Error: {e.code} - {e.message}")
+
+        method = handler_call_details.method
+        cached = self._handlers.get(method)
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+        wrapped = self._wrap(method, handler)
+        self._handlers[method] = (handler, wrapped)
+        return wrapped
+
+    def _wrap(self, method: str, handler: grpc.RpcMethodHandler) -> grpc.RpcMethodHandler:
+        method_name = method.rsplit("/", 1)[-1]
+        controller = self.admission
+        rate_limiter = self.rate_limiter
+        compression = self.compression if self.compression and self.compression.applies_to(method_name) else None
+        sql_diagnostics = Config.is_sql_diagnostics_enabled()
+        profiling_enabled = Config.is_profiling_enabled()
+        instrumented = sql_diagnostics or profiling_enabled
+
+        def instrumentation(metadata, request_id):
+            # Development/diagnostic wrappers, only built when one is switched on
+            stack = ExitStack()
+            if sql_diagnostics:
+                stack.enter_context(diagnostics.watch_request(method))
+            if profiling_enabled and profiling.should_profile(dict(metadata)):
+                stack.enter_context(profiling.profile_request(request_id, method))
+            return stack
+
+        def handle_error(e, context):
+            if isinstance(e, AppError):
+                metrics.APP_ERRORS.inc(method, e.code)
+                logger.warning("Domain Error: %s - %s", e.code, e.message)
                 context.set_trailing_metadata((("x-error-code", e.code),))
                 context.abort(e.grpc_status, e.message)
-            except Exception as e:
-                logger.error(f"Unhandled Exception: {e}", exc_info=True)
+            else:
+                logger.error("Unhandled Exception: %s", e, exc_info=True)
                 context.set_trailing_metadata((("x-error-code", "INTERNAL_ERROR"),))
                 context.abort(grpc.StatusCode.INTERNAL, "An unexpected internal error occurred.")
-            finally:
-                # Reset context to prevent leakage
-                request_id_ctx_var.reset(token)
+
+        def wrapper(request, context):
+            # Extract request ID from metadata
+            metadata = context.invocation_metadata()
+            request_id = metadata_value(metadata, 'x-request-id') or new_request_id()
+
+            # Set context variables
+            token = request_id_ctx_var.set(request_id)
+            deadline = _deadline(context)
+            deadline_token = deadline_ctx_var.set(deadline)
+            stats_token = metrics.start_request()
+            start = time.perf_counter()
+            code = "OK"
+            admitted = False
+
+            with _server_span(method, request_id, metadata) as span:
+                try:
+                    _check_deadline(deadline)
+                    if rate_limiter is not None:
+                        rate_limiter.check(method_name, client_identity(metadata, context), request)
+                    if controller is not None:
+                        controller.acquire(method_name)
+                        admitted = True
+                    logger.info("Processing request: %s", method)
+                    if instrumented:
+                        with instrumentation(metadata, request_id):
+                            response = handler.unary_unary(request, context)
+                    else:
+                        response = handler.unary_unary(request, context)
+                    if compression is not None:
+                        compression.compress_response(context, response)
+                    return response
+                except Exception as e:
+                    code = _status_name(e)
+                    _mark_span(span, code, e)
+                    handle_error(e, context)
+                finally:
+                    if span is not None:
+                        span.set_attribute("rpc.grpc.status_code", code)
+                    now = time.perf_counter()
+                    elapsed = now - start
+                    if admitted:
+                        # Include the wait for a worker, which is where overload shows first
+                        controller.release(method_name, now - (enqueued_at() or start))
+                    metrics.finish_request(stats_token, method, code, elapsed)
+                    # Reset context to prevent leakage
+                    request_id_ctx_var.reset(token)
+                    deadline_ctx_var.reset(deadline_token)
+
+        def stream_wrapper(request, context):
+            # Generator wrapper: errors raised mid-stream are mapped the same way
+            metadata = context.invocation_metadata()
+            request_id = metadata_value(metadata, 'x-request-id') or new_request_id()
+            request_id_ctx_var.set(request_id)
+            deadline = _deadline(context)
+            deadline_ctx_var.set(deadline)
+            stats_token = metrics.start_request()
+            start = time.perf_counter()
+            code = "OK"
+            admitted = False
+
+            with _server_span(method, request_id, metadata) as span:
+                try:
+                    _check_deadline(deadline)
+                    if rate_limiter is not None:
+                        rate_limiter.check(method_name, client_identity(metadata, context), request)
+                    if controller is not None:
+                        controller.acquire(method_name)
+                        admitted = True
+                    logger.info("Processing stream: %s", method)
+                    if compression is not None:
+                        # Message sizes are unknown up front; selected streams are compressed throughout
+                        context.set_compression(compression.algorithm)
+                    if instrumented:
+                        with instrumentation(metadata, request_id):
+                            yield from handler.unary_stream(request, context)
+                    else:
+                        yield from handler.unary_stream(request, context)
+                except GeneratorExit:
+                    code = "CANCELLED"
+                    raise
+                except Exception as e:
+                    code = _status_name(e)
+                    _mark_span(span, code, e)
+                    handle_error(e, context)
+                finally:
+                    if span is not None:
+                        span.set_attribute("rpc.grpc.status_code", code)
+                    if admitted:
+                        # Stream duration depends on the client, so it does not feed the adaptive limit
+                        controller.release(method_name)
+                    metrics.finish_request(stats_token, method, code, time.perf_counter() - start)
+                    # The generator may be closed from another context on cancellation,
+                    # so clear the variable instead of resetting the token
+                    request_id_ctx_var.set(None)
+                    deadline_ctx_var.set(None)
+
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(
+                stream_wrapper,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer
+            )
 
         return grpc.unary_unary_rpc_method_handler(
             wrapper,
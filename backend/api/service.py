@@ -1,66 +1,93 @@
 import grpc
 from concurrent import futures
+from datetime import datetime, timezone
+import time
+from typing import Optional
 from backend.generated import library_pb2, library_pb2_grpc
-from backend.core.utils import db_scope
+from backend.core.utils import db_scope, parse_field_mask
+from backend.core.config import Config
 from backend.services import (
-    BookService, MemberService, LoanService, AuthorService, GenreService
+    BookService, MemberService, LoanService, AuthorService, GenreService, StatsService, AvailabilityService
 )
 from backend.services.validators import (
     BookAvailabilityValidator, MemberExistenceValidator
 )
-from backend.core.database import BookCopyModel, MemberModel
+from backend.core.database import get_loaders
+from backend.core.idempotency import IdempotencyKeys
+
+def _wants(fields, name):
+    # None means no field mask was sent: populate everything
+    return fields is None or name in fields
 
 class LibraryService(library_pb2_grpc.LibraryServiceServicer):
-    
+
+    def __init__(self, idempotency: Optional[IdempotencyKeys] = None):
+        # Borrow/return RPCs (single and batch) replay stored responses for repeated x-idempotency-key metadata
+        self.idempotency = idempotency or IdempotencyKeys.from_config()
+
     # --- Authors ---
+    def _map_author(self, author, fields=None):
+        kwargs = {"id": author.id}
+        if _wants(fields, "name"): kwargs["name"] = author.name
+        if _wants(fields, "bio"): kwargs["bio"] = author.bio or ""
+        return library_pb2.Author(**kwargs)
+
     def CreateAuthor(self, request, context):
         with db_scope() as db:
             service = AuthorService(db)
-            author = service.create_author(request.name, request.bio)
+            author = service.create_author(request.name, request.bio, upsert=request.upsert)
             return library_pb2.Author(id=author.id, name=author.name, bio=author.bio or "")
 
     def ListAuthors(self, request, context):
         with db_scope() as db:
             service = AuthorService(db)
-            result = service.list_authors(page=request.page or 1, limit=request.limit or 10)
+            fields = parse_field_mask(request.field_mask.paths, library_pb2.Author.DESCRIPTOR.fields_by_name)
+            result = service.list_authors(page=request.page or 1, limit=request.limit or 10, fields=fields)
             return library_pb2.ListAuthorsResponse(
-                authors=[library_pb2.Author(id=a.id, name=a.name, bio=a.bio or "") for a in result['authors']],
+                authors=[self._map_author(a, fields) for a in result['authors']],
                 total_count=result['total_count'],
                 total_pages=result['total_pages']
             )
 
     # --- Genres ---
+    def _map_genre(self, genre, fields=None):
+        kwargs = {"id": genre.id}
+        if _wants(fields, "name"): kwargs["name"] = genre.name
+        return library_pb2.Genre(**kwargs)
+
     def CreateGenre(self, request, context):
         with db_scope() as db:
             service = GenreService(db)
-            genre = service.create_genre(request.name)
+            genre = service.create_genre(request.name, upsert=request.upsert)
             return library_pb2.Genre(id=genre.id, name=genre.name)
 
     def ListGenres(self, request, context):
         with db_scope() as db:
             service = GenreService(db)
-            result = service.list_genres(page=request.page or 1, limit=request.limit or 10)
+            fields = parse_field_mask(request.field_mask.paths, library_pb2.Genre.DESCRIPTOR.fields_by_name)
+            result = service.list_genres(page=request.page or 1, limit=request.limit or 10, fields=fields)
             return library_pb2.ListGenresResponse(
-                genres=[library_pb2.Genre(id=g.id, name=g.name) for g in result['genres']],
+                genres=[self._map_genre(g, fields) for g in result['genres']],
                 total_count=result['total_count'],
                 total_pages=result['total_pages']
             )
 
     # --- Books ---
-    def _map_book(self, book):
-        return library_pb2.Book(
-            id=book.id,
-            title=book.title,
-            author=library_pb2.Author(
-                id=book.author.id, 
-                name=book.author.name, 
-                bio=book.author.bio or ""
-            ) if book.author else None,
-            isbn=book.isbn,
-            genres=[library_pb2.Genre(id=g.id, name=g.name) for g in book.genres],
-            total_copies=len(book.copies),
-            available_copies=len([c for c in book.copies if c.is_available])
-        )
+    def _map_book(self, book, fields=None):
+        # Relationships are only touched when requested, so masked-out
+        # fields never trigger a lazy load
+        kwargs = {"id": book.id}
+        if _wants(fields, "title"): kwargs["title"] = book.title
+        if _wants(fields, "isbn"): kwargs["isbn"] = book.isbn
+        if _wants(fields, "author") and book.author:
+            kwargs["author"] = self._map_author(book.author)
+        if _wants(fields, "genres"):
+            kwargs["genres"] = [self._map_genre(g) for g in book.genres]
+        if _wants(fields, "total_copies"):
+            kwargs["total_copies"] = len(book.copies)
+        if _wants(fields, "available_copies"):
+            kwargs["available_copies"] = len([c for c in book.copies if c.is_available])
+        return library_pb2.Book(**kwargs)
 
     def CreateBook(self, request, context):
         with db_scope() as db:
@@ -77,9 +104,10 @@ class LibraryService(library_pb2_grpc.LibraryServiceServicer):
     def ListBooks(self, request, context):
         with db_scope() as db:
             service = BookService(db)
-            result = service.list_books(page=request.page or 1, limit=request.limit or 10)
+            fields = parse_field_mask(request.field_mask.paths, library_pb2.Book.DESCRIPTOR.fields_by_name)
+            result = service.list_books(page=request.page or 1, limit=request.limit or 10, fields=fields)
             return library_pb2.ListBooksResponse(
-                books=[self._map_book(b) for b in result['books']],
+                books=[self._map_book(b, fields) for b in result['books']],
                 total_count=result['total_count'],
                 total_pages=result['total_pages']
             )
@@ -95,6 +123,13 @@ class LibraryService(library_pb2_grpc.LibraryServiceServicer):
             return self._map_book(book)
 
     # --- Copies ---
+    def _map_copy(self, copy, fields=None):
+        kwargs = {"id": copy.id}
+        if _wants(fields, "book_id"): kwargs["book_id"] = copy.book_metadata_id
+        if _wants(fields, "is_available"): kwargs["is_available"] = copy.is_available
+        if _wants(fields, "status"): kwargs["status"] = copy.status
+        return library_pb2.BookCopy(**kwargs)
+
     def AddBookCopy(self, request, context):
         with db_scope() as db:
             service = BookService(db)
@@ -106,36 +141,43 @@ class LibraryService(library_pb2_grpc.LibraryServiceServicer):
                 status=copy.status
             )
 
+    def AddBookCopies(self, request, context):
+        with db_scope() as db:
+            service = BookService(db)
+            copy_ids = service.add_copies(request.book_id, request.count)
+            return library_pb2.AddBookCopiesResponse(book_id=request.book_id, copy_ids=copy_ids)
+
     def ListBookCopies(self, request, context):
         with db_scope() as db:
             service = BookService(db)
-            result = service.list_copies(request.book_id, page=request.page or 1, limit=request.limit or 10)
+            fields = parse_field_mask(request.field_mask.paths, library_pb2.BookCopy.DESCRIPTOR.fields_by_name)
+            result = service.list_copies(request.book_id, page=request.page or 1, limit=request.limit or 10, fields=fields)
             return library_pb2.ListBookCopiesResponse(
-                copies=[
-                    library_pb2.BookCopy(
-                        id=c.id,
-                        book_id=c.book_metadata_id,
-                        is_available=c.is_available,
-                        status=c.status
-                    ) for c in result['copies']
-                ],
+                copies=[self._map_copy(c, fields) for c in result['copies']],
                 total_count=result['total_count'],
                 total_pages=result['total_pages']
             )
 
     # --- Members ---
+    def _map_member(self, member, fields=None):
+        kwargs = {"id": member.id}
+        if _wants(fields, "name"): kwargs["name"] = member.name
+        if _wants(fields, "email"): kwargs["email"] = member.email
+        return library_pb2.Member(**kwargs)
+
     def CreateMember(self, request, context):
         with db_scope() as db:
             service = MemberService(db)
-            member = service.create_member(request.name, request.email)
+            member = service.create_member(request.name, request.email, upsert=request.upsert)
             return library_pb2.Member(id=member.id, name=member.name, email=member.email)
 
     def ListMembers(self, request, context):
         with db_scope() as db:
             service = MemberService(db)
-            result = service.list_members(page=request.page or 1, limit=request.limit or 10)
+            fields = parse_field_mask(request.field_mask.paths, library_pb2.Member.DESCRIPTOR.fields_by_name)
+            result = service.list_members(page=request.page or 1, limit=request.limit or 10, fields=fields)
             return library_pb2.ListMembersResponse(
-                members=[library_pb2.Member(id=m.id, name=m.name, email=m.email) for m in result['members']],
+                members=[self._map_member(m, fields) for m in result['members']],
                 total_count=result['total_count'],
                 total_pages=result['total_pages']
             )
@@ -150,69 +192,128 @@ class LibraryService(library_pb2_grpc.LibraryServiceServicer):
             return library_pb2.Member(id=member.id, name=member.name, email=member.email)
 
     # --- Loans ---
+    def _book_title(self, db, copy_id):
+        # The copy (and its book) are usually already in the session from the
+        # loan workflow, in which case the loader resolves them without SQL
+        copy = get_loaders(db).copies.load(copy_id)
+        return copy.metadata_rec.title if (copy and copy.metadata_rec) else "Unknown"
+
+    def _prefetch_loan_relations(self, db, loans, fields=None):
+        """
+        Batch-loads the copies (with their books) and members referenced by a
+        page of loans: one IN query each instead of lazy loads per row. The
+        rows land in the identity map, so `_map_loan` resolves them without SQL.
+        """
+        loaders = get_loaders(db)
+        if _wants(fields, "book_title"):
+            loaders.copies.enqueue(l.copy_id for l in loans).dispatch()
+        if _wants(fields, "member_name") or _wants(fields, "member_email"):
+            loaders.members.enqueue(l.member_id for l in loans).dispatch()
+
+    def _map_loan(self, loan, fields=None):
+        kwargs = {"id": loan.id}
+        if _wants(fields, "copy_id"): kwargs["copy_id"] = loan.copy_id
+        if _wants(fields, "member_id"): kwargs["member_id"] = loan.member_id
+        if _wants(fields, "borrowed_at"): kwargs["borrowed_at"] = loan.borrowed_at.isoformat()
+        if _wants(fields, "returned_at"):
+            kwargs["returned_at"] = loan.returned_at.isoformat() if loan.returned_at else ""
+        # Safe access using relationships
+        if _wants(fields, "book_title"):
+            kwargs["book_title"] = loan.copy.metadata_rec.title if (loan.copy and loan.copy.metadata_rec) else "Unknown"
+        if _wants(fields, "member_name"):
+            kwargs["member_name"] = loan.member.name if loan.member else "Unknown"
+        if _wants(fields, "member_email"):
+            kwargs["member_email"] = loan.member.email if loan.member else ""
+        return library_pb2.Loan(**kwargs)
+
     def BorrowBook(self, request, context):
         with db_scope() as db:
-            validators = [BookAvailabilityValidator(), MemberExistenceValidator()]
-            service = LoanService(db, validators)
-            copy_id = request.copy_id if request.HasField('copy_id') else None
-            loan = service.borrow_book(request.book_id, request.member_id, copy_id)
-            
-            # Find copy to get book title
-            copy = db.query(BookCopyModel).filter_by(id=loan.copy_id).first()
-            title = copy.metadata_rec.title if copy else "Unknown"
+            return self.idempotency.run(db, context, "BorrowBook", request, library_pb2.Loan,
+                                        lambda: self._borrow(db, request))
 
-            return library_pb2.Loan(
-                id=loan.id,
-                copy_id=loan.copy_id,
-                book_title=title,
-                member_id=loan.member_id,
-                borrowed_at=loan.borrowed_at.isoformat(),
-                returned_at=""
-            )
+    def _borrow(self, db, request):
+        validators = [BookAvailabilityValidator(), MemberExistenceValidator()]
+        service = LoanService(db, validators)
+        copy_id = request.copy_id if request.HasField('copy_id') else None
+        loan = service.borrow_book(request.book_id, request.member_id, copy_id)
+
+        return library_pb2.Loan(
+            id=loan.id,
+            copy_id=loan.copy_id,
+            book_title=self._book_title(db, loan.copy_id),
+            member_id=loan.member_id,
+            borrowed_at=loan.borrowed_at.isoformat(),
+            returned_at=""
+        )
 
     def ReturnBook(self, request, context):
         with db_scope() as db:
-            service = LoanService(db, [])
-            loan = service.return_book(request.loan_id)
-            
-            copy = db.query(BookCopyModel).filter_by(id=loan.copy_id).first()
-            title = copy.metadata_rec.title if copy else "Unknown"
+            return self.idempotency.run(db, context, "ReturnBook", request, library_pb2.Loan,
+                                        lambda: self._return(db, request))
+
+    def _return(self, db, request):
+        service = LoanService(db, [])
+        loan = service.return_book(request.loan_id)
+
+        return library_pb2.Loan(
+            id=loan.id,
+            copy_id=loan.copy_id,
+            book_title=self._book_title(db, loan.copy_id),
+            member_id=loan.member_id,
+            borrowed_at=loan.borrowed_at.isoformat(),
+            returned_at=loan.returned_at.isoformat()
+        )
 
-            return library_pb2.Loan(
+    def BatchBorrow(self, request, context):
+        with db_scope() as db:
+            return self.idempotency.run(db, context, "BatchBorrow", request, library_pb2.BatchLoansResponse,
+                                        lambda: self._batch_borrow(db, request))
+
+    def _batch_borrow(self, db, request):
+        service = LoanService(db, [])
+        items = [(item.book_id, item.copy_id if item.HasField('copy_id') else None) for item in request.items]
+        results = service.batch_borrow(request.member_id, items, request.all_or_nothing)
+        return self._map_batch_results(results)
+
+    def BatchReturn(self, request, context):
+        with db_scope() as db:
+            return self.idempotency.run(db, context, "BatchReturn", request, library_pb2.BatchLoansResponse,
+                                        lambda: self._batch_return(db, request))
+
+    def _batch_return(self, db, request):
+        service = LoanService(db, [])
+        results = service.batch_return(list(request.loan_ids), request.all_or_nothing)
+        return self._map_batch_results(results)
+
+    def _map_batch_results(self, results):
+        mapped = []
+        for result in results:
+            error, loan = result["error"], result["loan"]
+            if error:
+                mapped.append(library_pb2.BatchLoanResult(error_code=error.code, error_message=error.message))
+                continue
+            mapped.append(library_pb2.BatchLoanResult(loan=library_pb2.Loan(
                 id=loan.id,
                 copy_id=loan.copy_id,
-                book_title=title,
+                book_title=result["book_title"],
                 member_id=loan.member_id,
                 borrowed_at=loan.borrowed_at.isoformat(),
-                returned_at=loan.returned_at.isoformat()
-            )
+                returned_at=loan.returned_at.isoformat() if loan.returned_at else ""
+            )))
+        return library_pb2.BatchLoansResponse(
+            results=mapped,
+            succeeded=sum(1 for r in results if r["error"] is None)
+        )
 
     def ListMemberLoans(self, request, context):
         with db_scope() as db:
             service = LoanService(db, [])
-            result = service.list_member_loans(request.member_id, page=request.page or 1, limit=request.limit or 10)
-            
-            response_loans = []
-            for l in result['loans']:
-                # Safe access using relationships
-                title = l.copy.metadata_rec.title if (l.copy and l.copy.metadata_rec) else "Unknown"
-                member_name = l.member.name if l.member else "Unknown"
-                member_email = l.member.email if l.member else ""
-
-                response_loans.append(
-                    library_pb2.Loan(
-                        id=l.id,
-                        copy_id=l.copy_id,
-                        book_title=title,
-                        member_id=l.member_id,
-                        member_name=member_name,
-                        member_email=member_email,
-                        borrowed_at=l.borrowed_at.isoformat(),
-                        returned_at=l.returned_at.isoformat() if l.returned_at else ""
-                    )
-                )
+            fields = parse_field_mask(request.field_mask.paths, library_pb2.Loan.DESCRIPTOR.fields_by_name)
+            result = service.list_member_loans(request.member_id, page=request.page or 1, limit=request.limit or 10, fields=fields)
+            self._prefetch_loan_relations(db, result['loans'], fields)
+
             return library_pb2.ListLoansResponse(
-                loans=response_loans,
+                loans=[self._map_loan(l, fields) for l in result['loans']],
                 total_count=result['total_count'],
                 total_pages=result['total_pages']
             )
@@ -220,29 +321,107 @@ class LibraryService(library_pb2_grpc.LibraryServiceServicer):
     def ListAllLoans(self, request, context):
         with db_scope() as db:
             service = LoanService(db, [])
-            result = service.list_all_loans(page=request.page or 1, limit=request.limit or 10)
-            
-            response_loans = []
-            for l in result['loans']:
-                # Safe access using relationships
-                title = l.copy.metadata_rec.title if (l.copy and l.copy.metadata_rec) else "Unknown"
-                member_name = l.member.name if l.member else "Unknown"
-                member_email = l.member.email if l.member else ""
-
-                response_loans.append(
-                    library_pb2.Loan(
-                        id=l.id,
-                        copy_id=l.copy_id,
-                        book_title=title,
-                        member_id=l.member_id,
-                        member_name=member_name,
-                        member_email=member_email,
-                        borrowed_at=l.borrowed_at.isoformat(),
-                        returned_at=l.returned_at.isoformat() if l.returned_at else ""
-                    )
-                )
+            fields = parse_field_mask(request.field_mask.paths, library_pb2.Loan.DESCRIPTOR.fields_by_name)
+            result = service.list_all_loans(page=request.page or 1, limit=request.limit or 10, fields=fields)
+            self._prefetch_loan_relations(db, result['loans'], fields)
+
             return library_pb2.ListLoansResponse(
-                loans=response_loans,
+                loans=[self._map_loan(l, fields) for l in result['loans']],
                 total_count=result['total_count'],
                 total_pages=result['total_pages']
             )
+
+    # --- Batch lookups ---
+    def BatchGetBooks(self, request, context):
+        with db_scope() as db:
+            service = BookService(db)
+            books = service.batch_get_books(list(request.ids))
+            return library_pb2.BatchGetBooksResponse(
+                books=[self._map_book(b) for b in books if b],
+                missing_ids=[id for id, b in zip(request.ids, books) if not b]
+            )
+
+    def BatchGetMembers(self, request, context):
+        with db_scope() as db:
+            service = MemberService(db)
+            members = service.batch_get_members(list(request.ids))
+            return library_pb2.BatchGetMembersResponse(
+                members=[self._map_member(m) for m in members if m],
+                missing_ids=[id for id, m in zip(request.ids, members) if not m]
+            )
+
+    def BatchGetCopies(self, request, context):
+        with db_scope() as db:
+            service = BookService(db)
+            copies = service.batch_get_copies(list(request.ids))
+            return library_pb2.BatchGetCopiesResponse(
+                copies=[self._map_copy(c) for c in copies if c],
+                missing_ids=[id for id, c in zip(request.ids, copies) if not c]
+            )
+
+    # --- Exports (server-streaming) ---
+    # Rows are pulled from a server-side cursor in chunks and yielded one message at a
+    # time, so gRPC flow control paces the cursor and server memory stays bounded.
+    def StreamBooks(self, request, context):
+        chunk_size = request.chunk_size or Config.get_stream_chunk_size()
+        with db_scope() as db:
+            service = BookService(db)
+            for book in service.stream_books(chunk_size):
+                yield self._map_book(book)
+
+    def StreamMembers(self, request, context):
+        chunk_size = request.chunk_size or Config.get_stream_chunk_size()
+        with db_scope() as db:
+            service = MemberService(db)
+            for m in service.stream_members(chunk_size):
+                yield self._map_member(m)
+
+    def StreamLoans(self, request, context):
+        chunk_size = request.chunk_size or Config.get_stream_chunk_size()
+        member_id = request.member_id if request.HasField('member_id') else None
+        with db_scope() as db:
+            service = LoanService(db, [])
+            for l in service.stream_loans(member_id, chunk_size):
+                yield self._map_loan(l)
+
+    # --- Dashboard ---
+    def GetLibraryStats(self, request, context):
+        config = Config.get_stats_config()
+        with db_scope() as db:
+            service = StatsService(db, config["window_days"], config["top_titles"])
+            # The refresher normally keeps the snapshot younger than one interval;
+            # a missing or twice-as-old snapshot is recomputed here
+            stats = service.get_stats(max_age=2 * config["refresh_seconds"])
+            refreshed_at = stats.pop("refreshed_at")
+            return library_pb2.LibraryStats(
+                top_titles=[library_pb2.TitleLoans(**t) for t in stats.pop("top_titles")],
+                loans_per_day=[library_pb2.DayLoans(**d) for d in stats.pop("loans_per_day")],
+                refreshed_at=datetime.fromtimestamp(refreshed_at, timezone.utc).isoformat(),
+                age_seconds=max(0.0, time.time() - refreshed_at),
+                **stats
+            )
+
+    # --- Reporting ---
+    def _map_availability(self, result):
+        response = library_pb2.ListAvailabilityResponse(
+            rows=[library_pb2.Availability(id=r.id, name=r.name, books=r.books, copies=r.copies,
+                                           available_copies=r.available_copies) for r in result["rows"]],
+            total_count=result["total_count"],
+            total_pages=result["total_pages"]
+        )
+        refreshed_at = result["refreshed_at"]
+        # No refresh row yet: leave refreshed_at empty rather than report 1970
+        if refreshed_at is not None:
+            response.refreshed_at = datetime.fromtimestamp(refreshed_at, timezone.utc).isoformat()
+            response.age_seconds = max(0.0, time.time() - refreshed_at)
+        return response
+
+    def ListGenreAvailability(self, request, context):
+        with db_scope() as db:
+            service = AvailabilityService(db)
+            return self._map_availability(service.list_by_genre(page=request.page or 1, limit=request.limit or 10))
+
+    def ListAuthorAvailability(self, request, context):
+        with db_scope() as db:
+            service = AvailabilityService(db)
+            return self._map_availability(service.list_by_author(page=request.page or 1, limit=request.limit or 10))
@@ -0,0 +1,155 @@
+"""
+Bytes on the wire and latency of large list pages with and without compression.
+
+Serves ListBooks and ListAllLoans pages of --pages sizes from the in-process
+server, once per compression setting (none, gzip, deflate). Calls go through
+a TCP proxy that counts the bytes actually sent back to the client (HTTP/2
+frames included) and can cap the link to --bandwidth-mbps. That shows where
+compression pays off: it costs CPU on loopback and saves time on slow links.
+Author bios are replaced with word salad, because the repetitive seed text
+would compress unrealistically well.
+
+Usage:
+    python -m backend.benchmarks.bench_compression --books 5000 --pages 20 200 1000 --bandwidth-mbps 0 100 10
+"""
+import time
+import uuid
+import random
+import socket
+import argparse
+import threading
+
+from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, seed_members, start_server, summarize, emit
+
+configure_database()
+
+from sqlalchemy import select, update  # noqa: E402
+from backend.generated import library_pb2, library_pb2_grpc  # noqa: E402
+from backend.core.grpc_options import ALGORITHMS, CompressionPolicy, create_channel  # noqa: E402
+from backend.core.logger import logger  # noqa: E402
+from backend.core.database.infrastructure.session import SessionLocal  # noqa: E402
+from backend.core.database import AuthorModel, BookCopyModel, LoanModel  # noqa: E402
+
+WORDS = ("library novel author wrote published essays poetry century award critics early career later "
+         "translated languages family moved city university studied history philosophy journalism "
+         "short stories series characters readers first second third prize national international "
+         "collection fiction memoir biography life death war peace love travel sea mountain").split()
+
+class CountingProxy:
+    """Local TCP proxy that counts bytes per direction and optionally caps bandwidth."""
+    def __init__(self, upstream: str, bandwidth_mbps: float = 0):
+        host, port = upstream.rsplit(":", 1)
+        self.upstream = (host, int(port))
+        self.seconds_per_byte = 8 / (bandwidth_mbps * 1e6) if bandwidth_mbps else 0
+        self.to_client = 0
+        self._lock = threading.Lock()
+        self._listener = socket.create_server(("localhost", 0))
+        self.target = f"localhost:{self._listener.getsockname()[1]}"
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                return
+            server = socket.create_connection(self.upstream)
+            for sock in (client, server):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._pump, args=(client, server, False), daemon=True).start()
+            threading.Thread(target=self._pump, args=(server, client, True), daemon=True).start()
+
+    def _pump(self, src, dst, downstream: bool):
+        try:
+            while True:
+                data = src.recv(65536)
+                if not data:
+                    break
+                if self.seconds_per_byte:
+                    time.sleep(len(data) * self.seconds_per_byte)
+                dst.sendall(data)
+                if downstream:
+                    with self._lock:
+                        self.to_client += len(data)
+        except OSError:
+            pass
+        finally:
+            for sock in (src, dst):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def close(self):
+        self._listener.close()
+
+def seed(books: int, loans: int):
+    reset_schema()
+    with SessionLocal() as session:
+        catalog = seed_catalog(session, books)
+        member_ids = seed_members(session, max(1, loans // 5))
+        rng = random.Random(7)
+        for author_id in catalog["authors"]:
+            bio = " ".join(rng.choice(WORDS) for _ in range(80)).capitalize() + "."
+            session.execute(update(AuthorModel).where(AuthorModel.id == author_id).values(bio=bio))
+        copy_ids = session.scalars(select(BookCopyModel.id).limit(loans)).all()
+        session.execute(LoanModel.__table__.insert(), [
+            {"id": str(uuid.uuid4()), "copy_id": c, "member_id": member_ids[i % len(member_ids)]}
+            for i, c in enumerate(copy_ids)])
+        session.commit()
+
+def measure(proxy, call, calls: int) -> dict:
+    call()  # warm up the connection and any server-side caches
+    before = proxy.to_client
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = call()
+        samples.append(time.perf_counter() - start)
+    # Let the proxy finish forwarding the last frames before reading the counter
+    time.sleep(0.05)
+    result = summarize(samples)
+    result["message_bytes"] = response.ByteSize()
+    result["wire_bytes_per_call"] = (proxy.to_client - before) / calls
+    return result
+
+def run(books: int, loans: int, pages, bandwidths, calls: int, min_bytes: int) -> dict:
+    seed(books, loans)
+    variants = {"none": None}
+    variants.update({name: CompressionPolicy(algorithm, min_bytes) for name, algorithm in ALGORITHMS.items()})
+    results = {"books": books, "loans": loans, "calls": calls, "min_bytes": min_bytes, "runs": {}}
+
+    for name, policy in variants.items():
+        server, target = start_server(4, compression=policy)
+        try:
+            for mbps in bandwidths:
+                proxy = CountingProxy(target, mbps)
+                channel = create_channel(proxy.target)
+                stub = library_pb2_grpc.LibraryServiceStub(channel)
+                link = f"{mbps:g}mbps" if mbps else "unlimited"
+                for limit in pages:
+                    rpcs = {
+                        "ListBooks": lambda: stub.ListBooks(library_pb2.ListBooksRequest(page=1, limit=limit)),
+                        "ListAllLoans": lambda: stub.ListAllLoans(library_pb2.ListAllLoansRequest(page=1, limit=limit)),
+                    }
+                    for rpc, call in rpcs.items():
+                        key = f"{rpc}/limit={limit}/{link}"
+                        results["runs"].setdefault(key, {})[name] = measure(proxy, call, calls)
+                channel.close()
+                proxy.close()
+        finally:
+            server.stop(None)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--loans", type=int, default=2000)
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 200, 1000], help="Page sizes (limit)")
+    parser.add_argument("--bandwidth-mbps", type=float, nargs="+", default=[0, 100, 10], help="Link caps; 0 = unlimited")
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--min-bytes", type=int, default=4096, help="Compression threshold")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    logger.setLevel("WARNING")
+    emit(run(args.books, args.loans, args.pages, args.bandwidth_mbps, args.calls, args.min_bytes), args.output)
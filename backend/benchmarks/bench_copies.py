@@ -0,0 +1,83 @@
+"""
+Cost of adding N copies of a title.
+
+- per_rpc:      N AddBookCopy calls, each its own transaction (what
+                seed_data.py used to do); skipped above --max-per-rpc
+- unit_of_work: one transaction adding N BookCopyModel objects to the
+                session and flushing (the old create_book path)
+- bulk:         one AddBookCopies(count=N) call, a batched executemany
+
+Servicer methods are called directly (no network); times are the median of
+--repeat runs, with SQL statements counted per run.
+
+Usage:
+    python -m backend.benchmarks.bench_copies --counts 1 100 10000 --repeat 5
+"""
+import time
+import argparse
+import statistics
+
+from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, StatementCounter, StubContext, emit
+
+configure_database()
+
+from backend.api.service import LibraryService  # noqa: E402
+from backend.core.utils import db_scope  # noqa: E402
+from backend.core.logger import logger  # noqa: E402
+from backend.core.database.infrastructure.session import SessionLocal, engine  # noqa: E402
+from backend.core.database import BookCopyModel  # noqa: E402
+from backend.generated import library_pb2  # noqa: E402
+
+def strategies(servicer, context):
+    def per_rpc(book_id, count):
+        for _ in range(count):
+            servicer.AddBookCopy(library_pb2.AddBookCopyRequest(book_id=book_id), context)
+
+    def unit_of_work(book_id, count):
+        with db_scope() as db:
+            for _ in range(count):
+                db.add(BookCopyModel(book_metadata_id=book_id))
+            db.flush()
+
+    def bulk(book_id, count):
+        servicer.AddBookCopies(library_pb2.AddBookCopiesRequest(book_id=book_id, count=count), context)
+
+    return {"per_rpc": per_rpc, "unit_of_work": unit_of_work, "bulk": bulk}
+
+def run(counts, repeat: int, max_per_rpc: int) -> dict:
+    reset_schema()
+    with SessionLocal() as session:
+        book_ids = seed_catalog(session, 100, copies_per_book=0)["books"]
+    servicer = LibraryService()
+    results = {"repeat": repeat, "counts": {}}
+    books = iter(book_ids)
+
+    for count in counts:
+        results["counts"][count] = {}
+        for name, add in strategies(servicer, StubContext()).items():
+            if name == "per_rpc" and count > max_per_rpc:
+                continue
+            samples = []
+            for _ in range(repeat):
+                book_id = next(books)
+                with StatementCounter(engine) as counter:
+                    start = time.perf_counter()
+                    add(book_id, count)
+                    samples.append(time.perf_counter() - start)
+            median = statistics.median(samples)
+            results["counts"][count][name] = {
+                "ms": median * 1000,
+                "copies_per_s": count / median,
+                "statements": counter.count,
+            }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-per-rpc", type=int, default=1000, help="Largest count timed with one RPC per copy")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    logger.setLevel("WARNING")
+    emit(run(args.counts, args.repeat, args.max_per_rpc), args.output)
@@ -0,0 +1,55 @@
+"""
+ListBooks cost with and without a field mask.
+
+Compares the full listing (author join, genre and copy loads) against an
+id+title mask: statements per call, latency and response size.
+
+Usage:
+    python -m backend.benchmarks.bench_field_mask --books 5000 --limit 100
+"""
+import argparse
+
+from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, StatementCounter, summarize, time_calls, emit
+
+configure_database()
+
+from backend.generated import library_pb2  # noqa: E402
+from backend.api.service import LibraryService  # noqa: E402
+from backend.core.database.infrastructure.session import SessionLocal  # noqa: E402
+
+MASKS = {
+    "full": [],
+    "id_title": ["id", "title"],
+    "id_title_counts": ["id", "title", "total_copies", "available_copies"],
+}
+
+def run(books: int, limit: int, iterations: int) -> dict:
+    engine = reset_schema()
+    with SessionLocal() as session:
+        seed_catalog(session, books)
+
+    service = LibraryService()
+    results = {"books": books, "limit": limit, "masks": {}}
+    for name, paths in MASKS.items():
+        request = library_pb2.ListBooksRequest(page=1, limit=limit)
+        request.field_mask.paths.extend(paths)
+
+        with StatementCounter(engine) as counter:
+            response = service.ListBooks(request, None)
+        samples = time_calls(lambda: service.ListBooks(request, None), iterations)
+
+        results["masks"][name] = {
+            "statements": counter.count,
+            "response_bytes": response.ByteSize(),
+            "latency": summarize(samples),
+        }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    emit(run(args.books, args.limit, args.iterations), args.output)
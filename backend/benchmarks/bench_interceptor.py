@@ -0,0 +1,76 @@
+"""
+Per-RPC overhead of GlobalGrpcInterceptor.
+
+Calls a no-op unary handler directly and through the interceptor, the way
+the gRPC server does: intercept_service() then the returned handler. The
+call uses a stub ServicerContext, so the difference is the interceptor's
+own cost, with no network or serialization. Cases:
+
+- with_request_id: the gateway sent x-request-id (and other metadata)
+- new_request_id:  the interceptor has to generate one
+- info_logging:    like with_request_id, with the per-request INFO line
+                   written to /dev/null through the configured (queued)
+                   handler; the other cases log at WARNING
+
+Usage:
+    python -m backend.benchmarks.bench_interceptor --calls 200000
+"""
+import os
+import time
+import argparse
+from types import SimpleNamespace
+
+from backend.benchmarks.common import configure_database, emit, StubContext
+
+configure_database()
+
+import grpc  # noqa: E402
+from backend.api.middleware import GlobalGrpcInterceptor  # noqa: E402
+from backend.core.config import Config  # noqa: E402
+from backend.core.logger import logger, configure_logging  # noqa: E402
+
+GATEWAY_METADATA = (
+    ("user-agent", "grpc-node-js/1.9.0"),
+    ("x-request-id", "5b0a4f4e-3c1d-4f4e-9c1d-1a2b3c4d5e6f"),
+    ("x-client-id", "10.0.0.7"),
+)
+
+def per_call_us(fn, calls: int) -> float:
+    for _ in range(min(calls, 1000)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+def run(calls: int) -> dict:
+    handler = grpc.unary_unary_rpc_method_handler(lambda request, context: None)
+    details = SimpleNamespace(method="/library.LibraryService/GetMember")
+    interceptor = GlobalGrpcInterceptor()
+    continuation = lambda d: handler  # noqa: E731
+    request = SimpleNamespace()
+
+    def intercepted(context):
+        return lambda: interceptor.intercept_service(continuation, details).unary_unary(request, context)
+
+    direct_context = StubContext(GATEWAY_METADATA)
+    direct = per_call_us(lambda: handler.unary_unary(request, direct_context), calls)
+    results = {"calls": calls, "direct_us": direct, "overhead_us": {}}
+
+    configure_logging(logger, stream=open(os.devnull, "w"), **Config.get_logging_config())
+    try:
+        logger.setLevel("WARNING")
+        results["overhead_us"]["with_request_id"] = per_call_us(intercepted(StubContext(GATEWAY_METADATA)), calls) - direct
+        results["overhead_us"]["new_request_id"] = per_call_us(intercepted(StubContext(GATEWAY_METADATA[:1])), calls) - direct
+        logger.setLevel("INFO")
+        results["overhead_us"]["info_logging"] = per_call_us(intercepted(StubContext(GATEWAY_METADATA)), calls) - direct
+    finally:
+        logger.setLevel(Config.get_log_level())
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    emit(run(args.calls), args.output)
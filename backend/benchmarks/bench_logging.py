@@ -0,0 +1,94 @@
+"""
+RPC throughput with backend logging off, synchronous and queued.
+
+Drives ListGenres (a near-trivial query, so logging is a visible share of
+each call) through the in-process gRPC server, whose interceptor logs every
+request, from several client threads. Log output goes to /dev/null by
+default; --sink-delay-ms makes every write sleep, simulating a stalled
+stdout or log collector, which is where the synchronous handler blocks
+request threads.
+
+Usage:
+    python -m backend.benchmarks.bench_logging --seconds 5 --concurrency 16
+    python -m backend.benchmarks.bench_logging --sink-delay-ms 1
+"""
+import os
+import sys
+import time
+import argparse
+
+from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, start_server, run_closed_loop, summarize, emit
+
+configure_database()
+
+import grpc  # noqa: E402
+from backend.generated import library_pb2, library_pb2_grpc  # noqa: E402
+from backend.core.config import Config  # noqa: E402
+from backend.core.logger import logger, configure_logging, stop_logging  # noqa: E402
+from backend.core.database.infrastructure.session import SessionLocal  # noqa: E402
+
+MODES = {
+    "off": None,
+    "sync_text": {"fmt": "text", "use_queue": False},
+    "async_text": {"fmt": "text", "use_queue": True},
+    "async_json": {"fmt": "json", "use_queue": True},
+}
+
+class SlowStream:
+    """Write-through stream wrapper that sleeps on every write."""
+    def __init__(self, stream, delay_s: float):
+        self.stream = stream
+        self.delay_s = delay_s
+
+    def write(self, text):
+        time.sleep(self.delay_s)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def run(seconds: float, concurrency: int, workers: int, stream) -> dict:
+    reset_schema()
+    with SessionLocal() as session:
+        seed_catalog(session, 1000)
+
+    server, target = start_server(workers)
+    channel = grpc.insecure_channel(target)
+    stub = library_pb2_grpc.LibraryServiceStub(channel)
+    request = library_pb2.ListGenresRequest(page=1, limit=5)
+
+    results = {"seconds": seconds, "concurrency": concurrency, "workers": workers, "modes": {}}
+    try:
+        for name, options in MODES.items():
+            logger.disabled = options is None
+            if options:
+                configure_logging(logger, stream=stream, **options)
+            samples, errors, elapsed = run_closed_loop(lambda: stub.ListGenres(request), concurrency, seconds)
+            handler = logger.handlers[0]
+            stop_logging(logger)
+            results["modes"][name] = {
+                "rps": len(samples) / elapsed,
+                "errors": errors,
+                "dropped_records": getattr(handler, "dropped", 0),
+                "latency": summarize(samples),
+            }
+    finally:
+        channel.close()
+        server.stop(None)
+        logger.disabled = False
+        configure_logging(logger, **Config.get_logging_config())
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Run time per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="Client threads")
+    parser.add_argument("--workers", type=int, default=Config.get_max_workers(), help="Server worker threads")
+    parser.add_argument("--stdout", action="store_true", help="Write log output to stdout instead of /dev/null")
+    parser.add_argument("--sink-delay-ms", type=float, default=0.0, help="Sleep per log write")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    sink = sys.stdout if args.stdout else open(os.devnull, "w")
+    if args.sink_delay_ms:
+        sink = SlowStream(sink, args.sink_delay_ms / 1000)
+    emit(run(args.seconds, args.concurrency, args.workers, sink), args.output)
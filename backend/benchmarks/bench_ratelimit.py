@@ -0,0 +1,99 @@
+"""
+Per-call cost of the token-bucket rate limiter.
+
+Measures, in microseconds per call:
+
+- store.take() on the sharded in-memory store, from 1 and N threads over
+  many client keys (always allowed, i.e. the common path)
+- RateLimiter.check() for a loan RPC (client and member buckets)
+- the interceptor with and without the limiter, invoked directly with a
+  stub ServicerContext, so the difference is what the limiter adds to a call
+- the database store against DATABASE_URL (one upsert round-trip per bucket)
+
+Usage:
+    python -m backend.benchmarks.bench_ratelimit --calls 200000 --threads 8
+    DATABASE_URL=postgresql://... python -m backend.benchmarks.bench_ratelimit --db-calls 2000
+"""
+import time
+import argparse
+import threading
+from types import SimpleNamespace
+
+from backend.benchmarks.common import configure_database, reset_schema, emit, StubContext
+
+configure_database()
+
+import grpc  # noqa: E402
+from backend.api.middleware import GlobalGrpcInterceptor  # noqa: E402
+from backend.core.logger import logger  # noqa: E402
+from backend.core.ratelimit import MemoryBucketStore, DatabaseBucketStore, RateLimiter  # noqa: E402
+from backend.core.database.infrastructure.session import engine  # noqa: E402
+
+# Generous limits: the benchmark measures the allowed path, not rejections
+RATE, BURST = 1e9, 1e9
+
+def per_call_us(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+def threaded_us(fn, calls: int, threads: int) -> float:
+    """Wall time per call with `threads` threads each making calls / threads calls."""
+    per_thread = calls // threads
+    workers = [threading.Thread(target=lambda t=t: [fn(t * per_thread + i) for i in range(per_thread)])
+               for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return (time.perf_counter() - start) / (per_thread * threads) * 1e6
+
+def interceptor_call(rate_limiter):
+    handler = grpc.unary_unary_rpc_method_handler(lambda request, context: None)
+    details = SimpleNamespace(method="/library.LibraryService/BorrowBook")
+    interceptor = GlobalGrpcInterceptor(rate_limiter=rate_limiter)
+    request = SimpleNamespace(member_id="member-1")
+    context = StubContext((("x-client-id", "kiosk-1"), ("x-request-id", "bench")))
+    return lambda i: interceptor.intercept_service(lambda d: handler, details).unary_unary(request, context)
+
+def run(calls: int, threads: int, keys: int, db_calls: int) -> dict:
+    store = MemoryBucketStore()
+    client_keys = [f"client:{i}" for i in range(keys)]
+    limiter = RateLimiter(MemoryBucketStore(), RATE, BURST, RATE, BURST, member_methods=["BorrowBook"])
+    request = SimpleNamespace(member_id="member-1")
+
+    results = {"calls": calls, "threads": threads, "keys": keys}
+    results["memory_take_us"] = per_call_us(lambda i: store.take(client_keys[i % keys], RATE, BURST), calls)
+    results["memory_take_threaded_us"] = threaded_us(lambda i: store.take(client_keys[i % keys], RATE, BURST),
+                                                     calls, threads)
+    results["limiter_check_loan_rpc_us"] = per_call_us(
+        lambda i: limiter.check("BorrowBook", client_keys[i % keys], request), calls)
+
+    logger.disabled = True
+    try:
+        baseline = per_call_us(interceptor_call(None), calls // 4)
+        limited = per_call_us(interceptor_call(limiter), calls // 4)
+    finally:
+        logger.disabled = False
+    results["interceptor_us"] = {"without_limiter": baseline, "with_limiter": limited, "added": limited - baseline}
+
+    if db_calls:
+        reset_schema()
+        db_store = DatabaseBucketStore(engine)
+        results["database_take_us"] = {
+            "dialect": engine.dialect.name,
+            "per_call": per_call_us(lambda i: db_store.take(client_keys[i % keys], RATE, BURST), db_calls),
+        }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--keys", type=int, default=1000, help="Distinct client keys")
+    parser.add_argument("--db-calls", type=int, default=1000, help="Calls against the database store (0 skips it)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    emit(run(args.calls, args.threads, args.keys, args.db_calls), args.output)
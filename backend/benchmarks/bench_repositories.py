@@ -0,0 +1,83 @@
+"""
+Per-call overhead of the repository hot paths.
+
+Each repository method is timed in a tight loop against a small seeded
+catalog, next to the legacy `session.query(...).filter_by(...)` form it
+replaced, so the Python-side construction/compilation cost is visible.
+SQLite is the default backend because its execution cost is tiny, leaving
+mostly ORM overhead in the numbers.
+
+Usage:
+    python -m backend.benchmarks.bench_repositories --iterations 5000
+"""
+import argparse
+
+from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, seed_members, summarize, time_calls, emit
+
+configure_database()
+
+from backend.core.database.infrastructure.session import SessionLocal  # noqa: E402
+from backend.core.database import (  # noqa: E402
+    BookRepository, MemberRepository, AuthorRepository, LoanRepository,
+    BookMetadataModel, BookCopyModel, MemberModel, AuthorModel
+)
+
+def cases(session, ids):
+    book_repo = BookRepository(session)
+    member_repo = MemberRepository(session)
+    author_repo = AuthorRepository(session)
+    loan_repo = LoanRepository(session)
+    book_id, isbn = ids["book_id"], ids["isbn"]
+    member_id, email, author_name = ids["member_id"], ids["email"], ids["author_name"]
+
+    return {
+        "BookRepository.get_by_id": lambda: book_repo.get_by_id(book_id),
+        "BookRepository.get_by_isbn": lambda: book_repo.get_by_isbn(isbn),
+        "BookRepository.get_available_copy": lambda: book_repo.get_available_copy(book_id),
+        "BookRepository.paginated_list": lambda: book_repo.paginated_list(1, 10, {"id", "title"}),
+        "MemberRepository.get_by_id": lambda: member_repo.get_by_id(member_id),
+        "MemberRepository.get_by_email": lambda: member_repo.get_by_email(email),
+        "AuthorRepository.get_by_name": lambda: author_repo.get_by_name(author_name),
+        "LoanRepository.paginated_list_by_member": lambda: loan_repo.paginated_list_by_member(member_id, 1, 10),
+        # Legacy Query forms, for comparison
+        "legacy.query.get_by_isbn": lambda: session.query(BookMetadataModel).filter_by(isbn=isbn).first(),
+        "legacy.query.get_available_copy": lambda: session.query(BookCopyModel).filter_by(
+            book_metadata_id=book_id, is_available=True).first(),
+        "legacy.query.get_by_email": lambda: session.query(MemberModel).filter_by(email=email).first(),
+        "legacy.query.get_by_name": lambda: session.query(AuthorModel).filter_by(name=author_name).first(),
+    }
+
+def run(iterations: int, only: str = None) -> dict:
+    reset_schema()
+    with SessionLocal() as session:
+        catalog = seed_catalog(session, books=1000)
+        members = seed_members(session, 100)
+        ids = {
+            "book_id": catalog["books"][500],
+            "isbn": str(9780000000000 + 500),
+            "member_id": members[50],
+            "email": "member50@bench.test",
+            "author_name": "Author 7",
+        }
+
+    results = {"iterations": iterations, "methods": {}}
+    with SessionLocal() as session:
+        for name, fn in cases(session, ids).items():
+            if only and only not in name:
+                continue
+            samples = time_calls(fn, iterations, warmup=50)
+            stats = summarize(samples)
+            results["methods"][name] = {
+                "mean_us": stats["mean_ms"] * 1000,
+                "p50_us": stats["p50_ms"] * 1000,
+                "p99_us": stats["p99_ms"] * 1000,
+            }
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--only", help="Substring filter on method names")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    emit(run(args.iterations, args.only), args.output)
@@ -0,0 +1,137 @@
+"""
+Per-request cost of the session lifecycle in db_scope().
+
+Runs servicer methods directly (no network) with two session strategies:
+
+- per_request: the previous behaviour, a new SessionLocal() per RPC obtained
+               through the get_db() generator, expire_on_commit=True
+- scoped:      the current db_scope(), reusing the worker thread's Session
+               (scoped_session), expire_on_commit=False
+
+For each RPC it reports time per call, the peak Python allocation per call
+above the steady state (tracemalloc) and statements per call.
+
+Usage:
+    python -m backend.benchmarks.bench_sessions --books 2000 --calls 2000
+"""
+import time
+import random
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+
+from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, seed_members, StatementCounter, StubContext, emit
+
+configure_database()
+
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from backend.api import service as service_module  # noqa: E402
+from backend.api.service import LibraryService  # noqa: E402
+from backend.core import metrics, utils  # noqa: E402
+from backend.core.logger import logger  # noqa: E402
+from backend.core.database.infrastructure.session import SessionLocal, engine  # noqa: E402
+from backend.generated import library_pb2  # noqa: E402
+
+LegacySession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def legacy_get_db():
+    db = LegacySession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@contextmanager
+def per_request_scope():
+    """The pre-scoped_session db_scope: fresh session per call, driven through the generator."""
+    utils.time_remaining()
+    gen = legacy_get_db()
+    session = next(gen)
+    try:
+        start = time.perf_counter()
+        session.connection()
+        metrics.POOL_WAIT.observe(time.perf_counter() - start)
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        try:
+            next(gen)
+        except StopIteration:
+            pass
+
+def workload(books, members):
+    servicer = LibraryService()
+    context = StubContext()
+    rng = random.Random(3)
+
+    def borrow_return():
+        loan = servicer.BorrowBook(library_pb2.BorrowBookRequest(
+            book_id=rng.choice(books), member_id=rng.choice(members)), context)
+        servicer.ReturnBook(library_pb2.ReturnBookRequest(loan_id=loan.id), context)
+
+    return {
+        "BatchGetBooks": lambda: servicer.BatchGetBooks(library_pb2.BatchGetBooksRequest(ids=rng.sample(books, 5)), context),
+        "ListBooks": lambda: servicer.ListBooks(library_pb2.ListBooksRequest(page=rng.randint(1, 50), limit=20), context),
+        "BorrowReturn": borrow_return,
+    }
+
+STRATEGIES = {"per_request": per_request_scope, "scoped": utils.db_scope}
+
+def timed(call, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return time.perf_counter() - start
+
+def peak_alloc(call, calls: int) -> float:
+    tracemalloc.start()
+    call()
+    peaks = []
+    for _ in range(calls):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        call()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+def measure(call, calls: int, rounds: int = 10) -> dict:
+    # Strategies alternate in rounds so table growth and cache warm-up hit both equally
+    elapsed = dict.fromkeys(STRATEGIES, 0.0)
+    result = {}
+    for name, scope in STRATEGIES.items():
+        service_module.db_scope = scope
+        timed(call, 50)
+    for _ in range(rounds):
+        for name, scope in STRATEGIES.items():
+            service_module.db_scope = scope
+            elapsed[name] += timed(call, calls // rounds)
+    for name, scope in STRATEGIES.items():
+        service_module.db_scope = scope
+        with StatementCounter(engine) as counter:
+            timed(call, 100)
+        result[name] = {"us_per_call": elapsed[name] / (calls // rounds * rounds) * 1e6,
+                        "statements_per_call": counter.count / 100,
+                        "peak_alloc_bytes_per_call": peak_alloc(call, min(calls, 500))}
+    service_module.db_scope = utils.db_scope
+    return result
+
+def run(books: int, calls: int) -> dict:
+    reset_schema()
+    with SessionLocal() as session:
+        catalog = seed_catalog(session, books)
+        members = seed_members(session, 200)
+    return {"books": books, "calls": calls,
+            "rpcs": {rpc: measure(call, calls) for rpc, call in workload(catalog["books"], members).items()}}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    logger.setLevel("WARNING")
+    emit(run(args.books, args.calls), args.output)
@@ -0,0 +1,322 @@
+"""
+End-to-end benchmark of every LibraryService RPC.
+
+For each catalog size the schema is recreated and seeded, then the real
+gRPC server (servicer + interceptor) is started in-process and driven from
+client threads:
+
+  1. each RPC alone for --seconds (throughput, p50/p95/p99, SQL per RPC)
+  2. a weighted mix of RPCs (--mix) for --seconds
+
+Runs against DATABASE_URL when set (a dedicated database such as
+library_bench, with BENCH_ALLOW_RESET=1: the schema is dropped and reseeded),
+otherwise a temporary SQLite file. SQL-per-RPC comes from
+the backend's own metrics registry. RPCs without a driver below are listed
+under "unbenchmarked" so new endpoints do not go unnoticed.
+
+Results are printed as JSON. With --baseline, each RPC's throughput and p99
+are compared against a stored result and the exit status is 1 on a
+regression beyond --tolerance, which is what CI uses:
+
+    python -m backend.benchmarks.bench_suite --books 10000 --output bench.json
+    python -m backend.benchmarks.bench_suite --books 10000 --baseline benchmarks/baseline.json
+"""
+import sys
+import time
+import uuid
+import random
+import argparse
+import platform
+import itertools
+import threading
+import subprocess
+from collections import defaultdict
+
+from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, seed_members, start_server, summarize, emit
+
+configure_database()
+
+import grpc  # noqa: E402
+from sqlalchemy import select, update  # noqa: E402
+from backend.generated import library_pb2, library_pb2_grpc  # noqa: E402
+from backend.core import metrics  # noqa: E402
+from backend.core.config import Config  # noqa: E402
+from backend.core.grpc_options import create_channel  # noqa: E402
+from backend.core.logger import logger, configure_logging  # noqa: E402
+from backend.core.database.infrastructure.session import SessionLocal, engine  # noqa: E402
+from backend.core.database import BookCopyModel, LoanModel  # noqa: E402
+from backend.core.utils import db_scope  # noqa: E402
+from backend.services import AvailabilityService  # noqa: E402
+
+SERVICE = library_pb2.DESCRIPTOR.services_by_name["LibraryService"]
+METHOD_PREFIX = f"/{SERVICE.full_name}/"
+
+DEFAULT_MIX = "ListBooks=30,BatchGetBooks=15,ListBookCopies=10,ListMemberLoans=10,ListAllLoans=5,BorrowBook=10,ReturnBook=10,ListMembers=5,CreateMember=3,UpdateBook=2"
+
+# Samples of seeded ids kept client-side (a 1M catalog would not fit comfortably)
+ID_SAMPLE = 10000
+
+class Workload:
+    """Request builders for each RPC, drawing ids from the seeded data."""
+    def __init__(self, stub, ids: dict):
+        self.stub = stub
+        self.ids = ids
+        self.seq = itertools.count()
+        # Loans opened by BorrowBook calls, consumed by ReturnBook
+        self.open_loans = list(ids["loans"])
+        self.loans_lock = threading.Lock()
+
+    def _pick(self, key):
+        return random.choice(self.ids[key])
+
+    def _borrow(self):
+        loan = self.stub.BorrowBook(library_pb2.BorrowBookRequest(
+            member_id=self._pick("members"), book_id=self._pick("books")))
+        with self.loans_lock:
+            self.open_loans.append(loan.id)
+        return loan
+
+    def _return(self):
+        with self.loans_lock:
+            loan_id = self.open_loans.pop() if self.open_loans else None
+        if loan_id is None:
+            loan_id = self._borrow().id
+            with self.loans_lock:
+                self.open_loans.remove(loan_id)
+        return self.stub.ReturnBook(library_pb2.ReturnBookRequest(loan_id=loan_id))
+
+    def _batch_borrow(self, items: int = 5):
+        response = self.stub.BatchBorrow(library_pb2.BatchBorrowRequest(
+            member_id=self._pick("members"),
+            items=[library_pb2.BatchBorrowItem(book_id=self._pick("books")) for _ in range(items)]))
+        with self.loans_lock:
+            self.open_loans.extend(r.loan.id for r in response.results if r.HasField("loan"))
+        return response
+
+    def _batch_return(self, items: int = 5):
+        with self.loans_lock:
+            loan_ids = [self.open_loans.pop() for _ in range(min(items, len(self.open_loans)))]
+        if not loan_ids:
+            self._batch_borrow(items)
+            with self.loans_lock:
+                loan_ids = [self.open_loans.pop() for _ in range(min(items, len(self.open_loans)))]
+        return self.stub.BatchReturn(library_pb2.BatchReturnRequest(loan_ids=loan_ids))
+
+    def _page(self):
+        return random.randint(1, 100)
+
+    def drivers(self) -> dict:
+        s, n = self.stub, self.seq
+        return {
+            "CreateAuthor": lambda: s.CreateAuthor(library_pb2.CreateAuthorRequest(name=f"Bench Author {next(n)}-{random.random()}")),
+            "ListAuthors": lambda: s.ListAuthors(library_pb2.ListAuthorsRequest(page=self._page(), limit=20)),
+            "CreateGenre": lambda: s.CreateGenre(library_pb2.CreateGenreRequest(name=f"Bench Genre {next(n)}-{random.random()}")),
+            "ListGenres": lambda: s.ListGenres(library_pb2.ListGenresRequest(page=1, limit=20)),
+            "CreateBook": lambda: s.CreateBook(library_pb2.CreateBookRequest(
+                title="Bench Book", isbn=f"{random.randint(10**12, 10**13 - 1)}", author_id=self._pick("authors"),
+                genre_ids=[self._pick("genres")], initial_copies=2)),
+            "ListBooks": lambda: s.ListBooks(library_pb2.ListBooksRequest(page=self._page(), limit=20)),
+            "UpdateBook": lambda: s.UpdateBook(library_pb2.UpdateBookRequest(id=self._pick("books"), title=f"Renamed {next(n)}")),
+            "AddBookCopy": lambda: s.AddBookCopy(library_pb2.AddBookCopyRequest(book_id=self._pick("books"))),
+            "AddBookCopies": lambda: s.AddBookCopies(library_pb2.AddBookCopiesRequest(book_id=self._pick("books"), count=10)),
+            "ListBookCopies": lambda: s.ListBookCopies(library_pb2.ListBookCopiesRequest(book_id=self._pick("books"), page=1, limit=10)),
+            "CreateMember": lambda: s.CreateMember(library_pb2.CreateMemberRequest(
+                name="Bench Member", email=f"bench{next(n)}.{random.randint(0, 10**9)}@bench.test")),
+            "ListMembers": lambda: s.ListMembers(library_pb2.ListMembersRequest(page=self._page(), limit=20)),
+            "UpdateMember": lambda: s.UpdateMember(library_pb2.UpdateMemberRequest(id=self._pick("members"), name=f"Member {next(n)}")),
+            "BorrowBook": self._borrow,
+            "ReturnBook": self._return,
+            "BatchBorrow": self._batch_borrow,
+            "BatchReturn": self._batch_return,
+            "ListMemberLoans": lambda: s.ListMemberLoans(library_pb2.ListMemberLoansRequest(member_id=self._pick("members"), page=1, limit=10)),
+            "ListAllLoans": lambda: s.ListAllLoans(library_pb2.ListAllLoansRequest(page=self._page(), limit=20)),
+            "BatchGetBooks": lambda: s.BatchGetBooks(library_pb2.BatchGetBooksRequest(ids=random.sample(self.ids["books"], 20))),
+            "BatchGetMembers": lambda: s.BatchGetMembers(library_pb2.BatchGetMembersRequest(ids=random.sample(self.ids["members"], 20))),
+            "BatchGetCopies": lambda: s.BatchGetCopies(library_pb2.BatchGetCopiesRequest(ids=random.sample(self.ids["copies"], 20))),
+            "StreamBooks": lambda: sum(1 for _ in s.StreamBooks(library_pb2.StreamBooksRequest())),
+            "StreamMembers": lambda: sum(1 for _ in s.StreamMembers(library_pb2.StreamMembersRequest())),
+            "StreamLoans": lambda: sum(1 for _ in s.StreamLoans(library_pb2.StreamLoansRequest(member_id=self._pick("members")))),
+            "GetLibraryStats": lambda: s.GetLibraryStats(library_pb2.GetLibraryStatsRequest()),
+            "ListGenreAvailability": lambda: s.ListGenreAvailability(library_pb2.ListAvailabilityRequest(page=1, limit=20)),
+            "ListAuthorAvailability": lambda: s.ListAuthorAvailability(library_pb2.ListAvailabilityRequest(page=self._page(), limit=20)),
+        }
+
+def seed(books: int, members: int, loans: int) -> dict:
+    reset_schema()
+    with SessionLocal() as session:
+        catalog = seed_catalog(session, books)
+        member_ids = seed_members(session, members)
+        copy_ids = session.scalars(select(BookCopyModel.id).limit(max(ID_SAMPLE, loans))).all()
+
+        # Open loans on the first copies so loan listings and ReturnBook have data
+        loan_rows = [{"id": str(uuid.uuid4()), "copy_id": c, "member_id": member_ids[i % len(member_ids)]}
+                     for i, c in enumerate(copy_ids[:loans])]
+        if loan_rows:
+            session.execute(LoanModel.__table__.insert(), loan_rows)
+            session.execute(update(BookCopyModel).where(BookCopyModel.id.in_(copy_ids[:loans]))
+                            .values(is_available=False, status="Borrowed"))
+        session.commit()
+    # Build the reporting views over the seeded data, as the refresher would
+    with db_scope() as db:
+        AvailabilityService(db).refresh_views(max_age=0)
+
+    sample = lambda values: random.sample(values, min(len(values), ID_SAMPLE))
+    return {
+        "books": sample(catalog["books"]),
+        "authors": sample(catalog["authors"]),
+        "genres": catalog["genres"],
+        "members": sample(member_ids),
+        "copies": copy_ids[loans:] or copy_ids,
+        "loans": [row["id"] for row in loan_rows],
+    }
+
+def _sql_snapshot():
+    return {name: (metrics.REQUEST_STATEMENTS.count(METHOD_PREFIX + name), metrics.REQUEST_STATEMENTS.sum(METHOD_PREFIX + name))
+            for name in SERVICE.methods_by_name}
+
+def drive(calls: dict, pick, concurrency: int, seconds: float) -> dict:
+    """Closed-loop load: each client thread repeatedly runs calls[pick()] until the deadline."""
+    samples, errors = defaultdict(list), defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    before = _sql_snapshot()
+
+    def worker():
+        local, failed = defaultdict(list), defaultdict(lambda: defaultdict(int))
+        while time.perf_counter() < deadline:
+            name = pick()
+            start = time.perf_counter()
+            try:
+                calls[name]()
+            except grpc.RpcError as e:
+                failed[name][e.code().name] += 1
+                continue
+            local[name].append(time.perf_counter() - start)
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+            for name, codes in failed.items():
+                for code, count in codes.items():
+                    errors[name][code] += count
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    after = _sql_snapshot()
+
+    results = {}
+    for name in set(samples) | set(errors):
+        calls_made, statements = after[name][0] - before[name][0], after[name][1] - before[name][1]
+        latency = summarize(samples[name])
+        results[name] = {
+            "rps": len(samples[name]) / elapsed,
+            "p50_ms": latency.get("p50_ms"),
+            "p95_ms": latency.get("p95_ms"),
+            "p99_ms": latency.get("p99_ms"),
+            "sql_per_rpc": statements / calls_made if calls_made else None,
+            "errors": dict(errors[name]),
+        }
+    return results
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in filter(None, spec.split(",")):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+def run(sizes, members: int, loans: int, seconds: float, concurrency: int, workers: int, rpcs, mix: dict) -> dict:
+    result = {
+        "config": {"seconds": seconds, "concurrency": concurrency, "workers": workers, "members": members,
+                   "loans": loans, "mix": mix},
+        "environment": _environment(),
+        "runs": {},
+    }
+    for books in sizes:
+        ids = seed(books, members, loans)
+        server, target = start_server(workers)
+        channel = create_channel(target)
+        try:
+            workload = Workload(library_pb2_grpc.LibraryServiceStub(channel), ids)
+            calls = workload.drivers()
+            selected = [name for name in calls if not rpcs or name in rpcs]
+            per_rpc = {}
+            for name in selected:
+                per_rpc.update(drive(calls, lambda: name, concurrency, seconds))
+            names, weights = zip(*mix.items())
+            mixed = drive(calls, lambda: random.choices(names, weights)[0], concurrency, seconds)
+            result["runs"][f"books_{books}"] = {
+                "rpcs": per_rpc,
+                "mix": {
+                    "rps": sum(r["rps"] for r in mixed.values()),
+                    "rpcs": mixed,
+                },
+                "unbenchmarked": sorted(set(SERVICE.methods_by_name) - set(calls)),
+            }
+        finally:
+            channel.close()
+            server.stop(None)
+    return result
+
+def _environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": engine.dialect.name,
+        "commit": commit,
+    }
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions: RPCs whose throughput dropped or p99 grew by more than `tolerance`."""
+    regressions = []
+    for run_name, run in result["runs"].items():
+        base_run = baseline.get("runs", {}).get(run_name)
+        if not base_run:
+            continue
+        for name, current in run["rpcs"].items():
+            base = base_run["rpcs"].get(name)
+            if not base or not base.get("rps"):
+                continue
+            if current["rps"] < base["rps"] * (1 - tolerance):
+                regressions.append(f"{run_name} {name}: {current['rps']:.1f} rps vs baseline {base['rps']:.1f}")
+            if base.get("p99_ms") and current.get("p99_ms") and current["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+                regressions.append(f"{run_name} {name}: p99 {current['p99_ms']:.2f} ms vs baseline {base['p99_ms']:.2f}")
+    return regressions
+
+if __name__ == "__main__":
+    import json
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, nargs="+", default=[10000], help="Catalog sizes to run (e.g. 10000 100000 1000000)")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--loans", type=int, default=500, help="Open loans seeded before the run")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Run time per RPC and for the mix")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads")
+    parser.add_argument("--workers", type=int, default=10, help="Server worker threads")
+    parser.add_argument("--rpcs", nargs="*", help="Only run these RPCs individually (the mix always runs)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weighted RPC mix, e.g. ListBooks=3,BorrowBook=1")
+    parser.add_argument("--log-level", default="WARNING", help="Backend log level during the run (logs go to stderr)")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    parser.add_argument("--baseline", help="Compare against this stored result")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression vs the baseline")
+    args = parser.parse_args()
+
+    # Keep stdout machine-readable
+    configure_logging(logger, stream=sys.stderr, **Config.get_logging_config())
+    logger.setLevel(args.log_level.upper())
+
+    result = run(args.books, args.members, args.loans, args.seconds, args.concurrency, args.workers, args.rpcs, parse_mix(args.mix))
+    if args.baseline:
+        with open(args.baseline) as f:
+            result["regressions"] = compare(result, json.load(f), args.tolerance)
+    emit(result, args.output)
+    if result.get("regressions"):
+        print("\n".join(["Regressions against baseline:"] + result["regressions"]), file=sys.stderr)
+        sys.exit(1)
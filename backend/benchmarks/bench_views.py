@@ -0,0 +1,96 @@
+"""
+Availability per genre and per author: live aggregation vs. the managed
+materialized views.
+
+- live:    the view's defining query (genres/authors joined to books and
+           copies, grouped) run per request for one page
+- view:    ListGenreAvailability / ListAuthorAvailability, reading a page of
+           the view (count + page + refresh time)
+- refresh: one AvailabilityService.refresh_views() rebuild of both views
+
+While refreshes run back to back, a reader thread keeps calling
+ListGenreAvailability; its worst latency shows whether readers wait for the
+rebuild (REFRESH ... CONCURRENTLY on Postgres should keep them unblocked).
+
+Usage:
+    python -m backend.benchmarks.bench_views --books 100000 --calls 200
+"""
+import time
+import argparse
+import threading
+
+from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, summarize, time_calls, StubContext, emit
+
+configure_database()
+
+from sqlalchemy import text  # noqa: E402
+from backend.api.service import LibraryService  # noqa: E402
+from backend.services import AvailabilityService  # noqa: E402
+from backend.core.logger import logger  # noqa: E402
+from backend.core.database.infrastructure.session import SessionLocal, engine  # noqa: E402
+from backend.core.database.infrastructure.models import MANAGED_VIEWS  # noqa: E402
+from backend.core.utils import db_scope  # noqa: E402
+from backend.generated import library_pb2  # noqa: E402
+
+def live_page(view, limit: int):
+    page = text(f"SELECT * FROM ({view.query}) AS v ORDER BY name, id LIMIT :limit")
+    count = text(f"SELECT count(*) FROM ({view.query}) AS v")
+
+    def call():
+        with SessionLocal() as session:
+            session.scalar(count)
+            session.execute(page, {"limit": limit}).all()
+    return call
+
+def refresh():
+    with db_scope() as db:
+        AvailabilityService(db).refresh_views(max_age=0)
+
+def reads_during_refresh(servicer, context, refreshes: int) -> dict:
+    stop = threading.Event()
+    latencies = []
+
+    def reader():
+        while not stop.is_set():
+            start = time.perf_counter()
+            servicer.ListGenreAvailability(library_pb2.ListAvailabilityRequest(limit=20), context)
+            latencies.append(time.perf_counter() - start)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for _ in range(refreshes):
+            refresh()
+    finally:
+        stop.set()
+        thread.join()
+    return summarize(latencies)
+
+def run(books: int, calls: int, limit: int) -> dict:
+    reset_schema()
+    with SessionLocal() as session:
+        seed_catalog(session, books, genres=50)
+    servicer = LibraryService()
+    context = StubContext()
+    results = {"books": books, "calls": calls, "dialect": engine.dialect.name}
+
+    results["refresh"] = summarize(time_calls(refresh, 5))
+    for name, rpc in (("genre_availability", servicer.ListGenreAvailability),
+                      ("author_availability", servicer.ListAuthorAvailability)):
+        request = library_pb2.ListAvailabilityRequest(page=1, limit=limit)
+        results[name] = {
+            "live": summarize(time_calls(live_page(MANAGED_VIEWS[name], limit), max(5, calls // 10))),
+            "view": summarize(time_calls(lambda: rpc(request, context), calls)),
+        }
+    results["reads_during_refresh"] = reads_during_refresh(servicer, context, 5)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=100000)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    logger.setLevel("WARNING")
+    emit(run(args.books, args.calls, args.limit), args.output)
@@ -0,0 +1,231 @@
+"""
+Shared helpers for the backend benchmarks.
+
+Benchmarks run against DATABASE_URL when it is set (a dedicated database such
+as library_bench on the docker-compose server; `reset_schema` wipes it),
+otherwise against a throwaway SQLite file so they also work on a bare checkout. `configure_database()` must be called before any
+`backend.core` import, because the engine is created from Config at import time.
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+def configure_database() -> str:
+    if not os.environ.get("DATABASE_URL"):
+        path = os.path.join(tempfile.mkdtemp(prefix="library_bench_"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return os.environ["DATABASE_URL"]
+
+def reset_schema(engine=None):
+    """
+    Drops and recreates every table on `engine` (default: the configured engine).
+
+    Anything but SQLite is only wiped with BENCH_ALLOW_RESET=1, so a benchmark
+    pointed at the application database by mistake stops instead.
+    """
+    from backend.core.database.infrastructure.models import Base
+    if engine is None:
+        from backend.core.database.infrastructure.session import engine
+    if engine.dialect.name != "sqlite" and os.environ.get("BENCH_ALLOW_RESET") != "1":
+        raise SystemExit(f"Refusing to drop every table on {engine.url.render_as_string(hide_password=True)}: "
+                         "point DATABASE_URL at a dedicated benchmark database and set BENCH_ALLOW_RESET=1")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def seed_catalog(session, books: int, copies_per_book: int = 3, authors: int = None, genres: int = 10, batch: int = 1000):
+    """
+    Inserts a synthetic catalog with Core bulk inserts (fast enough for 1M rows).
+
+    Returns:
+        dict: Lists of generated ids keyed by entity.
+    """
+    import uuid
+    from backend.core.database.infrastructure.models import (
+        AuthorModel, GenreModel, BookMetadataModel, BookCopyModel, book_genre
+    )
+    authors = authors or max(1, books // 10)
+    author_ids = [str(uuid.uuid4()) for _ in range(authors)]
+    genre_ids = [str(uuid.uuid4()) for _ in range(genres)]
+    session.execute(AuthorModel.__table__.insert(), [
+        {"id": a, "name": f"Author {i}", "bio": "Synthetic author biography " * 4} for i, a in enumerate(author_ids)
+    ])
+    session.execute(GenreModel.__table__.insert(), [{"id": g, "name": f"Genre {i}"} for i, g in enumerate(genre_ids)])
+
+    book_ids = []
+    for start in range(0, books, batch):
+        rows, links, copies = [], [], []
+        for i in range(start, min(start + batch, books)):
+            book_id = str(uuid.uuid4())
+            book_ids.append(book_id)
+            rows.append({"id": book_id, "title": f"Book {i}", "isbn": f"{9780000000000 + i}",
+                         "author_id": author_ids[i % authors]})
+            links.append({"book_id": book_id, "genre_id": genre_ids[i % genres]})
+            links.append({"book_id": book_id, "genre_id": genre_ids[(i + 1) % genres]})
+            copies.extend({"id": str(uuid.uuid4()), "book_metadata_id": book_id, "is_available": True,
+                           "status": "Available"} for _ in range(copies_per_book))
+        session.execute(BookMetadataModel.__table__.insert(), rows)
+        session.execute(book_genre.insert(), links)
+        if copies:
+            session.execute(BookCopyModel.__table__.insert(), copies)
+    session.commit()
+    return {"authors": author_ids, "genres": genre_ids, "books": book_ids}
+
+def seed_members(session, members: int, batch: int = 1000):
+    import uuid
+    from backend.core.database.infrastructure.models import MemberModel
+    member_ids = []
+    for start in range(0, members, batch):
+        rows = []
+        for i in range(start, min(start + batch, members)):
+            member_id = str(uuid.uuid4())
+            member_ids.append(member_id)
+            rows.append({"id": member_id, "name": f"Member {i}", "email": f"member{i}@bench.test"})
+        session.execute(MemberModel.__table__.insert(), rows)
+    session.commit()
+    return member_ids
+
+class StatementCounter:
+    """Counts statements executed on an engine while the block is active."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+def summarize(samples_s):
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    if not samples_s:
+        return {"count": 0}
+    ordered = sorted(samples_s)
+
+    def pct(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+def time_calls(fn, iterations: int, warmup: int = 3):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def emit(result: dict, output: str = None):
+    """Prints the result as JSON and optionally writes it to a file."""
+    text = json.dumps(result, indent=2, sort_keys=True)
+    print(text)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+
+def start_server(max_workers: int = 10, admission_control: bool = False, compression=None):
+    """
+    Starts the real gRPC server (servicer + interceptor) in-process on a free port,
+    with the transport options main.py uses.
+
+    Admission control is off by default so micro-benchmarks measure RPC cost
+    rather than load shedding; pass `admission_control=True` to serve like main.py.
+    Responses are uncompressed unless a `CompressionPolicy` is given.
+
+    Returns:
+        tuple: (server, "localhost:<port>") — call `server.stop(None)` when done.
+    """
+    import grpc
+    from backend.generated import library_pb2_grpc
+    from backend.api.service import LibraryService
+    from backend.api.middleware import GlobalGrpcInterceptor
+    from backend.core.config import Config
+    from backend.core import admission, grpc_options
+
+    controller = admission.from_config(max_workers) if admission_control else None
+    server = grpc.server(
+        admission.QueueTimingExecutor(max_workers=max_workers),
+        interceptors=(GlobalGrpcInterceptor(controller, compression=compression),),
+        options=grpc_options.server_options(),
+        maximum_concurrent_rpcs=Config.get_max_concurrent_rpcs()
+    )
+    library_pb2_grpc.add_LibraryServiceServicer_to_server(LibraryService(), server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    return server, f"localhost:{port}"
+
+class StubContext:
+    """Minimal ServicerContext for driving the interceptor directly, without a network."""
+    def __init__(self, metadata=()):
+        self.metadata = tuple(metadata)
+
+    def invocation_metadata(self):
+        return self.metadata
+
+    def time_remaining(self):
+        return None
+
+    def peer(self):
+        return "ipv4:127.0.0.1:5000"
+
+    def abort(self, code, details):
+        raise RuntimeError(details)
+
+    def set_trailing_metadata(self, metadata):
+        pass
+
+def run_closed_loop(call, concurrency: int, seconds: float):
+    """
+    Runs `call()` from `concurrency` threads for `seconds`.
+
+    Returns:
+        tuple: (per-call durations in seconds, error count, elapsed seconds)
+    """
+    import threading
+    samples, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                call()
+            except Exception:
+                failed += 1
+                continue
+            local.append(time.perf_counter() - start)
+        with lock:
+            samples.extend(local)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, errors[0], time.perf_counter() - start
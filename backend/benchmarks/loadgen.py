@@ -0,0 +1,279 @@
+"""
+Open-loop circulation load generator for capacity planning.
+
+Simulates library members through LibraryServiceStub (like client.py):
+
+- borrow:  a member borrows a title drawn from a Zipf popularity curve
+           (--zipf), so a few bestsellers run out of copies
+- return:  a member returns one of the loans this generator opened
+- browse:  ListBooks pages (catalog browsing)
+- detail:  BatchGetBooks + ListBookCopies for a popular title (search hit)
+- account: ListMemberLoans for a member
+
+There is no search RPC, so search traffic is modelled as detail lookups.
+
+Arrivals are open-loop: a non-homogeneous Poisson process whose rate
+follows a compressed day (--day-seconds) with lunchtime and evening peaks
+that reach --peak-rps. Requests are issued on schedule whether or not
+earlier ones finished, over --channels separate gRPC channels. Latency is
+measured from the scheduled arrival time, so server backlog shows up as
+latency instead of quietly lowering the offered load.
+
+Every --window seconds the generator records the offered rate, completions,
+latency percentiles and errors per operation. Errors are classified as
+unavailable_copy, conflict, or the gRPC status code. The timeline is
+emitted as JSON.
+
+Targets:
+    python -m backend.benchmarks.loadgen --target localhost:50051 --duration 300
+    python -m backend.benchmarks.loadgen --in-process --books 10000 --duration 60
+"""
+import os
+import math
+import time
+import random
+import bisect
+import argparse
+import threading
+import itertools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+
+from backend.benchmarks.common import summarize, emit
+
+DEFAULT_MIX = "borrow=25,return=20,browse=30,detail=15,account=10"
+
+def day_profile(fraction: float) -> float:
+    """Relative arrival rate over a day (0..1 of the day), peaking at 1.0 around 18:00."""
+    hour = fraction * 24
+    lunch = 0.6 * math.exp(-((hour - 12.5) / 1.5) ** 2)
+    evening = 1.0 * math.exp(-((hour - 18) / 2.0) ** 2)
+    return max(0.05, 0.15 + lunch + evening) / 1.15
+
+class Zipf:
+    """Draws indexes 0..n-1 with P(k) proportional to 1/(k+1)^s."""
+    def __init__(self, n: int, s: float):
+        weights = [1.0 / (k + 1) ** s for k in range(n)]
+        self.cumulative = list(itertools.accumulate(weights))
+
+    def sample(self) -> int:
+        return bisect.bisect_left(self.cumulative, random.random() * self.cumulative[-1])
+
+def classify(error: grpc.RpcError) -> str:
+    details = (error.details() or "").lower()
+    if "available" in details:
+        return "unavailable_copy"
+    if error.code() == grpc.StatusCode.ALREADY_EXISTS or "already" in details:
+        return "conflict"
+    return error.code().name
+
+class Recorder:
+    """Per-window latency samples and error counts, keyed by operation."""
+    def __init__(self, window: float):
+        self.window = window
+        self.start = time.perf_counter()
+        self.lock = threading.Lock()
+        self.windows = defaultdict(lambda: {"offered": 0, "latency": defaultdict(list),
+                                            "errors": defaultdict(lambda: defaultdict(int))})
+
+    def _slot(self, at: float) -> int:
+        return int((at - self.start) // self.window)
+
+    def offered(self, at: float):
+        with self.lock:
+            self.windows[self._slot(at)]["offered"] += 1
+
+    def done(self, op: str, scheduled: float, error: str = None):
+        now = time.perf_counter()
+        with self.lock:
+            slot = self.windows[self._slot(scheduled)]
+            if error:
+                slot["errors"][op][error] += 1
+            else:
+                slot["latency"][op].append(now - scheduled)
+
+    def report(self) -> dict:
+        timeline, totals, total_errors = [], defaultdict(list), defaultdict(lambda: defaultdict(int))
+        for index in sorted(self.windows):
+            slot = self.windows[index]
+            ops = {}
+            for op in set(slot["latency"]) | set(slot["errors"]):
+                samples = slot["latency"][op]
+                errors = dict(slot["errors"][op])
+                totals[op].extend(samples)
+                for kind, n in errors.items():
+                    total_errors[op][kind] += n
+                stats = summarize(samples)
+                ops[op] = {"ok": len(samples), "errors": errors, "p50_ms": stats.get("p50_ms"),
+                           "p95_ms": stats.get("p95_ms"), "p99_ms": stats.get("p99_ms")}
+            timeline.append({"t": index * self.window, "offered_rps": slot["offered"] / self.window, "ops": ops})
+        summary = {}
+        for op in set(totals) | set(total_errors):
+            errors = dict(total_errors[op])
+            attempts = len(totals[op]) + sum(errors.values())
+            summary[op] = {"attempts": attempts, "error_rate": sum(errors.values()) / attempts if attempts else 0,
+                           "errors": errors, "latency": summarize(totals[op])}
+        return {"summary": summary, "timeline": timeline}
+
+class Circulation:
+    """Member behaviour: which RPCs to send, and client-side bookkeeping of open loans."""
+    def __init__(self, stubs, book_ids, member_ids, zipf_s: float):
+        self.stubs = itertools.cycle(stubs)
+        self.stubs_lock = threading.Lock()
+        # Popularity rank is independent of catalog order
+        self.books = random.sample(book_ids, len(book_ids))
+        self.members = member_ids
+        self.popularity = Zipf(len(self.books), zipf_s)
+        self.open_loans = []
+        self.loans_lock = threading.Lock()
+
+    def stub(self):
+        with self.stubs_lock:
+            return next(self.stubs)
+
+    def popular_book(self) -> str:
+        return self.books[self.popularity.sample()]
+
+    def borrow(self, pb2):
+        loan = self.stub().BorrowBook(pb2.BorrowBookRequest(member_id=random.choice(self.members), book_id=self.popular_book()))
+        with self.loans_lock:
+            self.open_loans.append(loan.id)
+
+    def return_(self, pb2):
+        with self.loans_lock:
+            if not self.open_loans:
+                return False
+            loan_id = self.open_loans.pop(random.randrange(len(self.open_loans)))
+        self.stub().ReturnBook(pb2.ReturnBookRequest(loan_id=loan_id))
+        return True
+
+    def browse(self, pb2):
+        self.stub().ListBooks(pb2.ListBooksRequest(page=random.randint(1, 50), limit=20))
+
+    def detail(self, pb2):
+        book_id = self.popular_book()
+        stub = self.stub()
+        stub.BatchGetBooks(pb2.BatchGetBooksRequest(ids=[book_id]))
+        stub.ListBookCopies(pb2.ListBookCopiesRequest(book_id=book_id, page=1, limit=10))
+
+    def account(self, pb2):
+        self.stub().ListMemberLoans(pb2.ListMemberLoansRequest(member_id=random.choice(self.members), page=1, limit=10))
+
+def discover(stub, pb2, members: int):
+    """Collects book and member ids from a running server, creating members if there are too few."""
+    book_ids = [b.id for b in stub.StreamBooks(pb2.StreamBooksRequest())]
+    member_ids = [m.id for m in stub.StreamMembers(pb2.StreamMembersRequest())]
+    run_id = os.urandom(4).hex()
+    for i in range(len(member_ids), members):
+        member = stub.CreateMember(pb2.CreateMemberRequest(name=f"Load Member {i}", email=f"load{i}.{run_id}@loadgen.test"))
+        member_ids.append(member.id)
+    return book_ids, member_ids
+
+def run(target: str, channels: int, peak_rps: float, duration: float, day_seconds: float, mix: dict,
+        zipf_s: float, members: int, max_inflight: int, window: float) -> dict:
+    from backend.generated import library_pb2, library_pb2_grpc
+    from backend.core.grpc_options import create_channel
+
+    # A local subchannel pool gives each channel its own connection instead of sharing one per target
+    opened = [create_channel(target, [("grpc.use_local_subchannel_pool", 1)]) for _ in range(channels)]
+    stubs = [library_pb2_grpc.LibraryServiceStub(c) for c in opened]
+    book_ids, member_ids = discover(stubs[0], library_pb2, members)
+    if not book_ids:
+        raise SystemExit("The target has no books; seed it first (or use --in-process)")
+
+    circulation = Circulation(stubs, book_ids, member_ids, zipf_s)
+    operations = {
+        "borrow": circulation.borrow, "return": circulation.return_, "browse": circulation.browse,
+        "detail": circulation.detail, "account": circulation.account,
+    }
+    names, weights = zip(*mix.items())
+    recorder = Recorder(window)
+
+    def execute(op: str, scheduled: float):
+        try:
+            if operations[op](library_pb2) is False:
+                # Nothing to return yet: borrow instead, as a member at the desk would
+                op = "borrow"
+                operations[op](library_pb2)
+            recorder.done(op, scheduled)
+        except grpc.RpcError as e:
+            recorder.done(op, scheduled, classify(e))
+
+    pool = ThreadPoolExecutor(max_workers=max_inflight)
+    start = recorder.start
+    now = start
+    try:
+        # Thinning: draw arrivals at the peak rate, keep each with probability profile(t)
+        while True:
+            now += random.expovariate(peak_rps)
+            elapsed = now - start
+            if elapsed >= duration:
+                break
+            if random.random() > day_profile((elapsed % day_seconds) / day_seconds):
+                continue
+            delay = now - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            recorder.offered(now)
+            pool.submit(execute, random.choices(names, weights)[0], now)
+    finally:
+        pool.shutdown(wait=True)
+        for channel in opened:
+            channel.close()
+
+    result = recorder.report()
+    result["config"] = {"target": target, "channels": channels, "peak_rps": peak_rps, "duration": duration,
+                        "day_seconds": day_seconds, "mix": mix, "zipf": zipf_s, "books": len(book_ids),
+                        "members": len(member_ids), "max_inflight": max_inflight, "window": window}
+    return result
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in filter(None, spec.split(",")):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    default_target = f"{os.getenv('GRPC_HOST', 'localhost')}:{os.getenv('GRPC_PORT', '50051')}"
+    parser.add_argument("--target", default=default_target, help="host:port of a running backend")
+    parser.add_argument("--in-process", action="store_true", help="Seed DATABASE_URL (or temp SQLite) and run the server in-process")
+    parser.add_argument("--books", type=int, default=10000, help="Catalog size for --in-process")
+    parser.add_argument("--members", type=int, default=500, help="Members to borrow as (created on the target if missing)")
+    parser.add_argument("--channels", type=int, default=16, help="Concurrent gRPC channels")
+    parser.add_argument("--peak-rps", type=float, default=200.0, help="Arrival rate at the daily peak")
+    parser.add_argument("--duration", type=float, default=120.0, help="Seconds to generate load")
+    parser.add_argument("--day-seconds", type=float, default=120.0, help="Length of one simulated day")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of title popularity")
+    parser.add_argument("--max-inflight", type=int, default=256, help="Client threads issuing requests")
+    parser.add_argument("--window", type=float, default=5.0, help="Seconds per timeline window")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+
+    server = None
+    target = args.target
+    if args.in_process:
+        import sys
+        from backend.benchmarks.common import configure_database, reset_schema, seed_catalog, seed_members, start_server
+        configure_database()
+        from backend.core.config import Config
+        from backend.core.logger import logger, configure_logging
+        from backend.core.database.infrastructure.session import SessionLocal
+        configure_logging(logger, stream=sys.stderr, **Config.get_logging_config())
+        logger.setLevel("WARNING")
+        reset_schema()
+        with SessionLocal() as session:
+            seed_catalog(session, args.books)
+            seed_members(session, args.members)
+        server, target = start_server(Config.get_max_workers(), admission_control=True)
+    try:
+        result = run(target, args.channels, args.peak_rps, args.duration, args.day_seconds, parse_mix(args.mix),
+                     args.zipf, args.members, args.max_inflight, args.window)
+    finally:
+        if server is not None:
+            server.stop(None)
+    emit(result, args.output)
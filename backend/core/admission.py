@@ -0,0 +1,162 @@
+"""
+Admission control for the gRPC server.
+
+Requests beyond what the server can serve in good time are rejected up
+front with RESOURCE_EXHAUSTED (`OverloadedError`). They are not left to
+queue until the client's deadline expires. Three checks run in order:
+
+1. Per-method caps (ADMISSION_METHOD_LIMITS), e.g. long-running streams.
+2. Priority lanes. Each lane may fill only its share of the concurrency
+   limit: critical (BorrowBook/ReturnBook) 100%, default
+   ADMISSION_DEFAULT_SHARE, bulk (List*/Stream*/BatchGet*)
+   ADMISSION_BULK_SHARE. Under load, bulk reads are shed first and some
+   slots always stay free for circulation.
+3. The concurrency limit itself. By default it is fixed at the worker
+   count. With ADMISSION_ADAPTIVE it is adapted with AIMD from observed
+   latency. Each method is compared against its own baseline (its lowest
+   recent latency), so only congestion shrinks the limit, not methods that
+   are slow by nature. A unary RPC slower than ADMISSION_LATENCY_TOLERANCE
+   times its baseline and above ADMISSION_LATENCY_TARGET_MS cuts the limit
+   multiplicatively. Faster samples grow it by about one slot per limit's
+   worth. Bulk-lane calls do not feed it: their cost depends on page size.
+   Latency is counted from when the call was queued for a worker
+   (`QueueTimingExecutor`), so executor queueing shows up in the samples.
+
+The server-wide queue in front of the worker pool is bounded separately
+with grpc.server(maximum_concurrent_rpcs=GRPC_MAX_CONCURRENT_RPCS).
+"""
+import time
+import threading
+from concurrent import futures
+from typing import Dict, Iterable, Optional
+from backend.core.config import Config
+from backend.core.exceptions import OverloadedError
+from backend.core import metrics
+
+CRITICAL, DEFAULT, BULK = "critical", "default", "bulk"
+_BULK_PREFIXES = ("List", "Stream", "BatchGet")
+
+ADMISSION_REJECTED = metrics.REGISTRY.register(metrics.Counter(
+    "grpc_server_admission_rejected_total", "RPCs rejected by admission control.", ("method", "lane", "reason")))
+
+# Share of the gap a slower sample moves a method's baseline, so it follows lasting shifts
+_BASELINE_DRIFT = 0.001
+
+_call_state = threading.local()
+
+class QueueTimingExecutor(futures.ThreadPoolExecutor):
+    """Worker pool for grpc.server that records when each call was queued (see `enqueued_at`)."""
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(_run_timed, time.perf_counter(), fn, *args, **kwargs)
+
+def _run_timed(enqueued: float, fn, *args, **kwargs):
+    _call_state.enqueued = enqueued
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _call_state.enqueued = None
+
+def enqueued_at() -> Optional[float]:
+    """perf_counter() time the running call was queued for a worker (None outside QueueTimingExecutor)."""
+    return getattr(_call_state, "enqueued", None)
+
+class AdaptiveLimit:
+    """AIMD concurrency limit driven by latency samples compared to per-method baselines."""
+    def __init__(self, initial: float, min_limit: int, max_limit: int, target_latency: float,
+                 tolerance: float = 2.0, backoff: float = 0.9):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._baselines: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_sample(self, name: str, latency: float) -> None:
+        with self._lock:
+            baseline = self._baselines.get(name)
+            if baseline is None or latency < baseline:
+                baseline = latency
+            else:
+                baseline += (latency - baseline) * _BASELINE_DRIFT
+            self._baselines[name] = baseline
+            if latency > self.target_latency and latency > baseline * self.tolerance:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+            else:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+
+class FixedLimit:
+    def __init__(self, limit: int):
+        self.limit = limit
+
+    def on_sample(self, name: str, latency: float) -> None:
+        pass
+
+class AdmissionController:
+    def __init__(self, limit, critical_methods: Iterable[str] = (), method_limits: Optional[Dict[str, int]] = None,
+                 default_share: float = 0.8, bulk_share: float = 0.5):
+        self.limiter = limit
+        self.critical_methods = frozenset(critical_methods)
+        self.method_limits = dict(method_limits or {})
+        self.shares = {CRITICAL: 1.0, DEFAULT: default_share, BULK: bulk_share}
+        self.inflight = 0
+        self._per_method: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def lane(self, name: str) -> str:
+        if name in self.critical_methods:
+            return CRITICAL
+        return BULK if name.startswith(_BULK_PREFIXES) else DEFAULT
+
+    def acquire(self, name: str) -> str:
+        """
+        Admits one call to method `name` (e.g. "BorrowBook") and returns its lane.
+
+        Raises:
+            OverloadedError: If the method cap, lane share or concurrency limit is reached.
+        """
+        lane = self.lane(name)
+        cap = self.method_limits.get(name)
+        with self._lock:
+            if cap is not None and self._per_method.get(name, 0) >= cap:
+                reason = "method_limit"
+            elif self.inflight >= max(1, int(self.limiter.limit * self.shares[lane])):
+                reason = "lane_limit" if lane != CRITICAL else "concurrency_limit"
+            else:
+                self.inflight += 1
+                self._per_method[name] = self._per_method.get(name, 0) + 1
+                return lane
+        ADMISSION_REJECTED.inc(name, lane, reason)
+        raise OverloadedError(f"Server is overloaded, retry {name} later")
+
+    def release(self, name: str, latency: Optional[float] = None) -> None:
+        """Releases a slot taken by `acquire`; `latency` (seconds) feeds the adaptive limit outside the bulk lane."""
+        with self._lock:
+            self.inflight -= 1
+            self._per_method[name] -= 1
+        if latency is not None and self.lane(name) != BULK:
+            self.limiter.on_sample(name, latency)
+
+def from_config(max_workers: Optional[int] = None) -> Optional[AdmissionController]:
+    """Builds the controller from Config (None when ADMISSION_ENABLED is off)."""
+    config = Config.get_admission_config()
+    if not config["enabled"]:
+        return None
+    max_limit = config["max_limit"] or max_workers or Config.get_max_workers()
+    if config["adaptive"]:
+        limit = AdaptiveLimit(max_limit, min(config["min_limit"], max_limit), max_limit,
+                              config["latency_target_ms"] / 1000, config["latency_tolerance"])
+    else:
+        limit = FixedLimit(max_limit)
+    controller = AdmissionController(limit, config["critical_methods"], config["method_limits"],
+                                     config["default_share"], config["bulk_share"])
+    metrics.REGISTRY.register(metrics.Gauge(
+        "grpc_server_concurrency_limit", "Current admission concurrency limit.", lambda: controller.limiter.limit))
+    metrics.REGISTRY.register(metrics.Gauge(
+        "grpc_server_inflight", "RPCs currently admitted.", lambda: controller.inflight))
+    return controller
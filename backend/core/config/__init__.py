@@ -2,7 +2,7 @@ import os
 from pydantic_settings import BaseSettings
 
 from pydantic import model_validator
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 class Settings(BaseSettings):
     DB_USER: str = "library_user"
@@ -12,14 +12,103 @@ class Settings(BaseSettings):
     DB_NAME: str = "library_db"
     
     DATABASE_URL: Optional[str] = None
+    # Driver used for plain postgresql:// URLs (an explicit postgresql+<driver>:// URL wins)
+    DB_DRIVER: Literal["psycopg", "psycopg2"] = "psycopg2"
+    # psycopg3 only: executions before a statement is prepared server-side (0 = always, -1 = never)
+    DB_PREPARE_THRESHOLD: int = 5
     GRPC_PORT: str = "50051"
     MAX_WORKERS: int = 10
+    # RPCs accepted (running + queued for a worker) before gRPC itself answers RESOURCE_EXHAUSTED; 0 = unbounded
+    GRPC_MAX_CONCURRENT_RPCS: int = 100
+
+    # gRPC transport (see backend/core/grpc_options.py); 0 leaves a gRPC default in place
+    GRPC_COMPRESSION: Literal["none", "gzip", "deflate"] = "none"
+    GRPC_COMPRESSION_MIN_BYTES: int = 4096
+    GRPC_COMPRESSION_METHODS: List[str] = []  # empty = every method
+    GRPC_MAX_MESSAGE_BYTES: int = 16 * 1024 * 1024
+    GRPC_KEEPALIVE_TIME_MS: int = 60000
+    GRPC_KEEPALIVE_TIMEOUT_MS: int = 20000
+    GRPC_KEEPALIVE_PERMIT_WITHOUT_CALLS: bool = False
+    GRPC_MAX_CONNECTION_IDLE_MS: int = 0
+    GRPC_MAX_CONNECTION_AGE_MS: int = 0
+    GRPC_MAX_CONNECTION_AGE_GRACE_MS: int = 0
+    GRPC_HTTP2_BDP_PROBE: bool = True
+    GRPC_HTTP2_STREAM_WINDOW_BYTES: int = 0
+
+    # Admission control (see backend/core/admission.py)
+    ADMISSION_ENABLED: bool = False
+    ADMISSION_ADAPTIVE: bool = False
+    ADMISSION_MAX_LIMIT: int = 0  # 0 = MAX_WORKERS
+    ADMISSION_MIN_LIMIT: int = 2
+    ADMISSION_LATENCY_TARGET_MS: float = 250.0
+    ADMISSION_LATENCY_TOLERANCE: float = 2.0
+    ADMISSION_CRITICAL_METHODS: List[str] = ["BorrowBook", "ReturnBook", "BatchBorrow", "BatchReturn"]
+    ADMISSION_METHOD_LIMITS: Dict[str, int] = {"StreamBooks": 2, "StreamMembers": 2}
+    ADMISSION_DEFAULT_SHARE: float = 0.8
+    ADMISSION_BULK_SHARE: float = 0.5
+
+    # Token-bucket rate limiting per client (x-client-id or peer) and, on loan RPCs, per member
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_STORE: Literal["memory", "database"] = "memory"
+    RATE_LIMIT_SHARDS: int = 64
+    RATE_LIMIT_CLIENT_RATE: float = 50.0
+    RATE_LIMIT_CLIENT_BURST: float = 100.0
+    RATE_LIMIT_MEMBER_RATE: float = 0.5
+    RATE_LIMIT_MEMBER_BURST: float = 5.0
+    RATE_LIMIT_MEMBER_METHODS: List[str] = ["BorrowBook", "BatchBorrow", "ListMemberLoans"]
+    RATE_LIMIT_PURGE_INTERVAL_SECONDS: int = 300
+
+    # Idempotency keys (x-idempotency-key metadata on BorrowBook/ReturnBook)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 300
+
+    # Dashboard stats snapshot (GetLibraryStats); 0 recomputes it on every call
+    STATS_REFRESH_SECONDS: float = 60.0
+    STATS_WINDOW_DAYS: int = 30
+    STATS_TOP_TITLES: int = 10
+
+    # Availability materialized views: rebuilt on a schedule, or early after enough catalog writes (0 disables either)
+    VIEWS_REFRESH_SECONDS: float = 300.0
+    VIEWS_REFRESH_WRITES: int = 1000
+    VIEWS_REFRESH_MIN_SECONDS: float = 10.0
     
     # DB Pooling
     POSTGRES_POOL_SIZE: int = 5
     POSTGRES_MAX_OVERFLOW: int = 10
     POSTGRES_POOL_TIMEOUT: int = 30
     POSTGRES_POOL_RECYCLE: int = 1800
+
+    # Streaming exports
+    STREAM_CHUNK_SIZE: int = 500
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_ASYNC: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_POLICY: Literal["drop", "block"] = "drop"
+
+    # Metrics (Prometheus text format on http://<host>:METRICS_PORT/metrics; 0 disables)
+    METRICS_PORT: int = 9100
+
+    # Tracing ("memory" keeps spans in-process, "otlp_file" appends OTLP/JSON lines to TRACING_FILE)
+    TRACING_EXPORTER: Literal["none", "memory", "otlp_file"] = "none"
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0
+
+    # Development-mode SQL diagnostics (per-RPC statement budget, N+1 and slow-statement warnings)
+    SQL_DIAGNOSTICS: bool = False
+    SQL_QUERY_BUDGET: int = 20
+    SQL_REPEAT_THRESHOLD: int = 5
+    SQL_SLOW_MS: float = 100.0
+
+    # Per-request profiling (x-profile: 1 metadata or random sampling); off means zero overhead
+    PROFILE_ENABLED: bool = False
+    PROFILE_TOKEN: Optional[str] = None
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_MODE: Literal["cprofile", "sample"] = "cprofile"
+    PROFILE_INTERVAL_MS: float = 5.0
+    PROFILE_DIR: str = "profiles"
     
     @model_validator(mode='after')
     def compute_database_url(self) -> 'Settings':
@@ -27,16 +116,35 @@ class Settings(BaseSettings):
             self.DATABASE_URL = f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         return self
 
+    @model_validator(mode='after')
+    def require_profile_token(self) -> 'Settings':
+        # x-profile would otherwise let any client slow the server down with profiling
+        if self.PROFILE_ENABLED and not self.PROFILE_TOKEN:
+            raise ValueError("PROFILE_ENABLED requires PROFILE_TOKEN")
+        return self
+
     class Config:
         env_file = ".env"
         extra = "ignore"
 
 settings = Settings()
 
+def _with_driver(url: str, driver: str) -> str:
+    for scheme in ("postgresql://", "postgres://"):
+        if url.startswith(scheme):
+            return f"postgresql+{driver}://" + url[len(scheme):]
+    return url
+
 class Config:
     @staticmethod
     def get_database_url():
-        return settings.DATABASE_URL
+        return _with_driver(settings.DATABASE_URL, settings.DB_DRIVER)
+
+    @staticmethod
+    def get_prepare_threshold() -> Optional[int]:
+        # psycopg expects None to disable server-side prepares
+        threshold = settings.DB_PREPARE_THRESHOLD
+        return None if threshold < 0 else threshold
 
     @staticmethod
     def get_grpc_port():
@@ -46,6 +154,79 @@ class Config:
     def get_max_workers():
         return settings.MAX_WORKERS
 
+    @staticmethod
+    def get_max_concurrent_rpcs() -> Optional[int]:
+        return settings.GRPC_MAX_CONCURRENT_RPCS or None
+
+    @staticmethod
+    def get_grpc_config():
+        return {
+            "compression": settings.GRPC_COMPRESSION,
+            "compression_min_bytes": settings.GRPC_COMPRESSION_MIN_BYTES,
+            "compression_methods": settings.GRPC_COMPRESSION_METHODS,
+            "max_message_bytes": settings.GRPC_MAX_MESSAGE_BYTES,
+            "keepalive_time_ms": settings.GRPC_KEEPALIVE_TIME_MS,
+            "keepalive_timeout_ms": settings.GRPC_KEEPALIVE_TIMEOUT_MS,
+            "keepalive_permit_without_calls": settings.GRPC_KEEPALIVE_PERMIT_WITHOUT_CALLS,
+            "max_connection_idle_ms": settings.GRPC_MAX_CONNECTION_IDLE_MS,
+            "max_connection_age_ms": settings.GRPC_MAX_CONNECTION_AGE_MS,
+            "max_connection_age_grace_ms": settings.GRPC_MAX_CONNECTION_AGE_GRACE_MS,
+            "http2_bdp_probe": settings.GRPC_HTTP2_BDP_PROBE,
+            "http2_stream_window_bytes": settings.GRPC_HTTP2_STREAM_WINDOW_BYTES
+        }
+
+    @staticmethod
+    def get_admission_config():
+        return {
+            "enabled": settings.ADMISSION_ENABLED,
+            "adaptive": settings.ADMISSION_ADAPTIVE,
+            "max_limit": settings.ADMISSION_MAX_LIMIT,
+            "min_limit": settings.ADMISSION_MIN_LIMIT,
+            "latency_target_ms": settings.ADMISSION_LATENCY_TARGET_MS,
+            "latency_tolerance": settings.ADMISSION_LATENCY_TOLERANCE,
+            "critical_methods": settings.ADMISSION_CRITICAL_METHODS,
+            "method_limits": settings.ADMISSION_METHOD_LIMITS,
+            "default_share": settings.ADMISSION_DEFAULT_SHARE,
+            "bulk_share": settings.ADMISSION_BULK_SHARE
+        }
+
+    @staticmethod
+    def get_rate_limit_config():
+        return {
+            "enabled": settings.RATE_LIMIT_ENABLED,
+            "store": settings.RATE_LIMIT_STORE,
+            "shards": settings.RATE_LIMIT_SHARDS,
+            "client_rate": settings.RATE_LIMIT_CLIENT_RATE,
+            "client_burst": settings.RATE_LIMIT_CLIENT_BURST,
+            "member_rate": settings.RATE_LIMIT_MEMBER_RATE,
+            "member_burst": settings.RATE_LIMIT_MEMBER_BURST,
+            "member_methods": settings.RATE_LIMIT_MEMBER_METHODS,
+            "purge_interval_seconds": settings.RATE_LIMIT_PURGE_INTERVAL_SECONDS
+        }
+
+    @staticmethod
+    def get_idempotency_config():
+        return {
+            "ttl_seconds": settings.IDEMPOTENCY_TTL_SECONDS,
+            "purge_interval_seconds": settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS
+        }
+
+    @staticmethod
+    def get_stats_config():
+        return {
+            "refresh_seconds": settings.STATS_REFRESH_SECONDS,
+            "window_days": settings.STATS_WINDOW_DAYS,
+            "top_titles": settings.STATS_TOP_TITLES
+        }
+
+    @staticmethod
+    def get_views_config():
+        return {
+            "refresh_seconds": settings.VIEWS_REFRESH_SECONDS,
+            "refresh_writes": settings.VIEWS_REFRESH_WRITES,
+            "refresh_min_seconds": settings.VIEWS_REFRESH_MIN_SECONDS
+        }
+
     @staticmethod
     def get_postgres_pool_config():
         return {
@@ -54,3 +235,58 @@ class Config:
             "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
             "pool_recycle": settings.POSTGRES_POOL_RECYCLE
         }
+
+    @staticmethod
+    def get_stream_chunk_size():
+        return settings.STREAM_CHUNK_SIZE
+
+    @staticmethod
+    def get_log_level():
+        return settings.LOG_LEVEL.upper()
+
+    @staticmethod
+    def get_logging_config():
+        return {
+            "fmt": settings.LOG_FORMAT,
+            "use_queue": settings.LOG_ASYNC,
+            "queue_size": settings.LOG_QUEUE_SIZE,
+            "policy": settings.LOG_QUEUE_POLICY
+        }
+
+    @staticmethod
+    def get_metrics_port():
+        return settings.METRICS_PORT
+
+    @staticmethod
+    def get_tracing_config():
+        return {
+            "exporter": settings.TRACING_EXPORTER,
+            "file": settings.TRACING_FILE,
+            "sample_ratio": settings.TRACING_SAMPLE_RATIO
+        }
+
+    @staticmethod
+    def is_sql_diagnostics_enabled():
+        return settings.SQL_DIAGNOSTICS
+
+    @staticmethod
+    def get_sql_diagnostics_config():
+        return {
+            "budget": settings.SQL_QUERY_BUDGET,
+            "repeat_threshold": settings.SQL_REPEAT_THRESHOLD,
+            "slow_ms": settings.SQL_SLOW_MS
+        }
+
+    @staticmethod
+    def is_profiling_enabled():
+        return settings.PROFILE_ENABLED and bool(settings.PROFILE_TOKEN)
+
+    @staticmethod
+    def get_profiling_config():
+        return {
+            "token": settings.PROFILE_TOKEN,
+            "sample_rate": settings.PROFILE_SAMPLE_RATE,
+            "mode": settings.PROFILE_MODE,
+            "interval_ms": settings.PROFILE_INTERVAL_MS,
+            "dir": settings.PROFILE_DIR
+        }
@@ -6,6 +6,13 @@ class DBTables:
     GENRES = "genres"
     LOANS = "loans"
     BOOK_GENRES = "book_genres"
+    RATE_LIMIT_BUCKETS = "rate_limit_buckets"
+    IDEMPOTENCY_KEYS = "idempotency_keys"
+    CIRCULATION_DAILY = "circulation_daily"
+    LIBRARY_STATS = "library_stats"
+    VIEW_REFRESHES = "view_refreshes"
+    GENRE_AVAILABILITY = "genre_availability"
+    AUTHOR_AVAILABILITY = "author_availability"
 
 class Limits:
     AUTHOR_NAME_MAX = 100
@@ -13,3 +20,7 @@ class Limits:
     MEMBER_NAME_MAX = 100
     MEMBER_EMAIL_MAX = 255
     BOOK_TITLE_MAX = 200
+    BATCH_GET_MAX = 500
+    BOOK_COPIES_BATCH_MAX = 10000
+    BATCH_LOAN_MAX = 50
+    STREAM_CHUNK_SIZE_MAX = 5000
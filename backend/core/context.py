@@ -1,5 +1,36 @@
+import itertools
+import time
+import uuid
 from contextvars import ContextVar
+from typing import Optional
 
 # Context variable to store the request ID
 # Default is None meaning no request context
 request_id_ctx_var: ContextVar[str] = ContextVar("request_id", default=None)
+
+# Absolute time.monotonic() deadline of the current RPC; None when the client set none
+deadline_ctx_var: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+# Postgres caps statement_timeout at INT_MAX milliseconds. gRPC reports ~9.2e18 s remaining
+# for calls sent without a deadline, so anything beyond this is treated as no deadline.
+MAX_DEADLINE_SECONDS = (2**31 - 1) / 1000
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current RPC's deadline (negative once passed), or None."""
+    deadline = deadline_ctx_var.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+def metadata_value(metadata, key: str) -> Optional[str]:
+    """Value of `key` in gRPC invocation metadata (a short sequence of pairs), without building a dict."""
+    for k, v in metadata:
+        if k == key:
+            return v
+    return None
+
+# Request ids minted by this process: a random UUID-shaped prefix plus a counter,
+# so ids stay unique across processes without urandom/UUID work per request
+_REQUEST_ID_PREFIX = str(uuid.uuid4())[:24]
+_request_id_counter = itertools.count()
+
+def new_request_id() -> str:
+    return _REQUEST_ID_PREFIX + "%012x" % next(_request_id_counter)
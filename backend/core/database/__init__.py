@@ -2,9 +2,10 @@ from .infrastructure.models import (
     BookMetadataModel, BookCopyModel, MemberModel, LoanModel, AuthorModel, GenreModel
 )
 from .repositories import (
-    BookRepository, MemberRepository, LoanRepository, AuthorRepository, GenreRepository
+    BookRepository, MemberRepository, LoanRepository, AuthorRepository, GenreRepository, StatsRepository, ViewRepository
 )
 from .infrastructure.session import get_db
+from .loaders import DataLoader, RequestLoaders, get_loaders
 from .initialization.schema import init_db
 
 __all__ = [
@@ -19,6 +20,11 @@ __all__ = [
     "LoanRepository",
     "AuthorRepository",
     "GenreRepository",
+    "StatsRepository",
+    "ViewRepository",
+    "DataLoader",
+    "RequestLoaders",
+    "get_loaders",
     "get_db",
     "init_db"
 ]
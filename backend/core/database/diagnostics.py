@@ -0,0 +1,128 @@
+"""
+Development-mode SQL diagnostics: per-RPC statement budgets, N+1 detection
+and slow-statement logging with EXPLAIN output.
+
+Enabled with SQL_DIAGNOSTICS=true. The interceptor wraps each RPC in
+`watch_request`, and the engine listeners installed by `install` feed the
+active `QueryRecorder`. The same recorder backs the `assert_max_queries`
+pytest fixture.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from backend.core.config import Config
+from backend.core.logger import logger
+
+# Expanded IN lists render one placeholder per value; collapse them so
+# `IN (?, ?)` and `IN (?, ?, ?)` count as the same statement shape
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+|\$\d+))*\s*\)")
+
+def statement_shape(statement: str) -> str:
+    return " ".join(_PLACEHOLDER_LIST.sub("(...)", statement).split())
+
+class QueryRecorder:
+    """Statements executed while the recorder is active, with parameters and durations."""
+    def __init__(self):
+        self.queries: List[Tuple[str, object, float]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def shapes(self) -> Counter:
+        return Counter(statement_shape(statement) for statement, _, _ in self.queries)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than `threshold` times (likely N+1 loops)."""
+        return [(shape, n) for shape, n in self.shapes().most_common() if n > threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.count} statements executed:"]
+        lines += [f"  {n}x {shape}" for shape, n in self.shapes().most_common()]
+        return "\n".join(lines)
+
+_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar("query_recorder", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _recorder.get() is not None:
+        context._diag_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorder = _recorder.get()
+    if recorder is None:
+        return
+    start = getattr(context, "_diag_start", None)
+    duration = time.perf_counter() - start if start is not None else 0.0
+    recorder.queries.append((statement, parameters, duration))
+
+    slow_ms = Config.get_sql_diagnostics_config()["slow_ms"]
+    if duration * 1000 >= slow_ms:
+        logger.warning("Slow statement (%.1f ms): %s | params=%r%s", duration * 1000, statement, parameters,
+                       "" if executemany else _explain(conn, statement, parameters))
+
+_EXPLAIN_SAVEPOINT = "sql_diagnostics_explain"
+
+def _explain(conn, statement: str, parameters) -> str:
+    if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT", "WITH")):
+        return ""
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    try:
+        # Raw DBAPI cursor, so the EXPLAIN itself does not re-enter these listeners
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            # Inside a savepoint: on Postgres a failed EXPLAIN would otherwise abort the RPC's transaction
+            cursor.execute(f"SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+            except Exception:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+                raise
+            finally:
+                cursor.execute(f"RELEASE SAVEPOINT {_EXPLAIN_SAVEPOINT}")
+        finally:
+            cursor.close()
+    except Exception as e:
+        return f"\n  (EXPLAIN failed: {e})"
+    return "\n  " + plan.replace("\n", "\n  ")
+
+def install(engine=Engine) -> None:
+    """Attaches the recording listeners to `engine` (default: every engine)."""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def uninstall(engine=Engine) -> None:
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+@contextmanager
+def record():
+    """Records the statements executed in this context (nested recorders see only their own)."""
+    recorder = QueryRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        try:
+            _recorder.reset(token)
+        except ValueError:
+            _recorder.set(None)
+
+@contextmanager
+def watch_request(method: str):
+    """Records one RPC and warns when it exceeds the statement budget or repeats a statement shape."""
+    with record() as recorder:
+        yield recorder
+    config = Config.get_sql_diagnostics_config()
+    if recorder.count > config["budget"]:
+        logger.warning("%s executed %d SQL statements (budget %d)\n%s",
+                       method, recorder.count, config["budget"], recorder.report())
+    for shape, n in recorder.repeated(config["repeat_threshold"]):
+        logger.warning("Possible N+1 in %s: statement repeated %d times: %s", method, n, shape)
@@ -4,6 +4,10 @@ from .member import MemberModel
 from .loan import LoanModel
 from .author import AuthorModel
 from .genre import GenreModel, book_genre
+from .rate_limit import RateLimitBucketModel
+from .idempotency import IdempotencyKeyModel
+from .stats import CirculationDailyModel, LibraryStatsModel
+from .views import ViewRefreshModel, ManagedView, MANAGED_VIEWS, SOURCE_TABLES
 
 __all__ = [
     "Base",
@@ -13,5 +17,13 @@ __all__ = [
     "LoanModel",
     "AuthorModel",
     "GenreModel",
-    "book_genre"
+    "book_genre",
+    "RateLimitBucketModel",
+    "IdempotencyKeyModel",
+    "CirculationDailyModel",
+    "LibraryStatsModel",
+    "ViewRefreshModel",
+    "ManagedView",
+    "MANAGED_VIEWS",
+    "SOURCE_TABLES"
 ]
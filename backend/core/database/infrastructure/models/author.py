@@ -13,7 +13,7 @@ class AuthorModel(Base):
     __tablename__ = DBTables.AUTHORS # "authors"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, unique=True)
     bio = Column(Text, nullable=True)
 
     # Relationship to books
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Float, LargeBinary, String
+from backend.core.database.infrastructure.models.base import Base
+from backend.core.constants import DBTables
+
+class IdempotencyKeyModel(Base):
+    """Stored response of a retried-safe RPC (see backend/core/idempotency.py)."""
+    __tablename__ = DBTables.IDEMPOTENCY_KEYS # "idempotency_keys"
+
+    # "<method>:<client key>"
+    key = Column(String, primary_key=True)
+    # Digest of the serialized request, to reject a key reused for a different request
+    fingerprint = Column(LargeBinary, nullable=False)
+    # Serialized response message; written in the same transaction as the RPC's effects
+    response = Column(LargeBinary, nullable=True)
+    # Unix time the key was claimed; rows older than IDEMPOTENCY_TTL_SECONDS are purged
+    created_at = Column(Float, nullable=False, index=True)
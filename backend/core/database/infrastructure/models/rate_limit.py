@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Float, String
+from backend.core.database.infrastructure.models.base import Base
+from backend.core.constants import DBTables
+
+class RateLimitBucketModel(Base):
+    """Token bucket shared by every backend process (see backend/core/ratelimit.py)."""
+    __tablename__ = DBTables.RATE_LIMIT_BUCKETS # "rate_limit_buckets"
+
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    # Unix time of the last refill; wall clock so all processes agree
+    updated_at = Column(Float, nullable=False)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer, JSON, String
+from backend.core.database.infrastructure.models.base import Base
+from backend.core.constants import DBTables
+
+class CirculationDailyModel(Base):
+    """
+    Loans started per book and day. Loans are deleted on return, so this is
+    the only circulation history; it is incremented by the borrow RPCs.
+    """
+    __tablename__ = DBTables.CIRCULATION_DAILY # "circulation_daily"
+
+    day = Column(Date, primary_key=True)
+    book_id = Column(String, ForeignKey("books_metadata.id", ondelete="CASCADE"), primary_key=True)
+    loans = Column(Integer, nullable=False, default=0)
+
+class LibraryStatsModel(Base):
+    """Single-row snapshot behind GetLibraryStats, rewritten by the stats refresher."""
+    __tablename__ = DBTables.LIBRARY_STATS # "library_stats"
+
+    id = Column(Integer, primary_key=True, default=1)
+    total_books = Column(Integer, nullable=False)
+    total_copies = Column(Integer, nullable=False)
+    available_copies = Column(Integer, nullable=False)
+    active_loans = Column(Integer, nullable=False)
+    total_members = Column(Integer, nullable=False)
+    total_authors = Column(Integer, nullable=False)
+    total_genres = Column(Integer, nullable=False)
+    # [{"book_id", "title", "loans"}] over the STATS_WINDOW_DAYS window, most borrowed first
+    top_titles = Column(JSON, nullable=False)
+    # [{"day": "YYYY-MM-DD", "loans"}] over the same window, oldest first
+    loans_per_day = Column(JSON, nullable=False)
+    # Unix time the snapshot was computed
+    refreshed_at = Column(Float, nullable=False)
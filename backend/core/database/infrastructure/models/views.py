@@ -0,0 +1,90 @@
+"""
+Managed materialized views: catalog-wide aggregates that are too costly to
+join on every request. On Postgres each is a MATERIALIZED VIEW with a unique
+index (required by REFRESH ... CONCURRENTLY, which keeps it readable while it
+is rebuilt); on other databases it is a plain snapshot table rebuilt with
+DELETE + INSERT ... SELECT. Both are created after and dropped before the
+metadata's tables, so create_all/drop_all manage them like any table.
+
+When each view was last rebuilt is kept in `view_refreshes`.
+"""
+import time
+from sqlalchemy import Column, Float, String, column, event, table, text
+from sqlalchemy.dialects import postgresql, sqlite
+from backend.core.database.infrastructure.models.base import Base
+from backend.core.constants import DBTables
+
+class ViewRefreshModel(Base):
+    __tablename__ = DBTables.VIEW_REFRESHES # "view_refreshes"
+
+    name = Column(String, primary_key=True)
+    # Unix time the view was last rebuilt
+    refreshed_at = Column(Float, nullable=False)
+
+class ManagedView:
+    """An availability summary keyed by `id`: (id, name, books, copies, available_copies)."""
+    def __init__(self, name: str, query: str):
+        self.name = name
+        self.query = query
+        self.table = table(name, column("id"), column("name"), column("books"), column("copies"), column("available_copies"))
+
+    def create(self, connection):
+        if connection.dialect.name == "postgresql":
+            connection.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {self.name} AS {self.query}"))
+            connection.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {self.name}_id_key ON {self.name} (id)"))
+        else:
+            connection.execute(text(f"CREATE TABLE IF NOT EXISTS {self.name} AS {self.query}"))
+
+    def drop(self, connection):
+        kind = "MATERIALIZED VIEW" if connection.dialect.name == "postgresql" else "TABLE"
+        connection.execute(text(f"DROP {kind} IF EXISTS {self.name}"))
+
+    def refresh(self, connection):
+        if connection.dialect.name == "postgresql":
+            connection.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.name}"))
+        else:
+            connection.execute(text(f"DELETE FROM {self.name}"))
+            connection.execute(text(f"INSERT INTO {self.name} {self.query}"))
+
+GENRE_AVAILABILITY = ManagedView(DBTables.GENRE_AVAILABILITY, """
+    SELECT g.id AS id, g.name AS name,
+           COUNT(DISTINCT b.id) AS books,
+           COUNT(c.id) AS copies,
+           COUNT(c.id) FILTER (WHERE c.is_available) AS available_copies
+    FROM genres g
+    LEFT JOIN book_genre bg ON bg.genre_id = g.id
+    LEFT JOIN books_metadata b ON b.id = bg.book_id
+    LEFT JOIN book_copies c ON c.book_metadata_id = b.id
+    GROUP BY g.id, g.name
+""")
+
+AUTHOR_AVAILABILITY = ManagedView(DBTables.AUTHOR_AVAILABILITY, """
+    SELECT a.id AS id, a.name AS name,
+           COUNT(DISTINCT b.id) AS books,
+           COUNT(c.id) AS copies,
+           COUNT(c.id) FILTER (WHERE c.is_available) AS available_copies
+    FROM authors a
+    LEFT JOIN books_metadata b ON b.author_id = a.id
+    LEFT JOIN book_copies c ON c.book_metadata_id = b.id
+    GROUP BY a.id, a.name
+""")
+
+MANAGED_VIEWS = {view.name: view for view in (GENRE_AVAILABILITY, AUTHOR_AVAILABILITY)}
+
+# Writes to these tables make the views stale
+SOURCE_TABLES = frozenset({"genres", "authors", "book_genre", "books_metadata", "book_copies"})
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_views(target, connection, **kw):
+    for view in MANAGED_VIEWS.values():
+        view.create(connection)
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    # Views that already existed keep their last refresh time
+    connection.execute(insert(ViewRefreshModel).values(
+        [{"name": name, "refreshed_at": time.time()} for name in MANAGED_VIEWS]
+    ).on_conflict_do_nothing())
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_views(target, connection, **kw):
+    for view in MANAGED_VIEWS.values():
+        view.drop(connection)
@@ -1,22 +1,98 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import time
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from backend.core.config import Config
+from backend.core.context import time_remaining
+from backend.core import metrics, tracing
 
 DATABASE_URL = Config.get_database_url()
 pool_config = Config.get_postgres_pool_config()
 
-engine_args = {}
-if "sqlite" not in DATABASE_URL:
+class DeadlineQueuePool(QueuePool):
+    """
+    QueuePool whose checkout wait is capped by the current RPC's remaining
+    deadline instead of always waiting the full POSTGRES_POOL_TIMEOUT.
+    """
+    @property
+    def _timeout(self) -> float:
+        remaining = time_remaining()
+        if remaining is None:
+            return self._configured_timeout
+        return max(0.0, min(self._configured_timeout, remaining))
+
+    @_timeout.setter
+    def _timeout(self, value: float) -> None:
+        self._configured_timeout = value
+
+    def timeout(self) -> float:
+        return self._configured_timeout
+
+    def recreate(self) -> "DeadlineQueuePool":
+        pool = super().recreate()
+        pool._timeout = self._configured_timeout
+        return pool
+
+def create_db_engine(url: str, prepare_threshold: Optional[int] = None):
+    """
+    Builds an engine for `url` with the pool settings from Config.
+
+    With the psycopg (3) driver, statements executed `prepare_threshold` times
+    on a connection are prepared server-side, so hot lookups and inserts skip
+    re-planning. psycopg2 has no equivalent and ignores the threshold.
+    """
+    if "sqlite" in url:
+        return create_engine(url)
+
     engine_args = {
         "pool_size": pool_config["pool_size"],
         "max_overflow": pool_config["max_overflow"],
         "pool_timeout": pool_config["pool_timeout"],
         "pool_recycle": pool_config["pool_recycle"],
-        "pool_pre_ping": True
+        "pool_pre_ping": True,
+        "poolclass": DeadlineQueuePool
     }
+    if make_url(url).get_driver_name() == "psycopg":
+        engine_args["connect_args"] = {"prepare_threshold": prepare_threshold}
+    return create_engine(url, **engine_args)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+    span = context._trace_span = tracing.tracer.start_span("db.query", tracing.SPAN_KIND_CLIENT)
+    if span is not None:
+        span.set_attribute("db.system", conn.dialect.name)
+        span.set_attribute("db.statement", statement[:1000])
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics.record_statement(time.perf_counter() - context._query_start)
+    if context._trace_span is not None:
+        context._trace_span.end()
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        span.set_error(str(exception_context.original_exception))
+        span.end()
+
+def instrument_engine(engine) -> None:
+    """Feeds statement metrics and pool gauges into the registry, and SQL spans into traces."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    metrics.register_pool_gauges(engine.pool)
+    if Config.is_sql_diagnostics_enabled():
+        from backend.core.database import diagnostics
+        diagnostics.install(engine)
 
-engine = create_engine(DATABASE_URL, **engine_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_db_engine(DATABASE_URL, Config.get_prepare_threshold())
+instrument_engine(engine)
+# Objects stay loaded after commit: responses are mapped from them without refresh SELECTs
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+# One Session object per gRPC worker thread, reused across that thread's requests (see db_scope)
+ScopedSession = scoped_session(SessionLocal)
 
 def get_db():
     db = SessionLocal()
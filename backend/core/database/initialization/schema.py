@@ -1,7 +1,8 @@
 import os
 from ..infrastructure.session import engine
 from ..infrastructure.models import (
-    Base, AuthorModel, GenreModel, BookMetadataModel, BookCopyModel, MemberModel, LoanModel, book_genre
+    Base, AuthorModel, GenreModel, BookMetadataModel, BookCopyModel, MemberModel, LoanModel, book_genre, RateLimitBucketModel,
+    IdempotencyKeyModel, CirculationDailyModel, LibraryStatsModel, ViewRefreshModel
 )
 
 def init_db():
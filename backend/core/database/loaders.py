@@ -0,0 +1,92 @@
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+from backend.core.database.infrastructure.models import (
+    AuthorModel, BookMetadataModel, BookCopyModel, MemberModel
+)
+from backend.core.database.repositories import (
+    AuthorRepository, BookRepository, MemberRepository
+)
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+class DataLoader(Generic[K, V]):
+    """
+    Request-scoped batching cache for id lookups.
+
+    Keys are queued with `enqueue` and resolved together by `dispatch`, so any
+    number of lookups costs a single `batch_fn` call (one `IN (...)` query).
+    Results (including misses) are cached for the rest of the request.
+    """
+    def __init__(self, batch_fn: Callable[[List[K]], Dict[K, V]]):
+        self._batch_fn = batch_fn
+        self._cache: Dict[K, Optional[V]] = {}
+        self._queue: List[K] = []
+
+    def prime(self, key: K, value: Optional[V]) -> None:
+        self._cache[key] = value
+
+    def enqueue(self, keys: Iterable[K]) -> "DataLoader[K, V]":
+        for key in keys:
+            if key is not None and key not in self._cache:
+                self._queue.append(key)
+        return self
+
+    def dispatch(self) -> None:
+        pending = list(dict.fromkeys(k for k in self._queue if k not in self._cache))
+        self._queue.clear()
+        if not pending:
+            return
+        found = self._batch_fn(pending)
+        for key in pending:
+            self._cache[key] = found.get(key)
+
+    def load(self, key: K) -> Optional[V]:
+        return self.load_many([key])[0]
+
+    def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        keys = list(keys)
+        self.enqueue(keys)
+        self.dispatch()
+        return [self._cache.get(key) for key in keys]
+
+class RequestLoaders:
+    """
+    DataLoaders bound to one session (one RPC). Rows already present in the
+    session's identity map are served without SQL; the remaining ids are
+    fetched in one query per entity type. Because loaded rows land in the
+    identity map, later many-to-one relationship access (e.g. `loan.copy`)
+    also resolves without SQL.
+    """
+    SESSION_KEY = "request_loaders"
+
+    def __init__(self, session: Session):
+        self.session = session
+        book_repo = BookRepository(session)
+        self.authors = DataLoader(self._batch(AuthorModel, AuthorRepository(session).list_by_ids))
+        self.books = DataLoader(self._batch(BookMetadataModel, book_repo.list_by_ids))
+        self.copies = DataLoader(self._batch(BookCopyModel, book_repo.list_copies_by_ids))
+        self.members = DataLoader(self._batch(MemberModel, MemberRepository(session).list_by_ids))
+
+    def _batch(self, model, fetch: Callable[[List[str]], list]) -> Callable[[List[str]], dict]:
+        def batch_fn(ids: List[str]) -> dict:
+            found, missing = {}, []
+            for id in ids:
+                obj = self.session.identity_map.get(identity_key(model, id))
+                if obj is not None:
+                    found[id] = obj
+                else:
+                    missing.append(id)
+            if missing:
+                found.update({obj.id: obj for obj in fetch(missing)})
+            return found
+        return batch_fn
+
+def get_loaders(session: Session) -> RequestLoaders:
+    """Returns the loaders for this session, creating them on first use."""
+    loaders = session.info.get(RequestLoaders.SESSION_KEY)
+    if loaders is None:
+        loaders = RequestLoaders(session)
+        session.info[RequestLoaders.SESSION_KEY] = loaders
+    return loaders
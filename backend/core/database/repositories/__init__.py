@@ -1,15 +1,50 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, List, Optional, Tuple
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from datetime import date
+from typing import Dict, Generic, TypeVar, Iterable, Iterator, List, Optional, Set, Tuple
+import uuid
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload, selectinload, load_only
 from backend.core.database.infrastructure.models import (
-    BookMetadataModel, BookCopyModel, MemberModel, LoanModel, AuthorModel, GenreModel
+    BookMetadataModel, BookCopyModel, MemberModel, LoanModel, AuthorModel, GenreModel,
+    CirculationDailyModel, LibraryStatsModel, ViewRefreshModel, MANAGED_VIEWS
 )
 from sqlalchemy.exc import IntegrityError, OperationalError
 from backend.core.exceptions import ConflictError, DatabaseError
+from backend.core.tracing import traced
 
 T = TypeVar('T')
 
+# Repositories use 2.0-style select() constructs: their compiled SQL is cached
+# by the engine per statement shape, so repeated calls only bind new parameters.
+# Primary-key lookups go through session.get(), which skips SQL entirely when
+# the row is already in the identity map.
+
+def _load_columns(stmt, model, fields: Optional[Set[str]], columns: dict):
+    """
+    Restricts the loaded columns to those backing the requested fields.
+    `columns` maps response field names to model attributes; None loads everything.
+    """
+    if fields is None:
+        return stmt
+    attrs = [attr for name, attr in columns.items() if name in fields]
+    return stmt.options(load_only(model.id, *attrs))
+
+def _dialect_insert(session: Session):
+    """The dialect's insert(), which adds ON CONFLICT support (Postgres or SQLite)."""
+    return postgresql.insert if session.get_bind().dialect.name == "postgresql" else sqlite.insert
+
+def _get_or_create(session: Session, model, key, values: dict):
+    """
+    Inserts a row, or returns the existing one whose unique `key` column
+    matches, in a single INSERT ... ON CONFLICT (key) DO UPDATE ... RETURNING.
+    The update only rewrites `key` to its own value: DO NOTHING would return
+    no row on conflict. The existing row's other columns are left as they are.
+    """
+    stmt = _dialect_insert(session)(model).values(**values)
+    stmt = stmt.on_conflict_do_update(index_elements=[key], set_={key.name: stmt.excluded[key.name]})
+    return session.scalars(stmt.returning(model), execution_options={"populate_existing": True}).one()
+
 class IRepository(ABC, Generic[T]):
     def __init__(self, session: Session):
         self.session = session
@@ -30,125 +65,409 @@ class IRepository(ABC, Generic[T]):
         # Default implementation if T is mapped to a table
         pass
 
+    def _paginate(self, stmt, count_stmt, page: int, limit: int) -> Tuple[List[T], int]:
+        total = self.session.scalar(count_stmt)
+        items = self.session.scalars(stmt.offset((page - 1) * limit).limit(limit)).all()
+        return items, total
+
 
 
+@traced
 class AuthorRepository(IRepository[AuthorModel]):
     def add(self, author: AuthorModel) -> AuthorModel:
         self.session.add(author)
         return author
 
     def get_by_id(self, id: str) -> Optional[AuthorModel]:
-        return self.session.query(AuthorModel).filter_by(id=id).first()
+        return self.session.get(AuthorModel, id)
+
+    def get_by_name(self, name: str) -> Optional[AuthorModel]:
+        stmt = select(AuthorModel).where(AuthorModel.name == name).limit(1)
+        return self.session.scalars(stmt).first()
+
+    def get_or_create(self, name: str, bio: str = None) -> AuthorModel:
+        return _get_or_create(self.session, AuthorModel, AuthorModel.name, {"name": name, "bio": bio})
 
     def list_all(self) -> List[AuthorModel]:
-        return self.session.query(AuthorModel).all()
+        return self.session.scalars(select(AuthorModel)).all()
 
-    def paginated_list(self, page: int = 1, limit: int = 10) -> Tuple[List[AuthorModel], int]:
-        query = self.session.query(AuthorModel)
-        total = query.count()
-        items = query.offset((page - 1) * limit).limit(limit).all()
-        return items, total
+    def paginated_list(self, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> Tuple[List[AuthorModel], int]:
+        stmt = _load_columns(select(AuthorModel), AuthorModel, fields, {
+            "name": AuthorModel.name, "bio": AuthorModel.bio
+        })
+        return self._paginate(stmt, select(func.count()).select_from(AuthorModel), page, limit)
 
+    def list_by_ids(self, ids: List[str]) -> List[AuthorModel]:
+        return self.session.scalars(select(AuthorModel).where(AuthorModel.id.in_(ids))).all()
+
+@traced
 class GenreRepository(IRepository[GenreModel]):
     def add(self, genre: GenreModel) -> GenreModel:
         self.session.add(genre)
         return genre
 
     def get_by_id(self, id: str) -> Optional[GenreModel]:
-        return self.session.query(GenreModel).filter_by(id=id).first()
+        return self.session.get(GenreModel, id)
+
+    def get_by_name(self, name: str) -> Optional[GenreModel]:
+        stmt = select(GenreModel).where(GenreModel.name == name).limit(1)
+        return self.session.scalars(stmt).first()
+
+    def get_or_create(self, name: str) -> GenreModel:
+        return _get_or_create(self.session, GenreModel, GenreModel.name, {"name": name})
 
     def list_all(self) -> List[GenreModel]:
-        return self.session.query(GenreModel).all()
+        return self.session.scalars(select(GenreModel)).all()
 
-    def paginated_list(self, page: int = 1, limit: int = 10) -> Tuple[List[GenreModel], int]:
-        query = self.session.query(GenreModel)
-        total = query.count()
-        items = query.offset((page - 1) * limit).limit(limit).all()
-        return items, total
+    def paginated_list(self, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> Tuple[List[GenreModel], int]:
+        stmt = _load_columns(select(GenreModel), GenreModel, fields, {
+            "name": GenreModel.name
+        })
+        return self._paginate(stmt, select(func.count()).select_from(GenreModel), page, limit)
 
     def list_by_ids(self, ids: List[str]) -> List[GenreModel]:
-        return self.session.query(GenreModel).filter(GenreModel.id.in_(ids)).all()
+        return self.session.scalars(select(GenreModel).where(GenreModel.id.in_(ids))).all()
 
+@traced
 class BookRepository(IRepository[BookMetadataModel]):
     def add(self, book: BookMetadataModel) -> BookMetadataModel:
         self.session.add(book)
         return book
 
     def get_by_id(self, id: str) -> Optional[BookMetadataModel]:
-        return self.session.query(BookMetadataModel).filter_by(id=id).first()
+        return self.session.get(BookMetadataModel, id)
 
     def get_by_isbn(self, isbn: str) -> Optional[BookMetadataModel]:
-        return self.session.query(BookMetadataModel).filter_by(isbn=isbn).first()
+        stmt = select(BookMetadataModel).where(BookMetadataModel.isbn == isbn).limit(1)
+        return self.session.scalars(stmt).first()
 
     def list_all(self) -> List[BookMetadataModel]:
-        return self.session.query(BookMetadataModel).all()
-
-    def paginated_list(self, page: int = 1, limit: int = 10) -> Tuple[List[BookMetadataModel], int]:
-        query = self.session.query(BookMetadataModel)
-        total = query.count()
-        items = query.offset((page - 1) * limit).limit(limit).all()
-        return items, total
+        return self.session.scalars(select(BookMetadataModel)).all()
+
+    def paginated_list(self, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> Tuple[List[BookMetadataModel], int]:
+        stmt = self._with_fields(select(BookMetadataModel), fields)
+        return self._paginate(stmt, select(func.count()).select_from(BookMetadataModel), page, limit)
+
+    def list_by_ids(self, ids: List[str], fields: Optional[Set[str]] = None) -> List[BookMetadataModel]:
+        stmt = self._with_fields(select(BookMetadataModel), fields)
+        return self.session.scalars(stmt.where(BookMetadataModel.id.in_(ids))).all()
+
+    def _with_fields(self, stmt, fields: Optional[Set[str]]):
+        stmt = _load_columns(stmt, BookMetadataModel, fields, {
+            "title": BookMetadataModel.title, "isbn": BookMetadataModel.isbn
+        })
+        # Only join/load the relationships the caller will actually serialize
+        if fields is None or "author" in fields:
+            stmt = stmt.options(joinedload(BookMetadataModel.author))
+        if fields is None or "genres" in fields:
+            stmt = stmt.options(selectinload(BookMetadataModel.genres))
+        if fields is None or fields & {"total_copies", "available_copies"}:
+            stmt = stmt.options(selectinload(BookMetadataModel.copies))
+        return stmt
+
+    def stream_all(self, chunk_size: int) -> Iterator[BookMetadataModel]:
+        # yield_per enables a server-side cursor; relationships are loaded per chunk
+        stmt = select(BookMetadataModel).options(
+            joinedload(BookMetadataModel.author),
+            selectinload(BookMetadataModel.genres),
+            selectinload(BookMetadataModel.copies)
+        ).order_by(BookMetadataModel.id)
+        return self.session.scalars(stmt.execution_options(yield_per=chunk_size))
 
     def add_copy(self, copy: BookCopyModel) -> BookCopyModel:
         self.session.add(copy)
         return copy
 
+    def add_copies(self, book_id: str, count: int) -> List[str]:
+        """
+        Inserts `count` available copies of a book with one Core executemany,
+        bypassing the unit of work. Ids are generated here, so nothing has to
+        come back from the database and the driver's executemany (pipelined
+        on psycopg) handles the batching. One cached statement is reused;
+        literal multi-row VALUES would be recompiled per call and was slower.
+        """
+        ids = [str(uuid.uuid4()) for _ in range(count)]
+        self.session.execute(insert(BookCopyModel), [
+            {"id": id, "book_metadata_id": book_id, "is_available": True, "status": "Available"} for id in ids
+        ])
+        return ids
+
     def get_copy_by_id(self, copy_id: str) -> Optional[BookCopyModel]:
-        return self.session.query(BookCopyModel).filter_by(id=copy_id).first()
+        return self.session.get(BookCopyModel, copy_id)
 
-    def get_available_copy(self, book_id: str) -> Optional[BookCopyModel]:
-        return self.session.query(BookCopyModel).filter_by(
-            book_metadata_id=book_id, is_available=True
-        ).first()
-
-    def paginated_list_copies(self, book_id: str, page: int = 1, limit: int = 10) -> Tuple[List[BookCopyModel], int]:
-        query = self.session.query(BookCopyModel).filter_by(book_metadata_id=book_id)
-        total = query.count()
-        items = query.offset((page - 1) * limit).limit(limit).all()
-        return items, total
+    def list_copies_by_ids(self, copy_ids: List[str]) -> List[BookCopyModel]:
+        # The parent metadata row rides along (many-to-one join) since callers need the title
+        stmt = select(BookCopyModel).options(
+            joinedload(BookCopyModel.metadata_rec)
+        ).where(BookCopyModel.id.in_(copy_ids))
+        return self.session.scalars(stmt).all()
 
+    def get_available_copy(self, book_id: str) -> Optional[BookCopyModel]:
+        stmt = select(BookCopyModel).where(
+            BookCopyModel.book_metadata_id == book_id, BookCopyModel.is_available == True
+        ).limit(1)
+        return self.session.scalars(stmt).first()
+
+    def list_copy_states(self, copy_ids: List[str]) -> List:
+        """(id, book_metadata_id, is_available) rows, without loading the copies into the session."""
+        stmt = select(BookCopyModel.id, BookCopyModel.book_metadata_id, BookCopyModel.is_available)
+        return self.session.execute(stmt.where(BookCopyModel.id.in_(copy_ids))).all()
+
+    def pick_available_copies(self, wanted: Dict[str, int], exclude: Iterable[str] = ()) -> Dict[str, List[str]]:
+        """
+        Up to wanted[book_id] available copy ids per book, in one windowed
+        SELECT, leaving out the `exclude` ids (copies the caller already holds
+        or has been asked for by id). Copies are ranked randomly so concurrent
+        checkouts of the same title tend to pick different rows; nothing is
+        locked here, the caller claims the picks with claim_copies().
+        """
+        conditions = [BookCopyModel.book_metadata_id.in_(wanted), BookCopyModel.is_available == True]
+        exclude = list(exclude)
+        if exclude:
+            conditions.append(BookCopyModel.id.not_in(exclude))
+        ranked = select(
+            BookCopyModel.id, BookCopyModel.book_metadata_id,
+            func.row_number().over(partition_by=BookCopyModel.book_metadata_id, order_by=func.random()).label("rank")
+        ).where(*conditions).subquery()
+        rows = self.session.execute(
+            select(ranked.c.id, ranked.c.book_metadata_id).where(ranked.c.rank <= max(wanted.values()))
+        )
+        picked: Dict[str, List[str]] = {}
+        for copy_id, book_id in rows:
+            if len(picked.setdefault(book_id, [])) < wanted[book_id]:
+                picked[book_id].append(copy_id)
+        return picked
+
+    def claim_copies(self, copy_ids: List[str]) -> Set[str]:
+        """
+        Marks the copies borrowed in one UPDATE and returns the ids it changed.
+        Rows are locked through FOR UPDATE SKIP LOCKED and is_available is
+        checked under the lock: a copy another checkout holds or already took
+        is left out (the caller picks again) instead of being waited on, so
+        concurrent baskets with overlapping copies cannot deadlock.
+        """
+        lockable = select(BookCopyModel.id).where(
+            BookCopyModel.id.in_(copy_ids), BookCopyModel.is_available == True
+        ).order_by(BookCopyModel.id).with_for_update(skip_locked=True)
+        stmt = update(BookCopyModel).where(BookCopyModel.id.in_(lockable.scalar_subquery())).values(
+            is_available=False, status="Borrowed"
+        ).returning(BookCopyModel.id)
+        return set(self.session.scalars(stmt))
+
+    def release_copies(self, copy_ids: List[str]) -> None:
+        stmt = update(BookCopyModel).where(BookCopyModel.id.in_(copy_ids)).values(is_available=True, status="Available")
+        self.session.execute(stmt)
+
+    def titles_by_copy_ids(self, copy_ids: List[str]) -> Dict[str, str]:
+        stmt = select(BookCopyModel.id, BookMetadataModel.title).join(BookCopyModel.metadata_rec)
+        return dict(self.session.execute(stmt.where(BookCopyModel.id.in_(copy_ids))).all())
+
+    def paginated_list_copies(self, book_id: str, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> Tuple[List[BookCopyModel], int]:
+        stmt = _load_columns(select(BookCopyModel), BookCopyModel, fields, {
+            "book_id": BookCopyModel.book_metadata_id,
+            "is_available": BookCopyModel.is_available,
+            "status": BookCopyModel.status
+        }).where(BookCopyModel.book_metadata_id == book_id)
+        count_stmt = select(func.count()).select_from(BookCopyModel).where(BookCopyModel.book_metadata_id == book_id)
+        return self._paginate(stmt, count_stmt, page, limit)
+
+@traced
 class MemberRepository(IRepository[MemberModel]):
     def add(self, member: MemberModel) -> MemberModel:
         self.session.add(member)
         return member
 
     def get_by_id(self, id: str) -> Optional[MemberModel]:
-        return self.session.query(MemberModel).filter_by(id=id).first()
+        return self.session.get(MemberModel, id)
 
     def get_by_email(self, email: str) -> Optional[MemberModel]:
-        return self.session.query(MemberModel).filter_by(email=email).first()
+        stmt = select(MemberModel).where(MemberModel.email == email).limit(1)
+        return self.session.scalars(stmt).first()
+
+    def get_or_create(self, name: str, email: str) -> MemberModel:
+        return _get_or_create(self.session, MemberModel, MemberModel.email, {"name": name, "email": email})
 
     def list_all(self) -> List[MemberModel]:
-        return self.session.query(MemberModel).all()
+        return self.session.scalars(select(MemberModel)).all()
 
-    def paginated_list(self, page: int = 1, limit: int = 10) -> Tuple[List[MemberModel], int]:
-        query = self.session.query(MemberModel)
-        total = query.count()
-        items = query.offset((page - 1) * limit).limit(limit).all()
-        return items, total
+    def paginated_list(self, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> Tuple[List[MemberModel], int]:
+        stmt = _load_columns(select(MemberModel), MemberModel, fields, {
+            "name": MemberModel.name, "email": MemberModel.email
+        })
+        return self._paginate(stmt, select(func.count()).select_from(MemberModel), page, limit)
+
+    def list_by_ids(self, ids: List[str]) -> List[MemberModel]:
+        return self.session.scalars(select(MemberModel).where(MemberModel.id.in_(ids))).all()
+
+    def stream_all(self, chunk_size: int) -> Iterator[MemberModel]:
+        stmt = select(MemberModel).order_by(MemberModel.id)
+        return self.session.scalars(stmt.execution_options(yield_per=chunk_size))
 
+@traced
 class LoanRepository(IRepository[LoanModel]):
     def add(self, loan: LoanModel) -> LoanModel:
         self.session.add(loan)
         return loan
 
     def get_by_id(self, id: str) -> Optional[LoanModel]:
-        return self.session.query(LoanModel).filter_by(id=id).first()
+        return self.session.get(LoanModel, id)
+
+    def add_all(self, loans: List[LoanModel]) -> List[LoanModel]:
+        self.session.add_all(loans)
+        return loans
+
+    def lock_existing(self, ids: List[str]) -> Set[str]:
+        """Ids of the loans that exist, row-locked until commit (FOR UPDATE is a no-op on SQLite)."""
+        stmt = select(LoanModel.id).where(LoanModel.id.in_(ids)).order_by(LoanModel.id).with_for_update()
+        return set(self.session.scalars(stmt))
+
+    def delete_many(self, ids: List[str]) -> List:
+        """
+        Deletes the loans in one statement and returns the deleted rows
+        (id, copy_id, member_id, borrowed_at). Ids another transaction deleted
+        first are simply absent from the result. Rows are locked in id order
+        so overlapping batches wait on each other rather than deadlock.
+        """
+        locked = select(LoanModel.id).where(LoanModel.id.in_(ids)).order_by(LoanModel.id).with_for_update()
+        stmt = delete(LoanModel).where(LoanModel.id.in_(locked.scalar_subquery())).returning(
+            LoanModel.id, LoanModel.copy_id, LoanModel.member_id, LoanModel.borrowed_at
+        )
+        return self.session.execute(stmt).all()
 
     def list_all(self) -> List[LoanModel]:
-        return self.session.query(LoanModel).all()
+        return self.session.scalars(select(LoanModel)).all()
 
     def list_by_member(self, member_id: str) -> List[LoanModel]:
-        return self.session.query(LoanModel).filter_by(member_id=member_id).all()
-
-    def paginated_list_by_member(self, member_id: Optional[str], page: int = 1, limit: int = 10) -> Tuple[List[LoanModel], int]:
-        query = self.session.query(LoanModel)
+        return self.session.scalars(select(LoanModel).where(LoanModel.member_id == member_id)).all()
+
+    def paginated_list_by_member(self, member_id: Optional[str], page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> Tuple[List[LoanModel], int]:
+        if fields is not None:
+            # Related rows are resolved by the request DataLoaders, which need the foreign keys
+            if "book_title" in fields:
+                fields = fields | {"copy_id"}
+            if fields & {"member_name", "member_email"}:
+                fields = fields | {"member_id"}
+        stmt = _load_columns(select(LoanModel), LoanModel, fields, {
+            "copy_id": LoanModel.copy_id,
+            "member_id": LoanModel.member_id,
+            "borrowed_at": LoanModel.borrowed_at,
+            "returned_at": LoanModel.returned_at
+        })
+        count_stmt = select(func.count()).select_from(LoanModel)
         if member_id:
-            query = query.filter_by(member_id=member_id)
-        
+            stmt = stmt.where(LoanModel.member_id == member_id)
+            count_stmt = count_stmt.where(LoanModel.member_id == member_id)
+
         # Order by borrowed_at desc
-        query = query.order_by(LoanModel.borrowed_at.desc())
-        
-        total = query.count()
-        items = query.offset((page - 1) * limit).limit(limit).all()
-        return items, total
+        stmt = stmt.order_by(LoanModel.borrowed_at.desc())
+        return self._paginate(stmt, count_stmt, page, limit)
+
+    def stream_by_member(self, member_id: Optional[str], chunk_size: int) -> Iterator[LoanModel]:
+        stmt = select(LoanModel).options(
+            joinedload(LoanModel.copy).joinedload(BookCopyModel.metadata_rec),
+            joinedload(LoanModel.member)
+        )
+        if member_id:
+            stmt = stmt.where(LoanModel.member_id == member_id)
+        stmt = stmt.order_by(LoanModel.borrowed_at.desc())
+        return self.session.scalars(stmt.execution_options(yield_per=chunk_size))
+
+@traced
+class StatsRepository:
+    """Circulation counters and the library-wide stats snapshot."""
+    def __init__(self, session: Session):
+        self.session = session
+
+    def record_loans(self, day: date, loans_by_book: Dict[str, int]) -> None:
+        """
+        Adds to the day's per-book loan counters with one upsert. Rows go in
+        book id order, so concurrent borrows touching the same books lock
+        their counters in the same order.
+        """
+        rows = [{"day": day, "book_id": book_id, "loans": loans_by_book[book_id]} for book_id in sorted(loans_by_book)]
+        stmt = _dialect_insert(self.session)(CirculationDailyModel).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CirculationDailyModel.day, CirculationDailyModel.book_id],
+            set_={"loans": CirculationDailyModel.loans + stmt.excluded.loans}
+        )
+        self.session.execute(stmt)
+
+    def compute(self, since: date, top: int) -> dict:
+        """
+        Aggregates the snapshot with three statements whatever the data
+        size: one row of scalar-subquery totals, the top titles and the loans
+        per day since `since`.
+        """
+        count = lambda model, *where: select(func.count()).select_from(model).where(*where).scalar_subquery()
+        totals = self.session.execute(select(
+            count(BookMetadataModel).label("total_books"),
+            count(BookCopyModel).label("total_copies"),
+            count(BookCopyModel, BookCopyModel.is_available == True).label("available_copies"),
+            count(LoanModel).label("active_loans"),
+            count(MemberModel).label("total_members"),
+            count(AuthorModel).label("total_authors"),
+            count(GenreModel).label("total_genres"),
+        )).one()._asdict()
+
+        loans = func.sum(CirculationDailyModel.loans).label("loans")
+        top_titles = self.session.execute(
+            select(BookMetadataModel.id, BookMetadataModel.title, loans)
+            .join(CirculationDailyModel, CirculationDailyModel.book_id == BookMetadataModel.id)
+            .where(CirculationDailyModel.day >= since)
+            .group_by(BookMetadataModel.id, BookMetadataModel.title)
+            .order_by(loans.desc(), BookMetadataModel.title).limit(top)
+        ).all()
+        per_day = self.session.execute(
+            select(CirculationDailyModel.day, loans).where(CirculationDailyModel.day >= since)
+            .group_by(CirculationDailyModel.day).order_by(CirculationDailyModel.day)
+        ).all()
+        return {
+            **totals,
+            "top_titles": [{"book_id": id, "title": title, "loans": int(n)} for id, title, n in top_titles],
+            "loans_per_day": [{"day": day.isoformat(), "loans": int(n)} for day, n in per_day],
+        }
+
+    def save_snapshot(self, values: dict, refreshed_at: float) -> None:
+        stmt = _dialect_insert(self.session)(LibraryStatsModel).values(id=1, refreshed_at=refreshed_at, **values)
+        stmt = stmt.on_conflict_do_update(index_elements=[LibraryStatsModel.id], set_={
+            name: stmt.excluded[name] for name in ("refreshed_at", *values)
+        })
+        self.session.execute(stmt)
+
+    def get_snapshot(self) -> Optional[LibraryStatsModel]:
+        return self.session.get(LibraryStatsModel, 1, populate_existing=True)
+
+@traced
+class ViewRepository:
+    """Reads and rebuilds the managed materialized views (models/views.py)."""
+    def __init__(self, session: Session):
+        self.session = session
+
+    def paginated_list(self, name: str, page: int = 1, limit: int = 10) -> Tuple[List, int]:
+        view = MANAGED_VIEWS[name].table
+        total = self.session.scalar(select(func.count()).select_from(view))
+        stmt = select(view).order_by(view.c.name, view.c.id).offset((page - 1) * limit).limit(limit)
+        return self.session.execute(stmt).all(), total
+
+    def refreshed_at(self, name: str) -> Optional[float]:
+        row = self.session.get(ViewRefreshModel, name, populate_existing=True)
+        return row.refreshed_at if row else None
+
+    def refresh_times(self) -> Dict[str, float]:
+        return dict(self.session.execute(select(ViewRefreshModel.name, ViewRefreshModel.refreshed_at)).all())
+
+    def refresh(self, names: List[str], refreshed_at: float) -> None:
+        """
+        Rebuilds the views and records the refresh time in the same
+        transaction. On Postgres the rebuild is REFRESH ... CONCURRENTLY, so
+        readers keep seeing the previous contents until commit.
+        """
+        connection = self.session.connection()
+        for name in names:
+            MANAGED_VIEWS[name].refresh(connection)
+        stmt = _dialect_insert(self.session)(ViewRefreshModel).values(
+            [{"name": name, "refreshed_at": refreshed_at} for name in names]
+        )
+        self.session.execute(stmt.on_conflict_do_update(
+            index_elements=[ViewRefreshModel.name], set_={"refreshed_at": stmt.excluded.refreshed_at}
+        ))
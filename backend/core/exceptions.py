@@ -24,5 +24,21 @@ class DatabaseError(AppError):
     def __init__(self, message: str = "Database operation failed"):
         super().__init__(message, "INTERNAL", grpc.StatusCode.INTERNAL)
 
+class OverloadedError(AppError):
+    def __init__(self, message: str = "Server is overloaded, retry later"):
+        super().__init__(message, "RESOURCE_EXHAUSTED", grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+class RateLimitedError(AppError):
+    def __init__(self, message: str = "Too many requests, retry later"):
+        super().__init__(message, "RATE_LIMITED", grpc.StatusCode.RESOURCE_EXHAUSTED)
+
+class DeadlineExceededError(AppError):
+    def __init__(self, message: str = "Request deadline exceeded"):
+        super().__init__(message, "DEADLINE_EXCEEDED", grpc.StatusCode.DEADLINE_EXCEEDED)
+
+class AbortedError(AppError):
+    def __init__(self, message: str = "Operation aborted"):
+        super().__init__(message, "ABORTED", grpc.StatusCode.ABORTED)
+
 # Backward compatibility aliases if needed, but better to migrate
 LibraryError = AppError
@@ -0,0 +1,79 @@
+"""
+gRPC server/channel options and response compression, built from Config.
+
+- server_options():  message size limits, keepalive and connection-age
+                     settings, HTTP/2 flow control (BDP probing, stream window)
+- channel_options(): the matching client side (seed_data.py, client.py,
+                     benchmarks), so client keepalive pings stay within what
+                     the server permits
+- compression_policy(): which responses the interceptor compresses.
+                     Compression is set per call: a unary response is
+                     compressed only when its serialized size reaches
+                     GRPC_COMPRESSION_MIN_BYTES, and streams of the selected
+                     methods are compressed throughout. Clients advertise
+                     gzip/deflate support automatically.
+"""
+from typing import Iterable, List, Optional, Tuple
+import grpc
+from backend.core.config import Config
+
+ALGORITHMS = {"gzip": grpc.Compression.Gzip, "deflate": grpc.Compression.Deflate}
+
+class CompressionPolicy:
+    def __init__(self, algorithm: grpc.Compression, min_bytes: int = 0, methods: Iterable[str] = ()):
+        self.algorithm = algorithm
+        self.min_bytes = min_bytes
+        self.methods = frozenset(methods)
+
+    def applies_to(self, method_name: str) -> bool:
+        """Whether responses of `method_name` (e.g. "ListBooks") are considered for compression."""
+        return not self.methods or method_name in self.methods
+
+    def compress_response(self, context, response) -> None:
+        """Compresses this call's response if it is at least `min_bytes` serialized."""
+        if not self.min_bytes or response.ByteSize() >= self.min_bytes:
+            context.set_compression(self.algorithm)
+
+def compression_policy() -> Optional[CompressionPolicy]:
+    config = Config.get_grpc_config()
+    if config["compression"] == "none":
+        return None
+    return CompressionPolicy(ALGORITHMS[config["compression"]], config["compression_min_bytes"],
+                             config["compression_methods"])
+
+def _common_options(config: dict) -> List[Tuple[str, int]]:
+    options = [
+        ("grpc.max_receive_message_length", config["max_message_bytes"]),
+        ("grpc.max_send_message_length", config["max_message_bytes"]),
+        ("grpc.keepalive_time_ms", config["keepalive_time_ms"]),
+        ("grpc.keepalive_timeout_ms", config["keepalive_timeout_ms"]),
+        ("grpc.keepalive_permit_without_calls", int(config["keepalive_permit_without_calls"])),
+        ("grpc.http2.bdp_probe", int(config["http2_bdp_probe"])),
+    ]
+    if config["http2_stream_window_bytes"]:
+        # Initial per-stream flow-control window; BDP probing grows it from there
+        options.append(("grpc.http2.lookahead_bytes", config["http2_stream_window_bytes"]))
+    return options
+
+def server_options() -> List[Tuple[str, int]]:
+    config = Config.get_grpc_config()
+    options = _common_options(config) + [
+        # Accept client pings as often as clients are configured to send them
+        ("grpc.http2.min_ping_interval_without_data_ms", config["keepalive_time_ms"]),
+        ("grpc.http2.max_ping_strikes", 2),
+    ]
+    for name, key in (("grpc.max_connection_idle_ms", "max_connection_idle_ms"),
+                      ("grpc.max_connection_age_ms", "max_connection_age_ms"),
+                      ("grpc.max_connection_age_grace_ms", "max_connection_age_grace_ms")):
+        if config[key]:
+            options.append((name, config[key]))
+    return options
+
+def channel_options() -> List[Tuple[str, int]]:
+    return _common_options(Config.get_grpc_config()) + [
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+
+def create_channel(target: str, extra_options: Iterable[Tuple[str, int]] = ()) -> grpc.Channel:
+    """Insecure channel to the backend with the client options above."""
+    return grpc.insecure_channel(target, options=channel_options() + list(extra_options))
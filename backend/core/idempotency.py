@@ -0,0 +1,103 @@
+"""
+Idempotency keys for RPCs with side effects (BorrowBook, ReturnBook and
+their batch variants).
+
+A client that may retry sends the same `x-idempotency-key` metadata on every
+attempt. The first attempt claims the key with one upsert inside the RPC's
+own transaction and stores the serialized response before commit, so the
+key and the loan change are committed (or rolled back) together:
+
+- a retry after success gets the stored response without re-executing
+- a retry after a failure runs again (the failed attempt left no key behind)
+- the same key with a different request fails with ALREADY_EXISTS
+
+On Postgres a concurrent attempt with the same key blocks on the first
+attempt's row until it commits, then replays its response. Keys expire
+after IDEMPOTENCY_TTL_SECONDS: an expired key can be claimed again, and each
+process deletes expired rows at most once per IDEMPOTENCY_PURGE_INTERVAL_SECONDS.
+"""
+import hashlib
+import threading
+import time
+from typing import Callable, Type, TypeVar
+from sqlalchemy import text
+from backend.core.config import Config
+from backend.core.context import metadata_value
+from backend.core.exceptions import ConflictError
+from backend.core.logger import logger
+from backend.core.messages import ErrorMessages
+from backend.core import metrics
+
+IDEMPOTENCY_KEY_HEADER = "x-idempotency-key"
+
+IDEMPOTENT_REPLAYS = metrics.REGISTRY.register(metrics.Counter(
+    "grpc_server_idempotent_replays_total", "RPCs answered with the stored response of an idempotency key.", ("method",)))
+
+# Claims a new key, or takes over an expired one; returns no row while the key is live
+_CLAIM = text("""
+    INSERT INTO idempotency_keys (key, fingerprint, response, created_at)
+    VALUES (:key, :fingerprint, NULL, :now)
+    ON CONFLICT (key) DO UPDATE SET
+        fingerprint = excluded.fingerprint, response = NULL, created_at = excluded.created_at
+    WHERE idempotency_keys.created_at < :expired_before
+    RETURNING key
+""")
+_LOOKUP = text("SELECT fingerprint, response FROM idempotency_keys WHERE key = :key")
+_STORE = text("UPDATE idempotency_keys SET response = :response WHERE key = :key")
+_PURGE = text("DELETE FROM idempotency_keys WHERE created_at < :expired_before")
+
+M = TypeVar("M")
+
+def _fingerprint(request) -> bytes:
+    return hashlib.sha256(request.SerializeToString(deterministic=True)).digest()[:16]
+
+class IdempotencyKeys:
+    def __init__(self, ttl_seconds: float, purge_interval_seconds: float):
+        self.ttl = ttl_seconds
+        self.purge_interval = purge_interval_seconds
+        self._next_purge = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "IdempotencyKeys":
+        config = Config.get_idempotency_config()
+        return cls(config["ttl_seconds"], config["purge_interval_seconds"])
+
+    def run(self, session, context, method: str, request, response_type: Type[M], handler: Callable[[], M]) -> M:
+        """
+        Runs `handler` once per idempotency key and returns its response, or
+        the stored response of an earlier attempt. Calls without the metadata
+        run `handler` directly.
+        """
+        # In-process callers (scripts, tests) may call the servicer without a context
+        client_key = context and metadata_value(context.invocation_metadata(), IDEMPOTENCY_KEY_HEADER)
+        if not client_key:
+            return handler()
+
+        key = f"{method}:{client_key}"
+        fingerprint = _fingerprint(request)
+        now = time.time()
+        self._maybe_purge(session, now)
+        claimed = session.execute(_CLAIM, {"key": key, "fingerprint": fingerprint, "now": now,
+                                           "expired_before": now - self.ttl}).first()
+        if claimed is None:
+            row = session.execute(_LOOKUP, {"key": key}).first()
+            if row is not None and bytes(row.fingerprint) != fingerprint:
+                raise ConflictError(ErrorMessages.IDEMPOTENCY_KEY_REUSED)
+            if row is None or row.response is None:
+                raise ConflictError(ErrorMessages.IDEMPOTENCY_KEY_IN_PROGRESS)
+            IDEMPOTENT_REPLAYS.inc(method)
+            return response_type.FromString(bytes(row.response))
+
+        response = handler()
+        session.execute(_STORE, {"key": key, "response": response.SerializeToString()})
+        return response
+
+    def _maybe_purge(self, session, now: float) -> None:
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+        deleted = session.execute(_PURGE, {"expired_before": now - self.ttl}).rowcount
+        if deleted:
+            logger.info("Purged %d expired idempotency keys", deleted)
@@ -1,8 +1,15 @@
+import atexit
 import logging
+import logging.handlers
 import json
+import queue
 import sys
 from backend.core.context import request_id_ctx_var
-from datetime import datetime
+from backend.core.config import Config
+from datetime import datetime, timezone
+
+# Format: [uuid] [backend] [time] [className.methodName] [logLevel] logging statement
+TEXT_FORMAT = '[%(request_id)s] [library_backend] [%(asctime)s] [%(levelname)s] [%(module)s.%(funcName)s] %(message)s'
 
 class ContextFilter(logging.Filter):
     """
@@ -12,21 +19,111 @@ class ContextFilter(logging.Filter):
         record.request_id = request_id_ctx_var.get() or "SYSTEM"
         return True
 
+class JsonFormatter(logging.Formatter):
+    """Compact one-object-per-line JSON, with the same fields as the text format."""
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "request_id": getattr(record, "request_id", "SYSTEM"),
+            "service": "library_backend",
+            "where": f"{record.module}.{record.funcName}",
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue. When the queue is full, records are
+    dropped and counted ("drop") or the caller waits for room ("block").
+    Once there is room again, a warning with the number of records dropped
+    since the last one is queued ahead of the next record.
+
+    Records are queued unformatted: `%` interpolation and formatting happen on
+    the listener thread, so request threads only pay for creating the record.
+    """
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop"):
+        super().__init__(log_queue)
+        self.block = policy == "block"
+        self.dropped = 0
+        self.reported = 0
+
+    def prepare(self, record):
+        # Tracebacks reference live frames, so render them before handing off
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            if self.dropped > self.reported:
+                self._report_drops(record.name)
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _report_drops(self, name: str):
+        count = self.dropped - self.reported
+        warning = logging.LogRecord(name, logging.WARNING, __file__, 0, "Dropped %d log records: log queue full",
+                                    (count,), None, func="enqueue")
+        warning.request_id = "SYSTEM"
+        self.queue.put_nowait(warning)
+        self.reported += count
+
+def _build_formatter(fmt: str) -> logging.Formatter:
+    if fmt == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+def configure_logging(logger: logging.Logger, fmt: str = "text", use_queue: bool = True,
+                      queue_size: int = 10000, policy: str = "drop", stream=None) -> logging.Logger:
+    """
+    (Re)configures `logger` to write to `stream` (stdout by default).
+
+    With `use_queue`, request threads only enqueue records and a single
+    QueueListener thread formats and writes them.
+    """
+    stop_logging(logger)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+    sink = logging.StreamHandler(stream or sys.stdout)
+    sink.setFormatter(_build_formatter(fmt))
+    if use_queue:
+        handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size), policy)
+        handler.listener = logging.handlers.QueueListener(handler.queue, sink, respect_handler_level=True)
+        handler.listener.start()
+        logger.addHandler(handler)
+    else:
+        logger.addHandler(sink)
+    return logger
+
+def stop_logging(logger: logging.Logger = None):
+    """Flushes queued records and stops the listener thread of `logger` (default: the backend logger)."""
+    logger = logger or logging.getLogger("library_backend")
+    for handler in logger.handlers:
+        if getattr(handler, "listener", None) is not None:
+            handler.listener.stop()
+            handler.listener = None
+
 def setup_logger(name: str):
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
+    logger.setLevel(Config.get_log_level())
+
     # Check if handlers already exist to avoid adding duplicates
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        # Format: [uuid] [backend] [time] [className.methodName] [logLevel] logging statement
-        formatter = logging.Formatter(
-            '[%(request_id)s] [library_backend] [%(asctime)s] [%(levelname)s] [%(module)s.%(funcName)s] %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        
+        configure_logging(logger, **Config.get_logging_config())
+
     logger.addFilter(ContextFilter())
     return logger
 
 logger = setup_logger("library_backend")
+atexit.register(stop_logging, logger)
@@ -19,10 +19,24 @@ class ErrorMessages:
     BOOK_TITLE_REQUIRED = "Book title is required"
     BOOK_TITLE_TOO_LONG = "Book title must not exceed {max} characters"
     BOOK_COPIES_NEGATIVE = "Initial copies cannot be negative"
+    BOOK_COPIES_COUNT_INVALID = "Copy count must be between 1 and {max}"
     BOOK_ISBN_REQUIRED = "ISBN is required"
     BOOK_ISBN_INVALID = "Invalid ISBN length (must be 10 or 13 digits)"
     BOOK_ISBN_EXISTS = "Book with this ISBN already exists"
     BOOK_NOT_FOUND = "Book not found"
+    COPY_NOT_AVAILABLE = "Requested copy is not available"
+    BOOK_NO_COPIES_AVAILABLE = "No available copies for this book"
+
+    # Loan
+    LOAN_NOT_FOUND = "Loan record not found"
+    BATCH_LOAN_SIZE_INVALID = "Batches must contain between 1 and {max} items"
+    BATCH_ITEM_DUPLICATE = "Item appears more than once in the batch"
+    BATCH_ITEM_ABORTED = "Not processed: another item of the all-or-nothing batch failed"
     
     # General
     DB_ERROR = "Database operation failed"
+    STREAM_CHUNK_SIZE_INVALID = "Stream chunk size must be positive"
+    BATCH_TOO_LARGE = "Batch requests are limited to {max} ids"
+    FIELD_MASK_INVALID = "Unknown field(s) in field mask: {fields}"
+    IDEMPOTENCY_KEY_REUSED = "Idempotency key was already used for a different request"
+    IDEMPOTENCY_KEY_IN_PROGRESS = "A request with this idempotency key is still in progress"
@@ -0,0 +1,219 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Metrics are plain objects in a module-level registry. Updates are a dict
+lookup plus a short lock per metric, so they are cheap enough for the RPC
+and SQL hot paths. Values are rendered on demand by the /metrics endpoint
+that `start_metrics_server` serves from a daemon thread on a side port.
+"""
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+SQL_BUCKETS = (.0001, .00025, .0005, .001, .0025, .005, .01, .025, .05, .1, .25, 1)
+COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield self.name + _labels(self.labelnames, labels), value
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels) -> int:
+        series = self._values.get(labels)
+        return sum(series[:-1]) if series else 0
+
+    def sum(self, *labels) -> float:
+        series = self._values.get(labels)
+        return series[-1] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._values.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += hits
+                yield self.name + "_bucket" + _labels(self.labelnames, labels, f'le="{_number(float(bound))}"'), cumulative
+            yield self.name + "_sum" + _labels(self.labelnames, labels), series[-1]
+            yield self.name + "_count" + _labels(self.labelnames, labels), cumulative
+
+class Gauge:
+    """Gauge read from a callback at scrape time (nothing to update on the hot path)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, callback: Callable[[], Optional[float]]):
+        self.name, self.help, self.labelnames = name, help, ()
+        self.callback = callback
+
+    def samples(self):
+        try:
+            value = self.callback()
+        except Exception:
+            return
+        if value is not None:
+            yield self.name, value
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            # Re-registering a name replaces it (e.g. a recreated engine's pool gauges)
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+
+RPC_LATENCY = REGISTRY.register(Histogram(
+    "grpc_server_handling_seconds", "RPC handling time in seconds.", ("method",)))
+RPC_HANDLED = REGISTRY.register(Counter(
+    "grpc_server_handled_total", "RPCs completed, by gRPC status code.", ("method", "grpc_code")))
+APP_ERRORS = REGISTRY.register(Counter(
+    "library_app_errors_total", "Domain errors raised, by AppError code.", ("method", "error_code")))
+SQL_STATEMENTS = REGISTRY.register(Counter(
+    "db_statements_total", "SQL statements executed."))
+SQL_DURATION = REGISTRY.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time in seconds.", buckets=SQL_BUCKETS))
+REQUEST_STATEMENTS = REGISTRY.register(Histogram(
+    "db_statements_per_request", "SQL statements executed per RPC.", ("method",), buckets=COUNT_BUCKETS))
+REQUEST_SQL_TIME = REGISTRY.register(Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL per RPC in seconds.", ("method",)))
+POOL_WAIT = REGISTRY.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection in seconds.", buckets=SQL_BUCKETS))
+
+class RequestStats:
+    __slots__ = ("statements", "sql_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.sql_seconds = 0.0
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def start_request():
+    """Starts per-RPC SQL accounting. Returns a token for `finish_request`."""
+    return _request_stats.set(RequestStats())
+
+def record_statement(duration: float) -> None:
+    SQL_STATEMENTS.inc()
+    SQL_DURATION.observe(duration)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += duration
+
+def finish_request(token, method: str, grpc_code: str, duration: float) -> None:
+    stats = _request_stats.get()
+    RPC_LATENCY.observe(duration, method)
+    RPC_HANDLED.inc(method, grpc_code)
+    if stats is not None:
+        REQUEST_STATEMENTS.observe(stats.statements, method)
+        REQUEST_SQL_TIME.observe(stats.sql_seconds, method)
+    try:
+        _request_stats.reset(token)
+    except ValueError:
+        # Streaming handlers may finish in a different context than they started
+        _request_stats.set(None)
+
+def register_pool_gauges(pool) -> None:
+    """Exposes checked-out/overflow/size gauges for a SQLAlchemy QueuePool."""
+    for name, help, attr in (
+        ("db_pool_checked_out", "Connections currently checked out of the pool.", "checkedout"),
+        ("db_pool_checked_in", "Idle connections in the pool.", "checkedin"),
+        ("db_pool_overflow", "Connections open beyond pool_size (negative while below it).", "overflow"),
+        ("db_pool_size", "Configured pool size.", "size"),
+    ):
+        method = getattr(pool, attr, None)
+        if method is not None:
+            REGISTRY.register(Gauge(name, help, method))
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are not worth a log line each
+        pass
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serves GET /metrics from a daemon thread. Returns the HTTP server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
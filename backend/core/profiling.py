@@ -0,0 +1,111 @@
+"""
+On-demand profiling of individual RPCs.
+
+When PROFILE_ENABLED is set, a request carrying `x-profile: 1` plus an
+`x-profile-token` matching PROFILE_TOKEN, or picked by PROFILE_SAMPLE_RATE,
+runs under a profiler. Profiling cannot be enabled without a PROFILE_TOKEN. The output is written to
+PROFILE_DIR, keyed by request id:
+
+- cprofile: `<request_id>.pstats` (open with `python -m pstats` or snakeviz)
+- sample:   `<request_id>.collapsed`, folded stacks for flamegraph.pl/speedscope,
+            from a sampling thread (much lower overhead than cProfile)
+
+With PROFILE_ENABLED off the interceptor never calls into this module.
+"""
+import cProfile
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from backend.core.config import Config
+from backend.core.logger import logger
+
+def should_profile(metadata: dict) -> bool:
+    config = Config.get_profiling_config()
+    if metadata.get("x-profile") == "1":
+        token = config["token"]
+        if token and hmac.compare_digest(metadata.get("x-profile-token", ""), token):
+            return True
+        logger.warning("Ignoring x-profile request without a valid x-profile-token")
+    rate = config["sample_rate"]
+    return rate > 0 and random.random() < rate
+
+class StackSampler:
+    """Samples one thread's Python stack every `interval` seconds into folded-stack counts."""
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+def _output_path(request_id: str, extension: str) -> str:
+    directory = Config.get_profiling_config()["dir"]
+    os.makedirs(directory, exist_ok=True)
+    # Request ids come from client metadata; keep them filename-safe
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", request_id)[:128]
+    return os.path.join(directory, f"{safe_id}.{extension}")
+
+@contextmanager
+def profile_request(request_id: str, method: str):
+    """Profiles the enclosed block on the current thread and writes the result to PROFILE_DIR."""
+    mode = Config.get_profiling_config()["mode"]
+    start = time.perf_counter()
+    if mode == "sample":
+        profiler = StackSampler(threading.get_ident(), Config.get_profiling_config()["interval_ms"] / 1000)
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active cProfile per process; run this request unprofiled
+            logger.warning("Skipping profile of %s: another profile is in progress", method)
+            yield
+            return
+    try:
+        yield
+    finally:
+        if mode == "sample":
+            profiler.stop()
+        else:
+            profiler.disable()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        try:
+            if mode == "sample":
+                path = _output_path(request_id, "collapsed")
+                with open(path, "w") as f:
+                    f.write(profiler.collapsed())
+            else:
+                path = _output_path(request_id, "pstats")
+                profiler.dump_stats(path)
+            logger.info("Profiled %s (%.1f ms): %s", method, elapsed_ms, path)
+        except OSError as e:
+            logger.error("Could not write profile for %s: %s", method, e)
@@ -0,0 +1,166 @@
+"""
+Token-bucket rate limiting for the gRPC interceptor.
+
+Every call takes a token from the caller's client bucket. The client is
+identified by the `x-client-id` metadata, or by peer address when that is
+missing. Loan RPCs (RATE_LIMIT_MEMBER_METHODS) also take one from the
+bucket of the request's `member_id`, so one member cannot drain copies from
+several kiosks. An empty bucket fails the call with RESOURCE_EXHAUSTED
+(`RateLimitedError`).
+
+Buckets live in a store:
+
+- MemoryBucketStore:   per process, sharded locks (single-process mode)
+- DatabaseBucketStore: one row per key in `rate_limit_buckets`, updated
+                       with a single atomic upsert, so all backend
+                       processes share the same limits. A row idle long
+                       enough to refill completely equals a missing one,
+                       so each process deletes those at most once per
+                       RATE_LIMIT_PURGE_INTERVAL_SECONDS.
+"""
+import threading
+import time
+from typing import Iterable, Optional
+from sqlalchemy import text
+from backend.core.config import Config
+from backend.core.context import metadata_value
+from backend.core.exceptions import RateLimitedError
+from backend.core.logger import logger
+from backend.core import metrics
+
+RATE_LIMITED = metrics.REGISTRY.register(metrics.Counter(
+    "grpc_server_rate_limited_total", "RPCs rejected by the rate limiter, by bucket kind.", ("method", "bucket")))
+
+class MemoryBucketStore:
+    """In-process buckets; keys are spread over `shards` locks so concurrent callers rarely contend."""
+    def __init__(self, shards: int = 64, max_keys_per_shard: int = 10000):
+        self._shards = [(threading.Lock(), {}) for _ in range(shards)]
+        self.max_keys_per_shard = max_keys_per_shard
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Takes `cost` tokens from `key`. Returns 0 if allowed, else seconds until enough tokens refill."""
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        with lock:
+            bucket = buckets.get(key)
+            tokens = burst if bucket is None else min(burst, bucket[0] + (now - bucket[1]) * rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            if not wait:
+                tokens -= cost
+            # (tokens, last refill, time the bucket is full again and can be forgotten)
+            buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+            if len(buckets) > self.max_keys_per_shard:
+                self._prune(buckets, now)
+        return wait
+
+    @staticmethod
+    def _prune(buckets: dict, now: float) -> None:
+        for key in [k for k, bucket in buckets.items() if bucket[2] <= now]:
+            del buckets[key]
+
+_TAKE = text("""
+    INSERT INTO rate_limit_buckets (key, tokens, updated_at)
+    VALUES (:key, :burst - :cost, :now)
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = CASE
+            WHEN rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate > :burst THEN :burst
+            ELSE rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate
+        END - :cost,
+        updated_at = :now
+    WHERE rate_limit_buckets.tokens + (:now - rate_limit_buckets.updated_at) * :rate >= :cost
+    RETURNING tokens
+""")
+_PEEK = text("SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = :key")
+_PURGE = text("DELETE FROM rate_limit_buckets WHERE updated_at < :idle_before")
+
+class DatabaseBucketStore:
+    """
+    Buckets shared through the database. Refill and take happen in one
+    upsert, so concurrent processes never both spend the last token.
+    Uses its own short autocommit transaction, separate from the RPC's.
+
+    `idle_seconds` must be at least the longest refill time (burst / rate)
+    of any bucket: rows untouched for that long are full and get deleted.
+    """
+    def __init__(self, engine, idle_seconds: float = 3600.0, purge_interval_seconds: float = 300.0):
+        self.engine = engine
+        self.idle_seconds = idle_seconds
+        self.purge_interval = purge_interval_seconds
+        self._next_purge = 0.0
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        now = time.time()
+        params = {"key": key, "rate": float(rate), "burst": float(burst), "cost": float(cost), "now": now}
+        with self.engine.begin() as conn:
+            self._maybe_purge(conn, now)
+            if conn.execute(_TAKE, params).first() is not None:
+                return 0.0
+            row = conn.execute(_PEEK, {"key": key}).first()
+        tokens = min(burst, row.tokens + (now - row.updated_at) * rate) if row else burst
+        return max(0.0, (cost - tokens) / rate)
+
+    def _maybe_purge(self, conn, now: float) -> None:
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+        deleted = conn.execute(_PURGE, {"idle_before": now - self.idle_seconds}).rowcount
+        if deleted:
+            logger.info("Purged %d idle rate limit buckets", deleted)
+
+class RateLimiter:
+    def __init__(self, store, client_rate: float, client_burst: float, member_rate: float, member_burst: float,
+                 member_methods: Iterable[str] = ()):
+        self.store = store
+        self.client = (client_rate, client_burst)
+        self.member = (member_rate, member_burst)
+        self.member_methods = frozenset(member_methods)
+
+    def check(self, method_name: str, client_id: str, request=None) -> None:
+        """
+        Spends one token for the client and, on loan RPCs, one for the member.
+
+        Raises:
+            RateLimitedError: If either bucket is empty.
+        """
+        self._take(method_name, "client", f"client:{client_id}", self.client)
+        if method_name in self.member_methods:
+            member_id = getattr(request, "member_id", None)
+            if member_id:
+                self._take(method_name, "member", f"member:{member_id}", self.member)
+
+    def _take(self, method_name: str, kind: str, key: str, limit) -> None:
+        rate, burst = limit
+        try:
+            wait = self.store.take(key, rate, burst)
+        except Exception as e:
+            # A store outage must not take the API down with it: fail open
+            logger.warning("Rate limit store unavailable, allowing %s: %s", method_name, e)
+            return
+        if wait:
+            RATE_LIMITED.inc(method_name, kind)
+            raise RateLimitedError(f"Too many requests for this {kind}, retry in {wait:.2f}s")
+
+def client_identity(metadata, context) -> str:
+    """`x-client-id` from the invocation metadata, else the peer host (without the ephemeral port)."""
+    client_id = metadata_value(metadata, "x-client-id")
+    if client_id:
+        return client_id
+    peer = context.peer() or "unknown"
+    return peer.rsplit(":", 1)[0] if peer.startswith(("ipv4:", "ipv6:")) else peer
+
+def from_config() -> Optional[RateLimiter]:
+    """Builds the limiter from Config (None when RATE_LIMIT_ENABLED is off)."""
+    config = Config.get_rate_limit_config()
+    if not config["enabled"]:
+        return None
+    if config["store"] == "database":
+        from backend.core.database.infrastructure.session import engine
+        # Buckets idle for their longest refill time are full again and can go
+        idle = max(config["client_burst"] / config["client_rate"], config["member_burst"] / config["member_rate"])
+        store = DatabaseBucketStore(engine, idle, config["purge_interval_seconds"])
+    else:
+        store = MemoryBucketStore(config["shards"])
+    return RateLimiter(store, config["client_rate"], config["client_burst"], config["member_rate"],
+                       config["member_burst"], config["member_methods"])
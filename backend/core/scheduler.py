@@ -0,0 +1,81 @@
+"""
+Background jobs that run on a fixed interval inside the server process
+(stats snapshot and materialized view refreshes). Each job gets a daemon
+thread; a failed run is logged and the job runs again at the next interval.
+trigger() runs a job early, e.g. once enough writes have made its output
+stale (see WriteVolumeTrigger).
+"""
+import threading
+from typing import Callable, Iterable
+from sqlalchemy import event
+from backend.core.logger import logger
+
+class PeriodicTask:
+    def __init__(self, name: str, interval: float, func: Callable[[], None]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            self.run_once()
+
+    def run_once(self):
+        try:
+            self.func()
+        except Exception:
+            logger.exception("Periodic task %s failed", self.name)
+
+    def start(self) -> "PeriodicTask":
+        self._thread.start()
+        return self
+
+    def trigger(self):
+        """Runs the job now instead of at the end of the current interval."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+
+class WriteVolumeTrigger:
+    """
+    Counts rows inserted, updated or deleted in `tables` through an engine
+    and calls `callback` each time another `threshold` rows were written.
+    Rolled-back writes count too; at worst they cause an early refresh.
+    """
+    def __init__(self, tables: Iterable[str], threshold: int, callback: Callable[[], None]):
+        self.tables = frozenset(tables)
+        self.threshold = threshold
+        self.callback = callback
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    def install(self, engine) -> "WriteVolumeTrigger":
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        return self
+
+    def uninstall(self, engine):
+        event.remove(engine, "after_cursor_execute", self._after_execute)
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not (context.isinsert or context.isupdate or context.isdelete):
+            return
+        target = getattr(getattr(context.compiled, "statement", None), "table", None)
+        if getattr(target, "name", None) not in self.tables:
+            return
+        rows = cursor.rowcount if cursor.rowcount >= 0 else (len(parameters) if executemany else 1)
+        with self._lock:
+            self.pending += rows
+            if self.pending < self.threshold:
+                return
+            self.pending = 0
+        self.callback()
@@ -0,0 +1,267 @@
+"""
+Lightweight request tracing with W3C trace context and OTLP/JSON export.
+
+The interceptor opens a server span per RPC, continuing the caller's
+`traceparent` (or deriving the trace id from `x-request-id`, so traces and
+log lines share an id). Services and repositories decorated with `@traced`
+get child spans, and engine events add one span per SQL statement.
+
+Only sampled requests record anything: outside a recording span `traced`
+methods run undecorated apart from one context-var lookup. Finished traces
+are handed to an exporter when the server span ends.
+"""
+import functools
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+SPAN_KIND_INTERNAL, SPAN_KIND_SERVER, SPAN_KIND_CLIENT = 1, 2, 3
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+                 "attributes", "status", "status_message", "_trace")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, trace: list):
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes: Dict[str, object] = {}
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        # Spans of the same trace (within this process) are collected here
+        self._trace = trace
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self._trace.append(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+class InMemoryExporter:
+    """Keeps finished spans in a list; meant for tests and ad-hoc inspection."""
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def to_otlp(spans: List[Span], service_name: str = "library_backend") -> dict:
+    """Encodes spans as an OTLP/JSON ExportTraceServiceRequest."""
+    return {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+        "scopeSpans": [{
+            "scope": {"name": "backend.core.tracing"},
+            "spans": [{
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "kind": s.kind,
+                "startTimeUnixNano": str(s.start_ns),
+                "endTimeUnixNano": str(s.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                "status": {"code": s.status, "message": s.status_message},
+            } for s in spans],
+        }],
+    }]}
+
+class OtlpJsonFileExporter:
+    """
+    Appends one OTLP/JSON request per trace to a JSON Lines file, the same
+    layout the OpenTelemetry Collector's file exporter/receiver uses.
+    """
+    def __init__(self, path: str, service_name: str = "library_backend"):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        line = json.dumps(to_otlp(spans, self.service_name), separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+class Tracer:
+    def __init__(self, exporter=None, sample_ratio: float = 1.0):
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    def _sampled(self, trace_id: str) -> bool:
+        # Same decision for the same trace id, like OTel's TraceIdRatioBased sampler, but on a hash:
+        # UUIDv4 ids (the gateway's) fix the variant bits, so their low 64 bits are not uniform
+        digest = hashlib.blake2b(trace_id.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") < self.sample_ratio * (1 << 64)
+
+    @contextmanager
+    def server_span(self, name: str, request_id: Optional[str] = None, traceparent: Optional[str] = None):
+        """
+        Root span for an incoming RPC. Yields None when the request is not traced.
+
+        A valid `traceparent` is continued, including its sampled flag. Otherwise
+        the trace id is taken from `request_id` when it is a UUID and sampled by ratio.
+        """
+        if self.exporter is None:
+            yield None
+            return
+
+        parent = _parse_traceparent(traceparent)
+        if parent:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = _trace_id_from(request_id), None
+            sampled = self._sampled(trace_id)
+        if not sampled:
+            yield None
+            return
+
+        trace: List[Span] = []
+        span = Span(name, trace_id, parent_id, SPAN_KIND_SERVER, trace)
+        if request_id:
+            span.set_attribute("request.id", request_id)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            if span.status == STATUS_UNSET:
+                span.set_error(str(e) or type(e).__name__)
+            raise
+        finally:
+            span.end()
+            _reset(token)
+            self.exporter.export(trace)
+
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL) -> Optional[Span]:
+        """Starts a child of the current span without making it current (for SQL events)."""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(name, parent.trace_id, parent.span_id, kind, parent._trace)
+
+    @contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL):
+        """Child span of the current span; yields None when the request is not traced."""
+        span = self.start_span(name, kind)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(str(e) or type(e).__name__)
+            raise
+        finally:
+            span.end()
+            _reset(token)
+
+def _reset(token) -> None:
+    try:
+        _current_span.reset(token)
+    except ValueError:
+        # Streaming handlers may finish in a different context than they started
+        _current_span.set(None)
+
+def _parse_traceparent(value: Optional[str]):
+    # version-traceid-parentid-flags, e.g. 00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3][:2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1].lower(), parts[2].lower(), bool(flags & 1)
+
+def _trace_id_from(request_id: Optional[str]) -> str:
+    if request_id:
+        try:
+            return uuid.UUID(request_id).hex
+        except ValueError:
+            pass
+    return "%032x" % random.getrandbits(128)
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+def build_exporter(kind: str, path: str = "traces.jsonl"):
+    if kind == "memory":
+        return InMemoryExporter()
+    if kind == "otlp_file":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return OtlpJsonFileExporter(path)
+    return None
+
+def _from_config() -> Tracer:
+    from backend.core.config import Config
+    config = Config.get_tracing_config()
+    return Tracer(build_exporter(config["exporter"], config["file"]), config["sample_ratio"])
+
+tracer = _from_config()
+
+def traced(cls):
+    """
+    Class decorator: wraps every public method defined on `cls` in a span
+    named `<Class>.<method>` when called inside a traced request.
+    """
+    for attr, fn in list(vars(cls).items()):
+        if attr.startswith("_") or not callable(fn) or isinstance(fn, (staticmethod, classmethod)):
+            continue
+        setattr(cls, attr, _wrap(fn, f"{cls.__name__}.{attr}"))
+    return cls
+
+def _wrap(fn, name: str):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _current_span.get() is None:
+            return fn(*args, **kwargs)
+        with tracer.span(name):
+            return fn(*args, **kwargs)
+    return wrapper
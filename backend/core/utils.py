@@ -1,5 +1,12 @@
+import time
 from contextlib import contextmanager
-from backend.core.database.infrastructure.session import get_db
+from typing import Iterable, Optional, Set
+from sqlalchemy import text
+from backend.core.context import time_remaining, MAX_DEADLINE_SECONDS
+from backend.core.database.infrastructure.session import SessionLocal, ScopedSession
+from backend.core.exceptions import DeadlineExceededError, ValidationError
+from backend.core.messages import ErrorMessages
+from backend.core import metrics
 
 def build_paginated_response(items, total_count: int, limit: int, key_name: str) -> dict:
     """
@@ -21,6 +28,45 @@ def build_paginated_response(items, total_count: int, limit: int, key_name: str)
         "total_pages": total_pages
     }
 
+def parse_field_mask(paths: Iterable[str], allowed: Iterable[str]) -> Optional[Set[str]]:
+    """
+    Resolves FieldMask paths to the set of top-level fields to populate.
+
+    Args:
+        paths: FieldMask paths (e.g. ['id', 'title', 'author.name']).
+        allowed: Field names of the response message.
+
+    Returns:
+        Optional[set]: Requested top-level fields (always including 'id'),
+        or None when the mask is empty and every field is wanted.
+    """
+    fields = {path.split(".", 1)[0] for path in paths}
+    if not fields:
+        return None
+    unknown = fields - set(allowed)
+    if unknown:
+        raise ValidationError(ErrorMessages.FIELD_MASK_INVALID.format(fields=", ".join(sorted(unknown))))
+    fields.add("id")
+    return fields
+
+# Postgres SQLSTATE for statements cancelled by statement_timeout
+QUERY_CANCELED = "57014"
+
+def _apply_statement_timeout(session) -> None:
+    """Bounds every statement of this transaction by the RPC's remaining deadline (PostgreSQL only)."""
+    remaining = time_remaining()
+    if remaining is None or session.get_bind().dialect.name != "postgresql":
+        return
+    if remaining <= 0:
+        raise DeadlineExceededError()
+    # SET LOCAL takes no bind parameters; set_config(..., true) is its transaction-scoped equivalent
+    session.execute(text("SELECT set_config('statement_timeout', :ms, true)"),
+                    {"ms": str(min(int(MAX_DEADLINE_SECONDS * 1000), max(1, int(remaining * 1000))))})
+
+def _is_query_canceled(error) -> bool:
+    orig = getattr(error, "orig", None)
+    return QUERY_CANCELED in (getattr(orig, "sqlstate", None), getattr(orig, "pgcode", None))
+
 @contextmanager
 def db_scope():
     """
@@ -29,14 +75,35 @@ def db_scope():
     - Commits automatically on success.
     - Rolls back automatically on exception.
     - Maps SQLAlchemy exceptions to Domain exceptions.
+    - Honours the RPC deadline: fails fast once it has passed, bounds the pool
+      wait by it and applies the remainder as the transaction's statement_timeout.
+    - Reuses the worker thread's Session: closing it returns the connection and
+      empties the identity map, and session.info (request loaders) is cleared,
+      so nothing carries over to the thread's next request.
     """
-    from sqlalchemy.exc import IntegrityError, OperationalError
+    from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as PoolTimeoutError
     from backend.core.exceptions import ConflictError, DatabaseError
-    
-    # get_db is a generator
-    gen = get_db()
-    session = next(gen)
+
+    remaining = time_remaining()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceededError()
+
+    session = ScopedSession()
+    if session.in_transaction():
+        # Nested scope on this thread: give it its own session rather than committing the outer one
+        session = SessionLocal()
     try:
+        # Check out the connection up front so pool wait time is measured on its own
+        start = time.perf_counter()
+        try:
+            session.connection()
+        except PoolTimeoutError:
+            if remaining is not None:
+                raise DeadlineExceededError()
+            raise
+        metrics.POOL_WAIT.observe(time.perf_counter() - start)
+        if remaining is not None:
+            _apply_statement_timeout(session)
         yield session
         session.commit()
     except IntegrityError as e:
@@ -51,19 +118,19 @@ def db_scope():
             raise ConflictError("Book with this ISBN already exists")
         elif "genres_name_key" in error_info:
             raise ConflictError("Genre with this name already exists")
+        elif "authors_name_key" in error_info:
+            raise ConflictError("Author with this name already exists")
             
         # logger.warning(f"IntegrityError: {e}")
         raise ConflictError(f"Resource already exists (Database Constraint Violation)")
     except OperationalError as e:
         session.rollback()
+        if _is_query_canceled(e):
+            raise DeadlineExceededError()
         raise DatabaseError("Database unavailable")
     except Exception as e:
         session.rollback()
         raise
     finally:
-        try:
-            next(gen)
-        except StopIteration:
-            pass
-        except Exception:
-            session.close()
+        session.close()
+        session.info.clear()
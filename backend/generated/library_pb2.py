@@ -22,71 +22,118 @@ _runtime_version.ValidateProtobufRuntimeVersion(
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import field_mask_pb2 as google_dot_protobuf_dot_field__mask__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rlibrary.proto\x12\x07library\"/\n\x06\x41uthor\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0b\n\x03\x62io\x18\x03 \x01(\t\"!\n\x05Genre\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\"\xa0\x01\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x1f\n\x06\x61uthor\x18\x03 \x01(\x0b\x32\x0f.library.Author\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x1e\n\x06genres\x18\x05 \x03(\x0b\x32\x0e.library.Genre\x12\x14\n\x0ctotal_copies\x18\x06 \x01(\x05\x12\x18\n\x10\x61vailable_copies\x18\x07 \x01(\x05\"M\n\x08\x42ookCopy\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x14\n\x0cis_available\x18\x03 \x01(\x08\x12\x0e\n\x06status\x18\x04 \x01(\t\"1\n\x06Member\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\"\x9f\x01\n\x04Loan\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x63opy_id\x18\x02 \x01(\t\x12\x12\n\nbook_title\x18\x03 \x01(\t\x12\x11\n\tmember_id\x18\x04 \x01(\t\x12\x13\n\x0b\x62orrowed_at\x18\x05 \x01(\t\x12\x13\n\x0breturned_at\x18\x06 \x01(\t\x12\x13\n\x0bmember_name\x18\x07 \x01(\t\x12\x14\n\x0cmember_email\x18\x08 \x01(\t\"0\n\x13\x43reateAuthorRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0b\n\x03\x62io\x18\x02 \x01(\t\"1\n\x12ListAuthorsRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\"a\n\x13ListAuthorsResponse\x12 \n\x07\x61uthors\x18\x01 \x03(\x0b\x32\x0f.library.Author\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"\"\n\x12\x43reateGenreRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"0\n\x11ListGenresRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\"^\n\x12ListGenresResponse\x12\x1e\n\x06genres\x18\x01 \x03(\x0b\x32\x0e.library.Genre\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"n\n\x11\x43reateBookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x11\n\tauthor_id\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\x12\x11\n\tgenre_ids\x18\x04 \x03(\t\x12\x16\n\x0einitial_copies\x18\x05 \x01(\x05\"/\n\x10ListBooksRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\"\x92\x01\n\x11UpdateBookRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\x05title\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x16\n\tauthor_id\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x11\n\x04isbn\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x11\n\tgenre_ids\x18\x05 \x03(\tB\x08\n\x06_titleB\x0c\n\n_author_idB\x07\n\x05_isbn\"[\n\x11ListBooksResponse\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"%\n\x12\x41\x64\x64\x42ookCopyRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\"E\n\x15ListBookCopiesRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\r\n\x05limit\x18\x03 \x01(\x05\"e\n\x16ListBookCopiesResponse\x12!\n\x06\x63opies\x18\x01 \x03(\x0b\x32\x11.library.BookCopy\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"2\n\x13\x43reateMemberRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\"1\n\x12ListMembersRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\"[\n\x13UpdateMemberRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\x04name\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x12\n\x05\x65mail\x18\x03 \x01(\tH\x01\x88\x01\x01\x42\x07\n\x05_nameB\x08\n\x06_email\"a\n\x13ListMembersResponse\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"Y\n\x11\x42orrowBookRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x14\n\x07\x63opy_id\x18\x03 \x01(\tH\x00\x88\x01\x01\x42\n\n\x08_copy_id\"$\n\x11ReturnBookRequest\x12\x0f\n\x07loan_id\x18\x01 \x01(\t\"H\n\x16ListMemberLoansRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\r\n\x05limit\x18\x03 \x01(\x05\"2\n\x13ListAllLoansRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\"[\n\x11ListLoansResponse\x12\x1c\n\x05loans\x18\x01 \x03(\x0b\x32\r.library.Loan\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\x32\xd8\x08\n\x0eLibraryService\x12?\n\x0c\x43reateAuthor\x12\x1c.library.CreateAuthorRequest\x1a\x0f.library.Author\"\x00\x12J\n\x0bListAuthors\x12\x1b.library.ListAuthorsRequest\x1a\x1c.library.ListAuthorsResponse\"\x00\x12<\n\x0b\x43reateGenre\x12\x1b.library.CreateGenreRequest\x1a\x0e.library.Genre\"\x00\x12G\n\nListGenres\x12\x1a.library.ListGenresRequest\x1a\x1b.library.ListGenresResponse\"\x00\x12\x39\n\nCreateBook\x12\x1a.library.CreateBookRequest\x1a\r.library.Book\"\x00\x12\x44\n\tListBooks\x12\x19.library.ListBooksRequest\x1a\x1a.library.ListBooksResponse\"\x00\x12\x39\n\nUpdateBook\x12\x1a.library.UpdateBookRequest\x1a\r.library.Book\"\x00\x12?\n\x0b\x41\x64\x64\x42ookCopy\x12\x1b.library.AddBookCopyRequest\x1a\x11.library.BookCopy\"\x00\x12S\n\x0eListBookCopies\x12\x1e.library.ListBookCopiesRequest\x1a\x1f.library.ListBookCopiesResponse\"\x00\x12?\n\x0c\x43reateMember\x12\x1c.library.CreateMemberRequest\x1a\x0f.library.Member\"\x00\x12J\n\x0bListMembers\x12\x1b.library.ListMembersRequest\x1a\x1c.library.ListMembersResponse\"\x00\x12?\n\x0cUpdateMember\x12\x1c.library.UpdateMemberRequest\x1a\x0f.library.Member\"\x00\x12\x39\n\nBorrowBook\x12\x1a.library.BorrowBookRequest\x1a\r.library.Loan\"\x00\x12\x39\n\nReturnBook\x12\x1a.library.ReturnBookRequest\x1a\r.library.Loan\"\x00\x12P\n\x0fListMemberLoans\x12\x1f.library.ListMemberLoansRequest\x1a\x1a.library.ListLoansResponse\"\x00\x12J\n\x0cListAllLoans\x12\x1c.library.ListAllLoansRequest\x1a\x1a.library.ListLoansResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\rlibrary.proto\x12\x07library\x1a google/protobuf/field_mask.proto\"/\n\x06\x41uthor\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0b\n\x03\x62io\x18\x03 \x01(\t\"!\n\x05Genre\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\"\xa0\x01\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\x1f\n\x06\x61uthor\x18\x03 \x01(\x0b\x32\x0f.library.Author\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x1e\n\x06genres\x18\x05 \x03(\x0b\x32\x0e.library.Genre\x12\x14\n\x0ctotal_copies\x18\x06 \x01(\x05\x12\x18\n\x10\x61vailable_copies\x18\x07 \x01(\x05\"M\n\x08\x42ookCopy\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x14\n\x0cis_available\x18\x03 \x01(\x08\x12\x0e\n\x06status\x18\x04 \x01(\t\"1\n\x06Member\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x65mail\x18\x03 \x01(\t\"\x9f\x01\n\x04Loan\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0f\n\x07\x63opy_id\x18\x02 \x01(\t\x12\x12\n\nbook_title\x18\x03 \x01(\t\x12\x11\n\tmember_id\x18\x04 \x01(\t\x12\x13\n\x0b\x62orrowed_at\x18\x05 \x01(\t\x12\x13\n\x0breturned_at\x18\x06 \x01(\t\x12\x13\n\x0bmember_name\x18\x07 \x01(\t\x12\x14\n\x0cmember_email\x18\x08 \x01(\t\"@\n\x13\x43reateAuthorRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0b\n\x03\x62io\x18\x02 \x01(\t\x12\x0e\n\x06upsert\x18\x03 \x01(\x08\"a\n\x12ListAuthorsRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12.\n\nfield_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"a\n\x13ListAuthorsResponse\x12 \n\x07\x61uthors\x18\x01 \x03(\x0b\x32\x0f.library.Author\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"2\n\x12\x43reateGenreRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0e\n\x06upsert\x18\x02 \x01(\x08\"`\n\x11ListGenresRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12.\n\nfield_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"^\n\x12ListGenresResponse\x12\x1e\n\x06genres\x18\x01 \x03(\x0b\x32\x0e.library.Genre\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"n\n\x11\x43reateBookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x11\n\tauthor_id\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\x12\x11\n\tgenre_ids\x18\x04 \x03(\t\x12\x16\n\x0einitial_copies\x18\x05 \x01(\x05\"_\n\x10ListBooksRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12.\n\nfield_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"\x92\x01\n\x11UpdateBookRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x12\n\x05title\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x16\n\tauthor_id\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x11\n\x04isbn\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x11\n\tgenre_ids\x18\x05 \x03(\tB\x08\n\x06_titleB\x0c\n\n_author_idB\x07\n\x05_isbn\"[\n\x11ListBooksResponse\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"%\n\x12\x41\x64\x64\x42ookCopyRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\"6\n\x14\x41\x64\x64\x42ookCopiesRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\":\n\x15\x41\x64\x64\x42ookCopiesResponse\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\x10\n\x08\x63opy_ids\x18\x02 \x03(\t\"u\n\x15ListBookCopiesRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\r\n\x05limit\x18\x03 \x01(\x05\x12.\n\nfield_mask\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"e\n\x16ListBookCopiesResponse\x12!\n\x06\x63opies\x18\x01 \x03(\x0b\x32\x11.library.BookCopy\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"B\n\x13\x43reateMemberRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x65mail\x18\x02 \x01(\t\x12\x0e\n\x06upsert\x18\x03 \x01(\x08\"a\n\x12ListMembersRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12.\n\nfield_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"[\n\x13UpdateMemberRequest\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\x04name\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x12\n\x05\x65mail\x18\x03 \x01(\tH\x01\x88\x01\x01\x42\x07\n\x05_nameB\x08\n\x06_email\"a\n\x13ListMembersResponse\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"Y\n\x11\x42orrowBookRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\t\x12\x14\n\x07\x63opy_id\x18\x03 \x01(\tH\x00\x88\x01\x01\x42\n\n\x08_copy_id\"$\n\x11ReturnBookRequest\x12\x0f\n\x07loan_id\x18\x01 \x01(\t\"D\n\x0f\x42\x61tchBorrowItem\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\x14\n\x07\x63opy_id\x18\x02 \x01(\tH\x00\x88\x01\x01\x42\n\n\x08_copy_id\"h\n\x12\x42\x61tchBorrowRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12\'\n\x05items\x18\x02 \x03(\x0b\x32\x18.library.BatchBorrowItem\x12\x16\n\x0e\x61ll_or_nothing\x18\x03 \x01(\x08\">\n\x12\x42\x61tchReturnRequest\x12\x10\n\x08loan_ids\x18\x01 \x03(\t\x12\x16\n\x0e\x61ll_or_nothing\x18\x02 \x01(\x08\"Y\n\x0f\x42\x61tchLoanResult\x12\x1b\n\x04loan\x18\x01 \x01(\x0b\x32\r.library.Loan\x12\x12\n\nerror_code\x18\x02 \x01(\t\x12\x15\n\rerror_message\x18\x03 \x01(\t\"R\n\x12\x42\x61tchLoansResponse\x12)\n\x07results\x18\x01 \x03(\x0b\x32\x18.library.BatchLoanResult\x12\x11\n\tsucceeded\x18\x02 \x01(\x05\"x\n\x16ListMemberLoansRequest\x12\x11\n\tmember_id\x18\x01 \x01(\t\x12\x0c\n\x04page\x18\x02 \x01(\x05\x12\r\n\x05limit\x18\x03 \x01(\x05\x12.\n\nfield_mask\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"b\n\x13ListAllLoansRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\x12.\n\nfield_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"[\n\x11ListLoansResponse\x12\x1c\n\x05loans\x18\x01 \x03(\x0b\x32\r.library.Loan\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\"(\n\x12StreamBooksRequest\x12\x12\n\nchunk_size\x18\x01 \x01(\x05\"*\n\x14StreamMembersRequest\x12\x12\n\nchunk_size\x18\x01 \x01(\x05\"N\n\x12StreamLoansRequest\x12\x16\n\tmember_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x12\n\nchunk_size\x18\x02 \x01(\x05\x42\x0c\n\n_member_id\"#\n\x14\x42\x61tchGetBooksRequest\x12\x0b\n\x03ids\x18\x01 \x03(\t\"J\n\x15\x42\x61tchGetBooksResponse\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12\x13\n\x0bmissing_ids\x18\x02 \x03(\t\"%\n\x16\x42\x61tchGetMembersRequest\x12\x0b\n\x03ids\x18\x01 \x03(\t\"P\n\x17\x42\x61tchGetMembersResponse\x12 \n\x07members\x18\x01 \x03(\x0b\x32\x0f.library.Member\x12\x13\n\x0bmissing_ids\x18\x02 \x03(\t\"$\n\x15\x42\x61tchGetCopiesRequest\x12\x0b\n\x03ids\x18\x01 \x03(\t\"P\n\x16\x42\x61tchGetCopiesResponse\x12!\n\x06\x63opies\x18\x01 \x03(\x0b\x32\x11.library.BookCopy\x12\x13\n\x0bmissing_ids\x18\x02 \x03(\t\"\x18\n\x16GetLibraryStatsRequest\";\n\nTitleLoans\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\t\x12\r\n\x05title\x18\x02 \x01(\t\x12\r\n\x05loans\x18\x03 \x01(\x05\"&\n\x08\x44\x61yLoans\x12\x0b\n\x03\x64\x61y\x18\x01 \x01(\t\x12\r\n\x05loans\x18\x02 \x01(\x05\"\xab\x02\n\x0cLibraryStats\x12\x13\n\x0btotal_books\x18\x01 \x01(\x05\x12\x14\n\x0ctotal_copies\x18\x02 \x01(\x05\x12\x18\n\x10\x61vailable_copies\x18\x03 \x01(\x05\x12\x14\n\x0c\x61\x63tive_loans\x18\x04 \x01(\x05\x12\x15\n\rtotal_members\x18\x05 \x01(\x05\x12\x15\n\rtotal_authors\x18\x06 \x01(\x05\x12\x14\n\x0ctotal_genres\x18\x07 \x01(\x05\x12\'\n\ntop_titles\x18\x08 \x03(\x0b\x32\x13.library.TitleLoans\x12(\n\rloans_per_day\x18\t \x03(\x0b\x32\x11.library.DayLoans\x12\x14\n\x0crefreshed_at\x18\n \x01(\t\x12\x13\n\x0b\x61ge_seconds\x18\x0b \x01(\x01\"6\n\x17ListAvailabilityRequest\x12\x0c\n\x04page\x18\x01 \x01(\x05\x12\r\n\x05limit\x18\x02 \x01(\x05\"a\n\x0c\x41vailability\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\r\n\x05\x62ooks\x18\x03 \x01(\x05\x12\x0e\n\x06\x63opies\x18\x04 \x01(\x05\x12\x18\n\x10\x61vailable_copies\x18\x05 \x01(\x05\"\x94\x01\n\x18ListAvailabilityResponse\x12#\n\x04rows\x18\x01 \x03(\x0b\x32\x15.library.Availability\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x12\x13\n\x0btotal_pages\x18\x03 \x01(\x05\x12\x14\n\x0crefreshed_at\x18\x04 \x01(\t\x12\x13\n\x0b\x61ge_seconds\x18\x05 \x01(\x01\x32\x90\x10\n\x0eLibraryService\x12?\n\x0c\x43reateAuthor\x12\x1c.library.CreateAuthorRequest\x1a\x0f.library.Author\"\x00\x12J\n\x0bListAuthors\x12\x1b.library.ListAuthorsRequest\x1a\x1c.library.ListAuthorsResponse\"\x00\x12<\n\x0b\x43reateGenre\x12\x1b.library.CreateGenreRequest\x1a\x0e.library.Genre\"\x00\x12G\n\nListGenres\x12\x1a.library.ListGenresRequest\x1a\x1b.library.ListGenresResponse\"\x00\x12\x39\n\nCreateBook\x12\x1a.library.CreateBookRequest\x1a\r.library.Book\"\x00\x12\x44\n\tListBooks\x12\x19.library.ListBooksRequest\x1a\x1a.library.ListBooksResponse\"\x00\x12\x39\n\nUpdateBook\x12\x1a.library.UpdateBookRequest\x1a\r.library.Book\"\x00\x12?\n\x0b\x41\x64\x64\x42ookCopy\x12\x1b.library.AddBookCopyRequest\x1a\x11.library.BookCopy\"\x00\x12P\n\rAddBookCopies\x12\x1d.library.AddBookCopiesRequest\x1a\x1e.library.AddBookCopiesResponse\"\x00\x12S\n\x0eListBookCopies\x12\x1e.library.ListBookCopiesRequest\x1a\x1f.library.ListBookCopiesResponse\"\x00\x12?\n\x0c\x43reateMember\x12\x1c.library.CreateMemberRequest\x1a\x0f.library.Member\"\x00\x12J\n\x0bListMembers\x12\x1b.library.ListMembersRequest\x1a\x1c.library.ListMembersResponse\"\x00\x12?\n\x0cUpdateMember\x12\x1c.library.UpdateMemberRequest\x1a\x0f.library.Member\"\x00\x12\x39\n\nBorrowBook\x12\x1a.library.BorrowBookRequest\x1a\r.library.Loan\"\x00\x12\x39\n\nReturnBook\x12\x1a.library.ReturnBookRequest\x1a\r.library.Loan\"\x00\x12P\n\x0fListMemberLoans\x12\x1f.library.ListMemberLoansRequest\x1a\x1a.library.ListLoansResponse\"\x00\x12J\n\x0cListAllLoans\x12\x1c.library.ListAllLoansRequest\x1a\x1a.library.ListLoansResponse\"\x00\x12I\n\x0b\x42\x61tchBorrow\x12\x1b.library.BatchBorrowRequest\x1a\x1b.library.BatchLoansResponse\"\x00\x12I\n\x0b\x42\x61tchReturn\x12\x1b.library.BatchReturnRequest\x1a\x1b.library.BatchLoansResponse\"\x00\x12P\n\rBatchGetBooks\x12\x1d.library.BatchGetBooksRequest\x1a\x1e.library.BatchGetBooksResponse\"\x00\x12V\n\x0f\x42\x61tchGetMembers\x12\x1f.library.BatchGetMembersRequest\x1a .library.BatchGetMembersResponse\"\x00\x12S\n\x0e\x42\x61tchGetCopies\x12\x1e.library.BatchGetCopiesRequest\x1a\x1f.library.BatchGetCopiesResponse\"\x00\x12=\n\x0bStreamBooks\x12\x1b.library.StreamBooksRequest\x1a\r.library.Book\"\x00\x30\x01\x12\x43\n\rStreamMembers\x12\x1d.library.StreamMembersRequest\x1a\x0f.library.Member\"\x00\x30\x01\x12=\n\x0bStreamLoans\x12\x1b.library.StreamLoansRequest\x1a\r.library.Loan\"\x00\x30\x01\x12K\n\x0fGetLibraryStats\x12\x1f.library.GetLibraryStatsRequest\x1a\x15.library.LibraryStats\"\x00\x12^\n\x15ListGenreAvailability\x12 .library.ListAvailabilityRequest\x1a!.library.ListAvailabilityResponse\"\x00\x12_\n\x16ListAuthorAvailability\x12 .library.ListAvailabilityRequest\x1a!.library.ListAvailabilityResponse\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'library_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_AUTHOR']._serialized_start=26
-  _globals['_AUTHOR']._serialized_end=73
-  _globals['_GENRE']._serialized_start=75
-  _globals['_GENRE']._serialized_end=108
-  _globals['_BOOK']._serialized_start=111
-  _globals['_BOOK']._serialized_end=271
-  _globals['_BOOKCOPY']._serialized_start=273
-  _globals['_BOOKCOPY']._serialized_end=350
-  _globals['_MEMBER']._serialized_start=352
-  _globals['_MEMBER']._serialized_end=401
-  _globals['_LOAN']._serialized_start=404
-  _globals['_LOAN']._serialized_end=563
-  _globals['_CREATEAUTHORREQUEST']._serialized_start=565
-  _globals['_CREATEAUTHORREQUEST']._serialized_end=613
-  _globals['_LISTAUTHORSREQUEST']._serialized_start=615
-  _globals['_LISTAUTHORSREQUEST']._serialized_end=664
-  _globals['_LISTAUTHORSRESPONSE']._serialized_start=666
-  _globals['_LISTAUTHORSRESPONSE']._serialized_end=763
-  _globals['_CREATEGENREREQUEST']._serialized_start=765
-  _globals['_CREATEGENREREQUEST']._serialized_end=799
-  _globals['_LISTGENRESREQUEST']._serialized_start=801
-  _globals['_LISTGENRESREQUEST']._serialized_end=849
-  _globals['_LISTGENRESRESPONSE']._serialized_start=851
-  _globals['_LISTGENRESRESPONSE']._serialized_end=945
-  _globals['_CREATEBOOKREQUEST']._serialized_start=947
-  _globals['_CREATEBOOKREQUEST']._serialized_end=1057
-  _globals['_LISTBOOKSREQUEST']._serialized_start=1059
-  _globals['_LISTBOOKSREQUEST']._serialized_end=1106
-  _globals['_UPDATEBOOKREQUEST']._serialized_start=1109
-  _globals['_UPDATEBOOKREQUEST']._serialized_end=1255
-  _globals['_LISTBOOKSRESPONSE']._serialized_start=1257
-  _globals['_LISTBOOKSRESPONSE']._serialized_end=1348
-  _globals['_ADDBOOKCOPYREQUEST']._serialized_start=1350
-  _globals['_ADDBOOKCOPYREQUEST']._serialized_end=1387
-  _globals['_LISTBOOKCOPIESREQUEST']._serialized_start=1389
-  _globals['_LISTBOOKCOPIESREQUEST']._serialized_end=1458
-  _globals['_LISTBOOKCOPIESRESPONSE']._serialized_start=1460
-  _globals['_LISTBOOKCOPIESRESPONSE']._serialized_end=1561
-  _globals['_CREATEMEMBERREQUEST']._serialized_start=1563
-  _globals['_CREATEMEMBERREQUEST']._serialized_end=1613
-  _globals['_LISTMEMBERSREQUEST']._serialized_start=1615
-  _globals['_LISTMEMBERSREQUEST']._serialized_end=1664
-  _globals['_UPDATEMEMBERREQUEST']._serialized_start=1666
-  _globals['_UPDATEMEMBERREQUEST']._serialized_end=1757
-  _globals['_LISTMEMBERSRESPONSE']._serialized_start=1759
-  _globals['_LISTMEMBERSRESPONSE']._serialized_end=1856
-  _globals['_BORROWBOOKREQUEST']._serialized_start=1858
-  _globals['_BORROWBOOKREQUEST']._serialized_end=1947
-  _globals['_RETURNBOOKREQUEST']._serialized_start=1949
-  _globals['_RETURNBOOKREQUEST']._serialized_end=1985
-  _globals['_LISTMEMBERLOANSREQUEST']._serialized_start=1987
-  _globals['_LISTMEMBERLOANSREQUEST']._serialized_end=2059
-  _globals['_LISTALLLOANSREQUEST']._serialized_start=2061
-  _globals['_LISTALLLOANSREQUEST']._serialized_end=2111
-  _globals['_LISTLOANSRESPONSE']._serialized_start=2113
-  _globals['_LISTLOANSRESPONSE']._serialized_end=2204
-  _globals['_LIBRARYSERVICE']._serialized_start=2207
-  _globals['_LIBRARYSERVICE']._serialized_end=3319
+  _globals['_AUTHOR']._serialized_start=60
+  _globals['_AUTHOR']._serialized_end=107
+  _globals['_GENRE']._serialized_start=109
+  _globals['_GENRE']._serialized_end=142
+  _globals['_BOOK']._serialized_start=145
+  _globals['_BOOK']._serialized_end=305
+  _globals['_BOOKCOPY']._serialized_start=307
+  _globals['_BOOKCOPY']._serialized_end=384
+  _globals['_MEMBER']._serialized_start=386
+  _globals['_MEMBER']._serialized_end=435
+  _globals['_LOAN']._serialized_start=438
+  _globals['_LOAN']._serialized_end=597
+  _globals['_CREATEAUTHORREQUEST']._serialized_start=599
+  _globals['_CREATEAUTHORREQUEST']._serialized_end=663
+  _globals['_LISTAUTHORSREQUEST']._serialized_start=665
+  _globals['_LISTAUTHORSREQUEST']._serialized_end=762
+  _globals['_LISTAUTHORSRESPONSE']._serialized_start=764
+  _globals['_LISTAUTHORSRESPONSE']._serialized_end=861
+  _globals['_CREATEGENREREQUEST']._serialized_start=863
+  _globals['_CREATEGENREREQUEST']._serialized_end=913
+  _globals['_LISTGENRESREQUEST']._serialized_start=915
+  _globals['_LISTGENRESREQUEST']._serialized_end=1011
+  _globals['_LISTGENRESRESPONSE']._serialized_start=1013
+  _globals['_LISTGENRESRESPONSE']._serialized_end=1107
+  _globals['_CREATEBOOKREQUEST']._serialized_start=1109
+  _globals['_CREATEBOOKREQUEST']._serialized_end=1219
+  _globals['_LISTBOOKSREQUEST']._serialized_start=1221
+  _globals['_LISTBOOKSREQUEST']._serialized_end=1316
+  _globals['_UPDATEBOOKREQUEST']._serialized_start=1319
+  _globals['_UPDATEBOOKREQUEST']._serialized_end=1465
+  _globals['_LISTBOOKSRESPONSE']._serialized_start=1467
+  _globals['_LISTBOOKSRESPONSE']._serialized_end=1558
+  _globals['_ADDBOOKCOPYREQUEST']._serialized_start=1560
+  _globals['_ADDBOOKCOPYREQUEST']._serialized_end=1597
+  _globals['_ADDBOOKCOPIESREQUEST']._serialized_start=1599
+  _globals['_ADDBOOKCOPIESREQUEST']._serialized_end=1653
+  _globals['_ADDBOOKCOPIESRESPONSE']._serialized_start=1655
+  _globals['_ADDBOOKCOPIESRESPONSE']._serialized_end=1713
+  _globals['_LISTBOOKCOPIESREQUEST']._serialized_start=1715
+  _globals['_LISTBOOKCOPIESREQUEST']._serialized_end=1832
+  _globals['_LISTBOOKCOPIESRESPONSE']._serialized_start=1834
+  _globals['_LISTBOOKCOPIESRESPONSE']._serialized_end=1935
+  _globals['_CREATEMEMBERREQUEST']._serialized_start=1937
+  _globals['_CREATEMEMBERREQUEST']._serialized_end=2003
+  _globals['_LISTMEMBERSREQUEST']._serialized_start=2005
+  _globals['_LISTMEMBERSREQUEST']._serialized_end=2102
+  _globals['_UPDATEMEMBERREQUEST']._serialized_start=2104
+  _globals['_UPDATEMEMBERREQUEST']._serialized_end=2195
+  _globals['_LISTMEMBERSRESPONSE']._serialized_start=2197
+  _globals['_LISTMEMBERSRESPONSE']._serialized_end=2294
+  _globals['_BORROWBOOKREQUEST']._serialized_start=2296
+  _globals['_BORROWBOOKREQUEST']._serialized_end=2385
+  _globals['_RETURNBOOKREQUEST']._serialized_start=2387
+  _globals['_RETURNBOOKREQUEST']._serialized_end=2423
+  _globals['_BATCHBORROWITEM']._serialized_start=2425
+  _globals['_BATCHBORROWITEM']._serialized_end=2493
+  _globals['_BATCHBORROWREQUEST']._serialized_start=2495
+  _globals['_BATCHBORROWREQUEST']._serialized_end=2599
+  _globals['_BATCHRETURNREQUEST']._serialized_start=2601
+  _globals['_BATCHRETURNREQUEST']._serialized_end=2663
+  _globals['_BATCHLOANRESULT']._serialized_start=2665
+  _globals['_BATCHLOANRESULT']._serialized_end=2754
+  _globals['_BATCHLOANSRESPONSE']._serialized_start=2756
+  _globals['_BATCHLOANSRESPONSE']._serialized_end=2838
+  _globals['_LISTMEMBERLOANSREQUEST']._serialized_start=2840
+  _globals['_LISTMEMBERLOANSREQUEST']._serialized_end=2960
+  _globals['_LISTALLLOANSREQUEST']._serialized_start=2962
+  _globals['_LISTALLLOANSREQUEST']._serialized_end=3060
+  _globals['_LISTLOANSRESPONSE']._serialized_start=3062
+  _globals['_LISTLOANSRESPONSE']._serialized_end=3153
+  _globals['_STREAMBOOKSREQUEST']._serialized_start=3155
+  _globals['_STREAMBOOKSREQUEST']._serialized_end=3195
+  _globals['_STREAMMEMBERSREQUEST']._serialized_start=3197
+  _globals['_STREAMMEMBERSREQUEST']._serialized_end=3239
+  _globals['_STREAMLOANSREQUEST']._serialized_start=3241
+  _globals['_STREAMLOANSREQUEST']._serialized_end=3319
+  _globals['_BATCHGETBOOKSREQUEST']._serialized_start=3321
+  _globals['_BATCHGETBOOKSREQUEST']._serialized_end=3356
+  _globals['_BATCHGETBOOKSRESPONSE']._serialized_start=3358
+  _globals['_BATCHGETBOOKSRESPONSE']._serialized_end=3432
+  _globals['_BATCHGETMEMBERSREQUEST']._serialized_start=3434
+  _globals['_BATCHGETMEMBERSREQUEST']._serialized_end=3471
+  _globals['_BATCHGETMEMBERSRESPONSE']._serialized_start=3473
+  _globals['_BATCHGETMEMBERSRESPONSE']._serialized_end=3553
+  _globals['_BATCHGETCOPIESREQUEST']._serialized_start=3555
+  _globals['_BATCHGETCOPIESREQUEST']._serialized_end=3591
+  _globals['_BATCHGETCOPIESRESPONSE']._serialized_start=3593
+  _globals['_BATCHGETCOPIESRESPONSE']._serialized_end=3673
+  _globals['_GETLIBRARYSTATSREQUEST']._serialized_start=3675
+  _globals['_GETLIBRARYSTATSREQUEST']._serialized_end=3699
+  _globals['_TITLELOANS']._serialized_start=3701
+  _globals['_TITLELOANS']._serialized_end=3760
+  _globals['_DAYLOANS']._serialized_start=3762
+  _globals['_DAYLOANS']._serialized_end=3800
+  _globals['_LIBRARYSTATS']._serialized_start=3803
+  _globals['_LIBRARYSTATS']._serialized_end=4102
+  _globals['_LISTAVAILABILITYREQUEST']._serialized_start=4104
+  _globals['_LISTAVAILABILITYREQUEST']._serialized_end=4158
+  _globals['_AVAILABILITY']._serialized_start=4160
+  _globals['_AVAILABILITY']._serialized_end=4257
+  _globals['_LISTAVAILABILITYRESPONSE']._serialized_start=4260
+  _globals['_LISTAVAILABILITYRESPONSE']._serialized_end=4408
+  _globals['_LIBRARYSERVICE']._serialized_start=4411
+  _globals['_LIBRARYSERVICE']._serialized_end=6475
 # @@protoc_insertion_point(module_scope)
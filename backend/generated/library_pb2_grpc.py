@@ -74,6 +74,11 @@ class LibraryServiceStub(object):
                 request_serializer=library__pb2.AddBookCopyRequest.SerializeToString,
                 response_deserializer=library__pb2.BookCopy.FromString,
                 _registered_method=True)
+        self.AddBookCopies = channel.unary_unary(
+                '/library.LibraryService/AddBookCopies',
+                request_serializer=library__pb2.AddBookCopiesRequest.SerializeToString,
+                response_deserializer=library__pb2.AddBookCopiesResponse.FromString,
+                _registered_method=True)
         self.ListBookCopies = channel.unary_unary(
                 '/library.LibraryService/ListBookCopies',
                 request_serializer=library__pb2.ListBookCopiesRequest.SerializeToString,
@@ -114,6 +119,61 @@ class LibraryServiceStub(object):
                 request_serializer=library__pb2.ListAllLoansRequest.SerializeToString,
                 response_deserializer=library__pb2.ListLoansResponse.FromString,
                 _registered_method=True)
+        self.BatchBorrow = channel.unary_unary(
+                '/library.LibraryService/BatchBorrow',
+                request_serializer=library__pb2.BatchBorrowRequest.SerializeToString,
+                response_deserializer=library__pb2.BatchLoansResponse.FromString,
+                _registered_method=True)
+        self.BatchReturn = channel.unary_unary(
+                '/library.LibraryService/BatchReturn',
+                request_serializer=library__pb2.BatchReturnRequest.SerializeToString,
+                response_deserializer=library__pb2.BatchLoansResponse.FromString,
+                _registered_method=True)
+        self.BatchGetBooks = channel.unary_unary(
+                '/library.LibraryService/BatchGetBooks',
+                request_serializer=library__pb2.BatchGetBooksRequest.SerializeToString,
+                response_deserializer=library__pb2.BatchGetBooksResponse.FromString,
+                _registered_method=True)
+        self.BatchGetMembers = channel.unary_unary(
+                '/library.LibraryService/BatchGetMembers',
+                request_serializer=library__pb2.BatchGetMembersRequest.SerializeToString,
+                response_deserializer=library__pb2.BatchGetMembersResponse.FromString,
+                _registered_method=True)
+        self.BatchGetCopies = channel.unary_unary(
+                '/library.LibraryService/BatchGetCopies',
+                request_serializer=library__pb2.BatchGetCopiesRequest.SerializeToString,
+                response_deserializer=library__pb2.BatchGetCopiesResponse.FromString,
+                _registered_method=True)
+        self.StreamBooks = channel.unary_stream(
+                '/library.LibraryService/StreamBooks',
+                request_serializer=library__pb2.StreamBooksRequest.SerializeToString,
+                response_deserializer=library__pb2.Book.FromString,
+                _registered_method=True)
+        self.StreamMembers = channel.unary_stream(
+                '/library.LibraryService/StreamMembers',
+                request_serializer=library__pb2.StreamMembersRequest.SerializeToString,
+                response_deserializer=library__pb2.Member.FromString,
+                _registered_method=True)
+        self.StreamLoans = channel.unary_stream(
+                '/library.LibraryService/StreamLoans',
+                request_serializer=library__pb2.StreamLoansRequest.SerializeToString,
+                response_deserializer=library__pb2.Loan.FromString,
+                _registered_method=True)
+        self.GetLibraryStats = channel.unary_unary(
+                '/library.LibraryService/GetLibraryStats',
+                request_serializer=library__pb2.GetLibraryStatsRequest.SerializeToString,
+                response_deserializer=library__pb2.LibraryStats.FromString,
+                _registered_method=True)
+        self.ListGenreAvailability = channel.unary_unary(
+                '/library.LibraryService/ListGenreAvailability',
+                request_serializer=library__pb2.ListAvailabilityRequest.SerializeToString,
+                response_deserializer=library__pb2.ListAvailabilityResponse.FromString,
+                _registered_method=True)
+        self.ListAuthorAvailability = channel.unary_unary(
+                '/library.LibraryService/ListAuthorAvailability',
+                request_serializer=library__pb2.ListAvailabilityRequest.SerializeToString,
+                response_deserializer=library__pb2.ListAvailabilityResponse.FromString,
+                _registered_method=True)
 
 
 class LibraryServiceServicer(object):
@@ -171,6 +231,12 @@ class LibraryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def AddBookCopies(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def ListBookCopies(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -221,6 +287,76 @@ class LibraryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def BatchBorrow(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchReturn(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetBooks(self, request, context):
+        """Batch lookups (one IN query per entity type)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetMembers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetCopies(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamBooks(self, request, context):
+        """Exports (server-streaming, server-side cursor)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamMembers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamLoans(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetLibraryStats(self, request, context):
+        """Dashboard
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListGenreAvailability(self, request, context):
+        """Reporting (materialized views, refreshed periodically)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListAuthorAvailability(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_LibraryServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -264,6 +400,11 @@ def add_LibraryServiceServicer_to_server(servicer, server):
                     request_deserializer=library__pb2.AddBookCopyRequest.FromString,
                     response_serializer=library__pb2.BookCopy.SerializeToString,
             ),
+            'AddBookCopies': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddBookCopies,
+                    request_deserializer=library__pb2.AddBookCopiesRequest.FromString,
+                    response_serializer=library__pb2.AddBookCopiesResponse.SerializeToString,
+            ),
             'ListBookCopies': grpc.unary_unary_rpc_method_handler(
                     servicer.ListBookCopies,
                     request_deserializer=library__pb2.ListBookCopiesRequest.FromString,
@@ -304,6 +445,61 @@ def add_LibraryServiceServicer_to_server(servicer, server):
                     request_deserializer=library__pb2.ListAllLoansRequest.FromString,
                     response_serializer=library__pb2.ListLoansResponse.SerializeToString,
             ),
+            'BatchBorrow': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchBorrow,
+                    request_deserializer=library__pb2.BatchBorrowRequest.FromString,
+                    response_serializer=library__pb2.BatchLoansResponse.SerializeToString,
+            ),
+            'BatchReturn': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchReturn,
+                    request_deserializer=library__pb2.BatchReturnRequest.FromString,
+                    response_serializer=library__pb2.BatchLoansResponse.SerializeToString,
+            ),
+            'BatchGetBooks': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetBooks,
+                    request_deserializer=library__pb2.BatchGetBooksRequest.FromString,
+                    response_serializer=library__pb2.BatchGetBooksResponse.SerializeToString,
+            ),
+            'BatchGetMembers': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetMembers,
+                    request_deserializer=library__pb2.BatchGetMembersRequest.FromString,
+                    response_serializer=library__pb2.BatchGetMembersResponse.SerializeToString,
+            ),
+            'BatchGetCopies': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetCopies,
+                    request_deserializer=library__pb2.BatchGetCopiesRequest.FromString,
+                    response_serializer=library__pb2.BatchGetCopiesResponse.SerializeToString,
+            ),
+            'StreamBooks': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamBooks,
+                    request_deserializer=library__pb2.StreamBooksRequest.FromString,
+                    response_serializer=library__pb2.Book.SerializeToString,
+            ),
+            'StreamMembers': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamMembers,
+                    request_deserializer=library__pb2.StreamMembersRequest.FromString,
+                    response_serializer=library__pb2.Member.SerializeToString,
+            ),
+            'StreamLoans': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamLoans,
+                    request_deserializer=library__pb2.StreamLoansRequest.FromString,
+                    response_serializer=library__pb2.Loan.SerializeToString,
+            ),
+            'GetLibraryStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetLibraryStats,
+                    request_deserializer=library__pb2.GetLibraryStatsRequest.FromString,
+                    response_serializer=library__pb2.LibraryStats.SerializeToString,
+            ),
+            'ListGenreAvailability': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListGenreAvailability,
+                    request_deserializer=library__pb2.ListAvailabilityRequest.FromString,
+                    response_serializer=library__pb2.ListAvailabilityResponse.SerializeToString,
+            ),
+            'ListAuthorAvailability': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListAuthorAvailability,
+                    request_deserializer=library__pb2.ListAvailabilityRequest.FromString,
+                    response_serializer=library__pb2.ListAvailabilityResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'library.LibraryService', rpc_method_handlers)
@@ -531,6 +727,33 @@ class LibraryService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def AddBookCopies(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/AddBookCopies',
+            library__pb2.AddBookCopiesRequest.SerializeToString,
+            library__pb2.AddBookCopiesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ListBookCopies(request,
             target,
@@ -746,3 +969,300 @@ class LibraryService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def BatchBorrow(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/BatchBorrow',
+            library__pb2.BatchBorrowRequest.SerializeToString,
+            library__pb2.BatchLoansResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchReturn(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/BatchReturn',
+            library__pb2.BatchReturnRequest.SerializeToString,
+            library__pb2.BatchLoansResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchGetBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/BatchGetBooks',
+            library__pb2.BatchGetBooksRequest.SerializeToString,
+            library__pb2.BatchGetBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchGetMembers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/BatchGetMembers',
+            library__pb2.BatchGetMembersRequest.SerializeToString,
+            library__pb2.BatchGetMembersResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def BatchGetCopies(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/BatchGetCopies',
+            library__pb2.BatchGetCopiesRequest.SerializeToString,
+            library__pb2.BatchGetCopiesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/StreamBooks',
+            library__pb2.StreamBooksRequest.SerializeToString,
+            library__pb2.Book.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamMembers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/StreamMembers',
+            library__pb2.StreamMembersRequest.SerializeToString,
+            library__pb2.Member.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamLoans(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.LibraryService/StreamLoans',
+            library__pb2.StreamLoansRequest.SerializeToString,
+            library__pb2.Loan.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetLibraryStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/GetLibraryStats',
+            library__pb2.GetLibraryStatsRequest.SerializeToString,
+            library__pb2.LibraryStats.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListGenreAvailability(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ListGenreAvailability',
+            library__pb2.ListAvailabilityRequest.SerializeToString,
+            library__pb2.ListAvailabilityResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ListAuthorAvailability(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.LibraryService/ListAuthorAvailability',
+            library__pb2.ListAvailabilityRequest.SerializeToString,
+            library__pb2.ListAvailabilityResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -1,7 +1,7 @@
 import sys
 import os
+import threading
 import grpc
-from concurrent import futures
 import time
 
 from backend.generated import library_pb2_grpc
@@ -10,22 +10,72 @@ from backend.core.database import init_db
 
 from backend.core.config import Config
 from backend.core.logger import logger
+from backend.core.metrics import start_metrics_server
 from backend.api.middleware import GlobalGrpcInterceptor
+from backend.core import admission, ratelimit, grpc_options
+from backend.core.scheduler import PeriodicTask, WriteVolumeTrigger
+from backend.core.utils import db_scope
+from backend.core.database.infrastructure.models import SOURCE_TABLES
+from backend.core.database.infrastructure.session import engine
+from backend.services import StatsService, AvailabilityService
+
+def start_stats_refresher():
+    config = Config.get_stats_config()
+    if config["refresh_seconds"] <= 0:
+        return None
+
+    def refresh():
+        with db_scope() as db:
+            # A snapshot another server process wrote within half an interval is kept
+            StatsService(db, config["window_days"], config["top_titles"]).get_stats(max_age=config["refresh_seconds"] / 2)
+
+    return PeriodicTask("stats-refresher", config["refresh_seconds"], refresh).start()
+
+def start_view_refresher():
+    config = Config.get_views_config()
+    if config["refresh_seconds"] <= 0:
+        return None
+    written = threading.Event()
+
+    def refresh():
+        # Scheduled runs skip views another process rebuilt within half an interval;
+        # write-triggered runs only skip those rebuilt in the last VIEWS_REFRESH_MIN_SECONDS
+        max_age = config["refresh_min_seconds"] if written.is_set() else config["refresh_seconds"] / 2
+        written.clear()
+        with db_scope() as db:
+            AvailabilityService(db).refresh_views(max_age=max_age)
+
+    task = PeriodicTask("view-refresher", config["refresh_seconds"], refresh)
+    if config["refresh_writes"] > 0:
+        def on_writes():
+            written.set()
+            task.trigger()
+        WriteVolumeTrigger(SOURCE_TABLES, config["refresh_writes"], on_writes).install(engine)
+    return task.start()
 
 def serve():
     logger.info("Initializing Database...")
     init_db()
     
     server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=Config.get_max_workers()),
-        interceptors=(GlobalGrpcInterceptor(),)
+        admission.QueueTimingExecutor(max_workers=Config.get_max_workers()),
+        interceptors=(GlobalGrpcInterceptor(admission.from_config(), ratelimit.from_config(),
+                                            grpc_options.compression_policy()),),
+        options=grpc_options.server_options(),
+        maximum_concurrent_rpcs=Config.get_max_concurrent_rpcs()
     )
     library_pb2_grpc.add_LibraryServiceServicer_to_server(LibraryService(), server)
     
     port = f'[::]:{Config.get_grpc_port()}'
     server.add_insecure_port(port)
-    logger.info(f"Server started on {port}")
+    logger.info("Server started on %s", port)
+    metrics_port = Config.get_metrics_port()
+    if metrics_port:
+        start_metrics_server(metrics_port)
+        logger.info("Metrics available on :%s/metrics", metrics_port)
     server.start()
+    start_stats_refresher()
+    start_view_refresher()
     try:
         while True:
             time.sleep(86400)
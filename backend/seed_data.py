@@ -7,6 +7,7 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.generated import library_pb2, library_pb2_grpc
+from backend.core.grpc_options import create_channel
 
 def load_json(filename):
     data_path = os.path.join(os.path.dirname(__file__), 'data', filename)
@@ -21,7 +22,7 @@ def seed():
     target = f"{grpc_host}:{grpc_port}"
     
     print(f"Connecting to Backend at {target}...")
-    channel = grpc.insecure_channel(target)
+    channel = create_channel(target)
     stub = library_pb2_grpc.LibraryServiceStub(channel)
 
     try:
@@ -30,7 +31,7 @@ def seed():
         genres_data = load_json('genres.json')
         genre_map = {}
         for name in genres_data:
-            g = stub.CreateGenre(library_pb2.CreateGenreRequest(name=name))
+            g = stub.CreateGenre(library_pb2.CreateGenreRequest(name=name, upsert=True))
             genre_map[name] = g.id
             print(f"  - Created/Found Genre: {name}")
 
@@ -41,7 +42,7 @@ def seed():
         for item in authors_data:
             name = item['name']
             bio = item.get('bio', '')
-            a = stub.CreateAuthor(library_pb2.CreateAuthorRequest(name=name, bio=bio))
+            a = stub.CreateAuthor(library_pb2.CreateAuthorRequest(name=name, bio=bio, upsert=True))
             author_map[name] = a.id
             print(f"  - Created/Found Author: {name}")
 
@@ -66,8 +67,7 @@ def seed():
                     isbn=isbn
                 ))
                 print(f"  - Created Book: {title}")
-                for _ in range(copy_count):
-                    stub.AddBookCopy(library_pb2.AddBookCopyRequest(book_id=b.id))
+                stub.AddBookCopies(library_pb2.AddBookCopiesRequest(book_id=b.id, count=copy_count))
                 print(f"    - Added {copy_count} physical copies")
             except grpc.RpcError as e:
                 if e.code() == grpc.StatusCode.ALREADY_EXISTS:
@@ -81,14 +81,8 @@ def seed():
         for item in members_data:
             name = item['name']
             email = item['email']
-            try:
-                stub.CreateMember(library_pb2.CreateMemberRequest(name=name, email=email))
-                print(f"  - Created Member: {name}")
-            except grpc.RpcError as e:
-                if e.code() == grpc.StatusCode.ALREADY_EXISTS:
-                    print(f"  - Skipping Member: {name} (Already exists)")
-                else:
-                    raise e
+            stub.CreateMember(library_pb2.CreateMemberRequest(name=name, email=email, upsert=True))
+            print(f"  - Created/Found Member: {name}")
 
         print("\nSeeding Complete! The application is ready with a clean, unique dataset.")
 
@@ -3,3 +3,5 @@ from .book_service import BookService
 from .genre_service import GenreService
 from .member_service import MemberService
 from .loan_service import LoanService
+from .stats_service import StatsService
+from .availability_service import AvailabilityService
@@ -0,0 +1,40 @@
+import time
+from typing import List
+from sqlalchemy.orm import Session
+from backend.core.constants import DBTables
+from backend.core.database import ViewRepository
+from backend.core.utils import build_paginated_response
+from backend.core.tracing import traced
+
+@traced
+class AvailabilityService:
+    """
+    Copy availability per genre and per author, read from the managed
+    materialized views. Every response carries the view's refresh time so
+    callers can tell how stale the numbers are.
+    """
+    def __init__(self, session: Session):
+        self.session = session
+        self.repo = ViewRepository(session)
+
+    def list_by_genre(self, page: int = 1, limit: int = 10) -> dict:
+        return self._list(DBTables.GENRE_AVAILABILITY, page, limit)
+
+    def list_by_author(self, page: int = 1, limit: int = 10) -> dict:
+        return self._list(DBTables.AUTHOR_AVAILABILITY, page, limit)
+
+    def _list(self, view: str, page: int, limit: int) -> dict:
+        rows, total_count = self.repo.paginated_list(view, page, limit)
+        response = build_paginated_response(rows, total_count, limit, "rows")
+        response["refreshed_at"] = self.repo.refreshed_at(view)
+        return response
+
+    def refresh_views(self, max_age: float = 0) -> List[str]:
+        """Rebuilds the views last refreshed at least `max_age` seconds ago and returns their names."""
+        now = time.time()
+        refreshed = self.repo.refresh_times()
+        stale = [name for name in (DBTables.GENRE_AVAILABILITY, DBTables.AUTHOR_AVAILABILITY)
+                 if now - refreshed.get(name, 0) >= max_age]
+        if stale:
+            self.repo.refresh(stale, now)
+        return stale
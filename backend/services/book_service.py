@@ -1,12 +1,14 @@
-from typing import List
+from typing import Iterator, List, Optional, Set
 from sqlalchemy.orm import Session
-from backend.core.database import BookRepository, GenreRepository, BookMetadataModel, BookCopyModel
+from backend.core.database import BookRepository, GenreRepository, BookMetadataModel, BookCopyModel, get_loaders
 from backend.core.exceptions import ValidationError, ConflictError, EntityNotFoundError
 from backend.core.logger import logger
 from backend.core.constants import Limits
 from backend.core.messages import ErrorMessages
 from backend.core.utils import build_paginated_response
+from backend.core.tracing import traced
 
+@traced
 class BookService:
     def __init__(self, session: Session):
         self.session = session
@@ -14,7 +16,7 @@ class BookService:
         self.genre_repo = GenreRepository(session)
 
     def create_book(self, title: str, isbn: str, author_id: str = None, genre_ids: List[str] = None, initial_copies: int = 0) -> BookMetadataModel:
-        logger.info(f"Creating book: {title}, ISBN: {isbn}, Initial Copies: {initial_copies}")
+        logger.info("Creating book: %s, ISBN: %s, Initial Copies: %s", title, isbn, initial_copies)
         if not title or not title.strip():
             raise ValidationError(ErrorMessages.BOOK_TITLE_REQUIRED)
         if len(title) > Limits.BOOK_TITLE_MAX:
@@ -39,22 +41,29 @@ class BookService:
             book.genres = genres
             
         self.repo.add(book)
-        
-        for _ in range(initial_copies):
-            copy = BookCopyModel()
-            book.copies.append(copy)
-            
-            book.copies.append(copy)
-            
         self.session.flush()
-        self.session.refresh(book)
-        logger.info(f"Book created. Total copies in model: {len(book.copies)}")
+        if initial_copies:
+            self.repo.add_copies(book.id, initial_copies)
+            # Copies were inserted around the unit of work; load them on first access
+            self.session.expire(book, ["copies"])
+        logger.info("Book created with %d copies", initial_copies)
         return book
 
-    def list_books(self, page: int = 1, limit: int = 10) -> dict:
-        items, total_count = self.repo.paginated_list(page, limit)
+    def list_books(self, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> dict:
+        items, total_count = self.repo.paginated_list(page, limit, fields)
         return build_paginated_response(items, total_count, limit, "books")
 
+    def batch_get_books(self, ids: List[str]) -> List[BookMetadataModel]:
+        """Resolves ids in request order (None for unknown ids) with one batched lookup."""
+        if len(ids) > Limits.BATCH_GET_MAX:
+            raise ValidationError(ErrorMessages.BATCH_TOO_LARGE.format(max=Limits.BATCH_GET_MAX))
+        return get_loaders(self.session).books.load_many(ids)
+
+    def stream_books(self, chunk_size: int) -> Iterator[BookMetadataModel]:
+        if chunk_size <= 0:
+            raise ValidationError(ErrorMessages.STREAM_CHUNK_SIZE_INVALID)
+        return self.repo.stream_all(min(chunk_size, Limits.STREAM_CHUNK_SIZE_MAX))
+
     def update_book(self, book_id: str, title: str = None, isbn: str = None, author_id: str = None, genre_ids: List[str] = None) -> BookMetadataModel:
         book = self.repo.get_by_id(book_id)
         if not book:
@@ -70,10 +79,8 @@ class BookService:
         if genre_ids is not None:
             genres = self.genre_repo.list_by_ids(genre_ids)
             book.genres = genres
-            
-            
+
         self.session.flush()
-        self.session.refresh(book)
         return book
 
     def add_copy(self, book_id: str) -> BookCopyModel:
@@ -83,11 +90,21 @@ class BookService:
         
         copy = BookCopyModel(book_metadata_id=book_id)
         self.repo.add_copy(copy)
-        self.repo.add_copy(copy)
         self.session.flush()
-        self.session.refresh(copy)
         return copy
 
-    def list_copies(self, book_id: str, page: int = 1, limit: int = 10) -> dict:
-        items, total_count = self.repo.paginated_list_copies(book_id, page, limit)
+    def add_copies(self, book_id: str, count: int) -> List[str]:
+        if not 1 <= count <= Limits.BOOK_COPIES_BATCH_MAX:
+            raise ValidationError(ErrorMessages.BOOK_COPIES_COUNT_INVALID.format(max=Limits.BOOK_COPIES_BATCH_MAX))
+        if not self.repo.get_by_id(book_id):
+            raise EntityNotFoundError(ErrorMessages.BOOK_NOT_FOUND)
+        return self.repo.add_copies(book_id, count)
+
+    def batch_get_copies(self, ids: List[str]) -> List[BookCopyModel]:
+        if len(ids) > Limits.BATCH_GET_MAX:
+            raise ValidationError(ErrorMessages.BATCH_TOO_LARGE.format(max=Limits.BATCH_GET_MAX))
+        return get_loaders(self.session).copies.load_many(ids)
+
+    def list_copies(self, book_id: str, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> dict:
+        items, total_count = self.repo.paginated_list_copies(book_id, page, limit, fields)
         return build_paginated_response(items, total_count, limit, "copies")
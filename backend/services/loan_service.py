@@ -1,10 +1,15 @@
-from typing import List
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime
-from backend.core.database import LoanRepository, BookRepository, MemberRepository, LoanModel
+from backend.core.database import LoanRepository, BookRepository, MemberRepository, StatsRepository, LoanModel
 from backend.services.validators import ILoanValidator
-from backend.core.exceptions import ValidationError, EntityNotFoundError
+from backend.core.exceptions import AppError, AbortedError, ValidationError, EntityNotFoundError
+from backend.core.messages import ErrorMessages
+from backend.core.constants import Limits
+from backend.core.tracing import traced
 
+@traced
 class LoanService:
     def __init__(self, session: Session, validators: List[ILoanValidator]):
         self.session = session
@@ -12,6 +17,7 @@ class LoanService:
         self.loan_repo = LoanRepository(session)
         self.book_repo = BookRepository(session)
         self.member_repo = MemberRepository(session)
+        self.stats_repo = StatsRepository(session)
 
     def borrow_book(self, book_id: str, member_id: str, copy_id: str = None) -> LoanModel:
         # Run all validators
@@ -37,9 +43,9 @@ class LoanService:
         copy.status = "Borrowed"
         
         self.loan_repo.add(loan)
+        self.stats_repo.record_loans(loan.borrowed_at.date(), {copy.book_metadata_id: 1})
         
         self.session.flush()
-        self.session.refresh(loan)
         return loan
 
     def return_book(self, loan_id: str) -> LoanModel:
@@ -65,8 +71,141 @@ class LoanService:
         loan.returned_at = datetime.utcnow() 
         return loan
 
-    def list_member_loans(self, member_id: str = None, page: int = 1, limit: int = 10) -> dict:
-        items, total_count = self.loan_repo.paginated_list_by_member(member_id, page, limit)
+    def batch_borrow(self, member_id: str, items: List[Tuple[str, Optional[str]]], all_or_nothing: bool = False) -> List[dict]:
+        """
+        Borrows a basket of (book_id, copy_id) items for one member and returns
+        one {"loan", "book_title", "error"} dict per item, in request order.
+
+        The member is checked once. Copies are picked with one SELECT and
+        claimed with one UPDATE; items whose pick was claimed by a concurrent
+        checkout get one more round. The loans go in with one batched INSERT
+        and the circulation counters with one upsert.
+        With all_or_nothing, a failed item releases the claimed copies and
+        the other items come back ABORTED, with no loans written.
+        """
+        if not 1 <= len(items) <= Limits.BATCH_LOAN_MAX:
+            raise ValidationError(ErrorMessages.BATCH_LOAN_SIZE_INVALID.format(max=Limits.BATCH_LOAN_MAX))
+        if not self.member_repo.get_by_id(member_id):
+            raise EntityNotFoundError(ErrorMessages.MEMBER_NOT_FOUND)
+
+        errors: Dict[int, AppError] = {}
+        book_ids = [book_id for book_id, _ in items]
+        requested: Dict[int, str] = {}
+        for i, (_, copy_id) in enumerate(items):
+            if copy_id and copy_id in requested.values():
+                errors[i] = ValidationError(ErrorMessages.BATCH_ITEM_DUPLICATE)
+            elif copy_id:
+                requested[i] = copy_id
+        if requested:
+            states = {row.id: row for row in self.book_repo.list_copy_states(list(requested.values()))}
+            for i, copy_id in requested.items():
+                state = states.get(copy_id)
+                if state is None or not state.is_available:
+                    errors[i] = ValidationError(ErrorMessages.COPY_NOT_AVAILABLE)
+                else:
+                    # The scanned copy decides which book is lent
+                    book_ids[i] = state.book_metadata_id
+
+        wanted_books = {book_ids[i] for i in range(len(items)) if i not in errors}
+        books = self.book_repo.list_by_ids(list(wanted_books), fields={"title"}) if wanted_books else []
+        titles = {book.id: book.title for book in books}
+        for i in range(len(items)):
+            if i not in errors and book_ids[i] not in titles:
+                errors[i] = EntityNotFoundError(ErrorMessages.BOOK_NOT_FOUND)
+
+        claimed: Dict[int, str] = {}
+        pending = [i for i in range(len(items)) if i not in errors]
+        for _ in range(2):
+            if not pending or (all_or_nothing and errors):
+                break
+            picks = {i: requested[i] for i in pending if i in requested}
+            wanted = Counter(book_ids[i] for i in pending if i not in requested)
+            if wanted:
+                # Never auto-pick a copy another item scanned or already holds
+                available = self.book_repo.pick_available_copies(
+                    wanted, exclude=set(requested.values()) | set(claimed.values()))
+                for i in pending:
+                    if i not in requested and available.get(book_ids[i]):
+                        picks[i] = available[book_ids[i]].pop()
+            won = self.book_repo.claim_copies(list(picks.values())) if picks else set()
+            for i in pending:
+                if picks.get(i) in won:
+                    # Each claimed copy goes to exactly one item
+                    claimed[i] = picks[i]
+                    won.discard(picks[i])
+                elif i in requested:
+                    errors[i] = ValidationError(ErrorMessages.COPY_NOT_AVAILABLE)
+                elif i not in picks:
+                    errors[i] = ValidationError(ErrorMessages.BOOK_NO_COPIES_AVAILABLE)
+            pending = [i for i in pending if i not in claimed and i not in errors]
+        for i in pending:
+            errors[i] = ValidationError(ErrorMessages.BOOK_NO_COPIES_AVAILABLE)
+
+        if all_or_nothing and errors and claimed:
+            self.book_repo.release_copies(list(claimed.values()))
+            claimed = {}
+
+        borrowed_at = datetime.utcnow()
+        loans = {i: LoanModel(copy_id=copy_id, member_id=member_id, borrowed_at=borrowed_at) for i, copy_id in claimed.items()}
+        if loans:
+            self.loan_repo.add_all(list(loans.values()))
+            self.stats_repo.record_loans(borrowed_at.date(), Counter(book_ids[i] for i in loans))
+            self.session.flush()
+        return [{
+            "loan": loans.get(i),
+            "book_title": titles.get(book_ids[i], ""),
+            "error": errors.get(i) or (AbortedError(ErrorMessages.BATCH_ITEM_ABORTED) if i not in loans else None),
+        } for i in range(len(items))]
+
+    def batch_return(self, loan_ids: List[str], all_or_nothing: bool = False) -> List[dict]:
+        """
+        Returns a batch of loans; one {"loan", "book_title", "error"} dict per
+        id, in request order. The loans are deleted with one DELETE ...
+        RETURNING and their copies released with one UPDATE, so a loan returned
+        concurrently elsewhere reports NOT_FOUND here. With all_or_nothing the
+        loans are row-locked first and nothing is written unless all exist.
+        """
+        if not 1 <= len(loan_ids) <= Limits.BATCH_LOAN_MAX:
+            raise ValidationError(ErrorMessages.BATCH_LOAN_SIZE_INVALID.format(max=Limits.BATCH_LOAN_MAX))
+
+        errors: Dict[int, AppError] = {}
+        first: Dict[str, int] = {}
+        for i, loan_id in enumerate(loan_ids):
+            if loan_id in first:
+                errors[i] = ValidationError(ErrorMessages.BATCH_ITEM_DUPLICATE)
+            else:
+                first[loan_id] = i
+        if all_or_nothing:
+            if not errors:
+                existing = self.loan_repo.lock_existing(list(first))
+                errors = {i: EntityNotFoundError(ErrorMessages.LOAN_NOT_FOUND) for loan_id, i in first.items() if loan_id not in existing}
+            if errors:
+                return [{"loan": None, "book_title": "", "error": errors.get(i) or AbortedError(ErrorMessages.BATCH_ITEM_ABORTED)}
+                        for i in range(len(loan_ids))]
+
+        deleted = {row.id: row for row in self.loan_repo.delete_many(list(first))}
+        titles = {}
+        if deleted:
+            copy_ids = [row.copy_id for row in deleted.values()]
+            self.book_repo.release_copies(copy_ids)
+            titles = self.book_repo.titles_by_copy_ids(copy_ids)
+
+        returned_at = datetime.utcnow()
+        results = []
+        for i, loan_id in enumerate(loan_ids):
+            row = deleted.get(loan_id) if i not in errors else None
+            if row is None:
+                results.append({"loan": None, "book_title": "",
+                                "error": errors.get(i) or EntityNotFoundError(ErrorMessages.LOAN_NOT_FOUND)})
+                continue
+            # The row is gone; a transient model carries it to the response
+            loan = LoanModel(id=row.id, copy_id=row.copy_id, member_id=row.member_id,
+                             borrowed_at=row.borrowed_at, returned_at=returned_at)
+            results.append({"loan": loan, "book_title": titles.get(row.copy_id, "Unknown"), "error": None})
+        return results
+
+    def list_member_loans(self, member_id: str = None, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> dict:
+        items, total_count = self.loan_repo.paginated_list_by_member(member_id, page, limit, fields)
         total_pages = (total_count + limit - 1) // limit if limit > 0 else 0
         return {
             "loans": items,
@@ -74,6 +213,12 @@ class LoanService:
             "total_pages": total_pages
         }
 
-    def list_all_loans(self, page: int = 1, limit: int = 10) -> dict:
+    def list_all_loans(self, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> dict:
         """List all loans in the system (no member filter)"""
-        return self.list_member_loans(member_id=None, page=page, limit=limit)
+        return self.list_member_loans(member_id=None, page=page, limit=limit, fields=fields)
+
+    def stream_loans(self, member_id: str = None, chunk_size: int = 500) -> Iterator[LoanModel]:
+        """Stream loans through a server-side cursor, newest first"""
+        if chunk_size <= 0:
+            raise ValidationError(ErrorMessages.STREAM_CHUNK_SIZE_INVALID)
+        return self.loan_repo.stream_by_member(member_id, min(chunk_size, Limits.STREAM_CHUNK_SIZE_MAX))
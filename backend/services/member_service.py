@@ -1,36 +1,52 @@
 import re
+from typing import Iterator, List, Optional, Set
 from sqlalchemy.orm import Session
-from backend.core.database import MemberRepository, MemberModel
+from backend.core.database import MemberRepository, MemberModel, get_loaders
 from backend.core.exceptions import ValidationError, ConflictError, EntityNotFoundError
 from backend.core.constants import Limits
 from backend.core.messages import ErrorMessages
 from backend.core.utils import build_paginated_response
+from backend.core.tracing import traced
 
+@traced
 class MemberService:
     def __init__(self, session: Session):
         self.session = session
         self.repo = MemberRepository(session)
 
-    def create_member(self, name: str, email: str) -> MemberModel:
+    def create_member(self, name: str, email: str, upsert: bool = False) -> MemberModel:
         if not name or not name.strip():
             raise ValidationError(ErrorMessages.MEMBER_NAME_REQUIRED)
         if len(name) > Limits.MEMBER_NAME_MAX:
             raise ValidationError(ErrorMessages.MEMBER_NAME_TOO_LONG.format(max=Limits.MEMBER_NAME_MAX))
         if not email or not re.match(r"[^@]+@[^@]+\.[^@]+", email):
             raise ValidationError(ErrorMessages.MEMBER_EMAIL_INVALID)
+        if upsert:
+            # An existing member with this email is returned unchanged
+            return self.repo.get_or_create(name, email)
         # Validation handled by Repository/DB Constraint
         # if self.repo.get_by_email(email): ...
             
         member = MemberModel(name=name, email=email)
         self.repo.add(member)
         self.session.flush()
-        self.session.refresh(member)
         return member
 
-    def list_members(self, page: int = 1, limit: int = 10) -> dict:
-        items, total_count = self.repo.paginated_list(page, limit)
+    def list_members(self, page: int = 1, limit: int = 10, fields: Optional[Set[str]] = None) -> dict:
+        items, total_count = self.repo.paginated_list(page, limit, fields)
         return build_paginated_response(items, total_count, limit, "members")
 
+    def batch_get_members(self, ids: List[str]) -> List[MemberModel]:
+        """Resolves ids in request order (None for unknown ids) with one batched lookup."""
+        if len(ids) > Limits.BATCH_GET_MAX:
+            raise ValidationError(ErrorMessages.BATCH_TOO_LARGE.format(max=Limits.BATCH_GET_MAX))
+        return get_loaders(self.session).members.load_many(ids)
+
+    def stream_members(self, chunk_size: int) -> Iterator[MemberModel]:
+        if chunk_size <= 0:
+            raise ValidationError(ErrorMessages.STREAM_CHUNK_SIZE_INVALID)
+        return self.repo.stream_all(min(chunk_size, Limits.STREAM_CHUNK_SIZE_MAX))
+
     def update_member(self, member_id: str, name: str = None, email: str = None) -> MemberModel:
         member = self.repo.get_by_id(member_id)
         if not member:
@@ -43,5 +59,4 @@ class MemberService:
             member.email = email
             
         self.session.flush()
-        self.session.refresh(member)
         return member
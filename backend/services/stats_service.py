@@ -0,0 +1,35 @@
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from backend.core.database import StatsRepository
+from backend.core.tracing import traced
+
+@traced
+class StatsService:
+    """
+    Library-wide totals for the dashboard. Reads come from a one-row snapshot
+    (a primary-key lookup, whatever the catalog size); the snapshot is
+    recomputed by the refresher thread, or inline when it is missing or older
+    than the caller accepts.
+    """
+    def __init__(self, session: Session, window_days: int = 30, top_titles: int = 10):
+        self.session = session
+        self.window_days = window_days
+        self.top_titles = top_titles
+        self.repo = StatsRepository(session)
+
+    def refresh(self) -> dict:
+        since = datetime.utcnow().date() - timedelta(days=self.window_days - 1)
+        stats = self.repo.compute(since, self.top_titles)
+        refreshed_at = time.time()
+        self.repo.save_snapshot(stats, refreshed_at)
+        return {**stats, "refreshed_at": refreshed_at}
+
+    def get_stats(self, max_age: float) -> dict:
+        snapshot = self.repo.get_snapshot()
+        if snapshot is None or time.time() - snapshot.refreshed_at > max_age:
+            return self.refresh()
+        return {column: getattr(snapshot, column) for column in (
+            "total_books", "total_copies", "available_copies", "active_loans", "total_members",
+            "total_authors", "total_genres", "top_titles", "loans_per_day", "refreshed_at"
+        )}
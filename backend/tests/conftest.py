@@ -1,5 +1,6 @@
 import pytest
 import os
+import grpc
 from unittest.mock import MagicMock
 
 # Set environment variables for testing before importing application code
@@ -30,3 +31,59 @@ def db_session():
 @pytest.fixture
 def mock_repo():
     return MagicMock()
+
+# What a real server's context.time_remaining() reports for a call sent without a deadline
+NO_DEADLINE = float(2**63)
+
+@pytest.fixture
+def grpc_context():
+    """
+    Builds MagicMock servicer contexts shaped like the ones a real server passes in:
+
+        context = grpc_context([("x-request-id", "r1")], time_remaining=5.0)
+    """
+    def make(metadata=(), time_remaining=NO_DEADLINE):
+        context = MagicMock()
+        context.invocation_metadata.return_value = tuple(metadata)
+        context.time_remaining.return_value = time_remaining
+        return context
+    return make
+
+@pytest.fixture
+def invoke_unary(grpc_context):
+    """
+    Runs `behavior` as a unary RPC through an interceptor (a default
+    GlobalGrpcInterceptor unless one is given) and returns (response, context):
+
+        response, context = invoke_unary(behavior, [("x-client-id", "kiosk-1")], method="/svc/ListBooks")
+    """
+    from backend.api.middleware import GlobalGrpcInterceptor
+
+    def invoke(behavior, metadata=(), method="/library.LibraryService/ListBooks", interceptor=None, **context_options):
+        handler = grpc.unary_unary_rpc_method_handler(behavior)
+        context = grpc_context(metadata, **context_options)
+        intercepted = (interceptor or GlobalGrpcInterceptor()).intercept_service(lambda d: handler, MagicMock(method=method))
+        return intercepted.unary_unary(None, context), context
+    return invoke
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fails the test when the block runs more SQL statements than allowed:
+
+        with assert_max_queries(2):
+            controller.ListBooks(request, context)
+    """
+    from contextlib import contextmanager
+    from backend.core.database import diagnostics
+
+    diagnostics.install()
+
+    @contextmanager
+    def check(limit: int):
+        with diagnostics.record() as recorder:
+            yield recorder
+        assert recorder.count <= limit, f"Expected at most {limit} SQL statements, got {recorder.report()}"
+
+    yield check
+    diagnostics.uninstall()
@@ -73,3 +73,288 @@ def test_exception_mapping(db_session, monkeypatch, context):
     with pytest.raises(ValidationError):
         req = library_pb2.CreateBookRequest(title="", isbn="123")
         service.CreateBook(req, context)
+
+def test_stream_exports(db_session, monkeypatch, context):
+    from contextlib import contextmanager
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+
+    service = LibraryService()
+    for i in range(5):
+        service.CreateBook(library_pb2.CreateBookRequest(
+            title=f"Export Book {i}", isbn=f"978000000000{i}", initial_copies=1
+        ), context)
+    member = service.CreateMember(library_pb2.CreateMemberRequest(name="Exporter", email="export@test.com"), context)
+    book_id = service.ListBooks(library_pb2.ListBooksRequest(page=1, limit=1), context).books[0].id
+    service.BorrowBook(library_pb2.BorrowBookRequest(book_id=book_id, member_id=member.id), context)
+
+    # Chunk size smaller than the row count forces several cursor fetches
+    books = list(service.StreamBooks(library_pb2.StreamBooksRequest(chunk_size=2), context))
+    assert len(books) == 5
+    assert sum(b.available_copies for b in books) == 4
+
+    members = list(service.StreamMembers(library_pb2.StreamMembersRequest(), context))
+    assert [m.email for m in members] == ["export@test.com"]
+
+    loans = list(service.StreamLoans(library_pb2.StreamLoansRequest(member_id=member.id, chunk_size=1), context))
+    assert len(loans) == 1
+    assert loans[0].member_name == "Exporter"
+
+def test_list_books_field_mask(db_session, monkeypatch, context):
+    from contextlib import contextmanager
+    from sqlalchemy import event
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+
+    service = LibraryService()
+    author = service.CreateAuthor(library_pb2.CreateAuthorRequest(name="Masked Author"), context)
+    for i in range(3):
+        service.CreateBook(library_pb2.CreateBookRequest(
+            title=f"Masked {i}", isbn=f"978111111111{i}", author_id=author.id, initial_copies=2
+        ), context)
+    db_session.expire_all()
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        request = library_pb2.ListBooksRequest(page=1, limit=10)
+        request.field_mask.paths.extend(["id", "title"])
+        response = service.ListBooks(request, context)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(response.books) == 3
+    assert response.books[0].title.startswith("Masked")
+    assert not response.books[0].HasField("author")
+    assert response.books[0].total_copies == 0
+    # Count + page only: no author join, genre or copy loads
+    assert len(statements) == 2
+    assert "authors" not in " ".join(statements)
+
+def test_batch_get_and_loan_relations(db_session, monkeypatch, context):
+    from contextlib import contextmanager
+    from sqlalchemy import event
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+
+    service = LibraryService()
+    books = [service.CreateBook(library_pb2.CreateBookRequest(
+        title=f"Batch {i}", isbn=f"978222222222{i}", initial_copies=1
+    ), context) for i in range(3)]
+    members = [service.CreateMember(library_pb2.CreateMemberRequest(
+        name=f"Reader {i}", email=f"reader{i}@test.com"
+    ), context) for i in range(2)]
+    for i, book in enumerate(books):
+        service.BorrowBook(library_pb2.BorrowBookRequest(book_id=book.id, member_id=members[i % 2].id), context)
+
+    response = service.BatchGetBooks(library_pb2.BatchGetBooksRequest(ids=[books[2].id, "unknown", books[0].id]), context)
+    assert [b.title for b in response.books] == ["Batch 2", "Batch 0"]
+    assert list(response.missing_ids) == ["unknown"]
+
+    response = service.BatchGetMembers(library_pb2.BatchGetMembersRequest(ids=[m.id for m in members]), context)
+    assert len(response.members) == 2
+
+    # Fresh session state: loan relations resolve with one IN query per entity
+    db_session.expunge_all()
+    db_session.info.clear()
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        loans = service.ListAllLoans(library_pb2.ListAllLoansRequest(page=1, limit=10), context)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert sorted(l.book_title for l in loans.loans) == ["Batch 0", "Batch 1", "Batch 2"]
+    assert {l.member_name for l in loans.loans} == {"Reader 0", "Reader 1"}
+    # count + page + copies (with books) + members
+    assert len(statements) == 4
+
+def test_upsert_creates_return_existing_rows(db_session, monkeypatch, context, assert_max_queries):
+    from contextlib import contextmanager
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+
+    service = LibraryService()
+    author = service.CreateAuthor(library_pb2.CreateAuthorRequest(name="Ursula", bio="First", upsert=True), context)
+    genre = service.CreateGenre(library_pb2.CreateGenreRequest(name="Fantasy", upsert=True), context)
+    member = service.CreateMember(library_pb2.CreateMemberRequest(name="Ann", email="ann@test.com", upsert=True), context)
+
+    # Each repeat is a single INSERT ... ON CONFLICT returning the stored row unchanged
+    with assert_max_queries(1):
+        again = service.CreateAuthor(library_pb2.CreateAuthorRequest(name="Ursula", bio="Second", upsert=True), context)
+    assert (again.id, again.bio) == (author.id, "First")
+    with assert_max_queries(1):
+        assert service.CreateGenre(library_pb2.CreateGenreRequest(name="Fantasy", upsert=True), context).id == genre.id
+    with assert_max_queries(1):
+        again = service.CreateMember(library_pb2.CreateMemberRequest(name="Other", email="ann@test.com", upsert=True), context)
+    assert (again.id, again.name) == (member.id, "Ann")
+
+    # Without the flag a duplicate is still rejected
+    from backend.core.exceptions import ValidationError
+    with pytest.raises(ValidationError):
+        service.CreateAuthor(library_pb2.CreateAuthorRequest(name="Ursula"), context)
+
+def test_batch_borrow_and_return(db_session, monkeypatch, context, assert_max_queries):
+    from contextlib import contextmanager
+    from backend.core.database import BookCopyModel, LoanModel
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+
+    service = LibraryService()
+    two, one, spare = [service.CreateBook(library_pb2.CreateBookRequest(
+        title=title, isbn=f"97833333333{i:02d}", initial_copies=copies
+    ), context) for i, (title, copies) in enumerate([("Two", 2), ("One", 1), ("Spare", 1)])]
+    member = service.CreateMember(library_pb2.CreateMemberRequest(name="Desk", email="desk@test.com"), context)
+    Item = library_pb2.BatchBorrowItem
+
+    # Partial success: member check + titles + copy pick + claim + one loan INSERT + counter upsert
+    with assert_max_queries(6):
+        response = service.BatchBorrow(library_pb2.BatchBorrowRequest(member_id=member.id, items=[
+            Item(book_id=two.id), Item(book_id=two.id), Item(book_id=two.id), Item(book_id=one.id), Item(book_id="unknown")
+        ]), context)
+    assert response.succeeded == 3
+    assert [r.error_code for r in response.results] == ["", "", "INVALID_ARGUMENT", "", "NOT_FOUND"]
+    assert [r.loan.book_title for r in response.results[:2]] == ["Two", "Two"]
+    loans = [r.loan.id for r in response.results if r.loan.id]
+    assert len({r.loan.copy_id for r in response.results if r.loan.id}) == 3
+
+    # All or nothing: the claimed Spare copy is released when Two has none left
+    response = service.BatchBorrow(library_pb2.BatchBorrowRequest(member_id=member.id, all_or_nothing=True, items=[
+        Item(book_id=spare.id), Item(book_id=two.id)
+    ]), context)
+    assert response.succeeded == 0
+    assert [r.error_code for r in response.results] == ["ABORTED", "INVALID_ARGUMENT"]
+    assert db_session.query(BookCopyModel).filter_by(book_metadata_id=spare.id, is_available=True).count() == 1
+    assert db_session.query(LoanModel).count() == 3
+
+    response = service.BatchReturn(library_pb2.BatchReturnRequest(loan_ids=[loans[0], "missing", loans[0]]), context)
+    assert [r.error_code for r in response.results] == ["", "NOT_FOUND", "INVALID_ARGUMENT"]
+    assert response.results[0].loan.returned_at and response.results[0].loan.book_title == "Two"
+
+    response = service.BatchReturn(library_pb2.BatchReturnRequest(loan_ids=[loans[1], "missing"], all_or_nothing=True), context)
+    assert [r.error_code for r in response.results] == ["ABORTED", "NOT_FOUND"]
+    assert db_session.query(LoanModel).count() == 2
+
+    # Lock + DELETE ... RETURNING + copy release + titles
+    with assert_max_queries(4):
+        response = service.BatchReturn(library_pb2.BatchReturnRequest(loan_ids=loans[1:], all_or_nothing=True), context)
+    assert response.succeeded == 2
+    assert db_session.query(LoanModel).count() == 0
+    assert db_session.query(BookCopyModel).filter_by(is_available=False).count() == 0
+
+def test_batch_borrow_never_lends_a_scanned_copy_twice(db_session, monkeypatch, context):
+    from contextlib import contextmanager
+    from backend.core.database import LoanModel
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+
+    service = LibraryService()
+    book = service.CreateBook(library_pb2.CreateBookRequest(title="Single", isbn="9783333333399", initial_copies=1), context)
+    [copy] = service.ListBookCopies(library_pb2.ListBookCopiesRequest(book_id=book.id, page=1, limit=10), context).copies
+    member = service.CreateMember(library_pb2.CreateMemberRequest(name="Scan", email="scan@test.com"), context)
+    Item = library_pb2.BatchBorrowItem
+
+    # The scanned copy is the only one, so the second item must not be given it as well
+    response = service.BatchBorrow(library_pb2.BatchBorrowRequest(member_id=member.id, items=[
+        Item(book_id=book.id, copy_id=copy.id), Item(book_id=book.id)
+    ]), context)
+    assert [r.error_code for r in response.results] == ["", "INVALID_ARGUMENT"]
+    assert response.results[0].loan.copy_id == copy.id
+    assert db_session.query(LoanModel).count() == 1
+
+def test_library_stats_snapshot(db_session, monkeypatch, context, assert_max_queries):
+    from contextlib import contextmanager
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+
+    service = LibraryService()
+    popular, quiet = [service.CreateBook(library_pb2.CreateBookRequest(
+        title=title, isbn=f"97844444444{i:02d}", initial_copies=3
+    ), context) for i, title in enumerate(["Popular", "Quiet"])]
+    member = service.CreateMember(library_pb2.CreateMemberRequest(name="Stats", email="stats@test.com"), context)
+    loans = [service.BorrowBook(library_pb2.BorrowBookRequest(book_id=book.id, member_id=member.id), context)
+             for book in (popular, popular, quiet)]
+    # Returned loans are deleted but still count as circulation
+    service.ReturnBook(library_pb2.ReturnBookRequest(loan_id=loans[0].id), context)
+
+    # No snapshot yet: totals + top titles + loans per day, then the snapshot upsert
+    with assert_max_queries(5):
+        stats = service.GetLibraryStats(library_pb2.GetLibraryStatsRequest(), context)
+    assert (stats.total_books, stats.total_copies, stats.available_copies) == (2, 6, 4)
+    assert (stats.active_loans, stats.total_members) == (2, 1)
+    assert [(t.title, t.loans) for t in stats.top_titles] == [("Popular", 2), ("Quiet", 1)]
+    assert [d.loans for d in stats.loans_per_day] == [3]
+    assert stats.refreshed_at and stats.age_seconds < 5
+
+    # Later reads are one primary-key lookup of the snapshot, whatever the data size
+    service.BorrowBook(library_pb2.BorrowBookRequest(book_id=quiet.id, member_id=member.id), context)
+    with assert_max_queries(1):
+        again = service.GetLibraryStats(library_pb2.GetLibraryStatsRequest(), context)
+    assert again.active_loans == 2 and again.refreshed_at == stats.refreshed_at
+
+def test_availability_views(db_session, monkeypatch, context, assert_max_queries):
+    from contextlib import contextmanager
+    from backend.services import AvailabilityService
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+
+    service = LibraryService()
+    author = service.CreateAuthor(library_pb2.CreateAuthorRequest(name="Le Guin"), context)
+    fantasy, scifi = [service.CreateGenre(library_pb2.CreateGenreRequest(name=name), context) for name in ("Fantasy", "SciFi")]
+    book = service.CreateBook(library_pb2.CreateBookRequest(
+        title="Earthsea", isbn="9785555555501", author_id=author.id, genre_ids=[fantasy.id, scifi.id], initial_copies=2
+    ), context)
+    service.CreateBook(library_pb2.CreateBookRequest(
+        title="Dispossessed", isbn="9785555555502", author_id=author.id, genre_ids=[scifi.id], initial_copies=1
+    ), context)
+    member = service.CreateMember(library_pb2.CreateMemberRequest(name="V", email="v@test.com"), context)
+    service.BorrowBook(library_pb2.BorrowBookRequest(book_id=book.id, member_id=member.id), context)
+
+    # Views are snapshots: they were built (empty) with the schema
+    before = service.ListGenreAvailability(library_pb2.ListAvailabilityRequest(), context)
+    assert before.total_count == 0 and before.refreshed_at
+
+    assert sorted(AvailabilityService(db_session).refresh_views(max_age=0)) == ["author_availability", "genre_availability"]
+    # count + page + refresh time, no joins over the catalog
+    with assert_max_queries(3):
+        genres = service.ListGenreAvailability(library_pb2.ListAvailabilityRequest(page=1, limit=10), context)
+    assert [(r.name, r.books, r.copies, r.available_copies) for r in genres.rows] == [("Fantasy", 1, 2, 1), ("SciFi", 2, 3, 2)]
+    assert genres.age_seconds < 5 and genres.refreshed_at >= before.refreshed_at
+    authors = service.ListAuthorAvailability(library_pb2.ListAvailabilityRequest(), context)
+    assert [(r.id, r.books, r.copies, r.available_copies) for r in authors.rows] == [(author.id, 2, 3, 2)]
+
+    # A scheduled run leaves views younger than max_age alone
+    assert AvailabilityService(db_session).refresh_views(max_age=60) == []
+
+def test_availability_without_refresh_row_reports_never_refreshed(db_session, monkeypatch, context):
+    from contextlib import contextmanager
+    from backend.core.database.infrastructure.models.views import ViewRefreshModel
+    @contextmanager
+    def mock_db_scope():
+        yield db_session
+    monkeypatch.setattr("backend.api.service.db_scope", mock_db_scope)
+    db_session.query(ViewRefreshModel).delete()
+
+    response = LibraryService().ListGenreAvailability(library_pb2.ListAvailabilityRequest(), context)
+    assert response.total_count == 0
+    assert response.refreshed_at == "" and response.age_seconds == 0.0
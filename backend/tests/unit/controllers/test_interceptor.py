@@ -0,0 +1,42 @@
+import uuid
+import grpc
+from unittest.mock import MagicMock
+from backend.api.middleware import GlobalGrpcInterceptor
+from backend.core.context import request_id_ctx_var, metadata_value, new_request_id
+
+def test_handlers_are_wrapped_once_per_method(grpc_context):
+    interceptor = GlobalGrpcInterceptor()
+    handler = grpc.unary_unary_rpc_method_handler(lambda request, context: "ok")
+    details = MagicMock(method="/library.LibraryService/GetMember")
+
+    first = interceptor.intercept_service(lambda d: handler, details)
+    assert interceptor.intercept_service(lambda d: handler, details) is first
+
+    # A different servicer handler for the same method is wrapped afresh
+    other = grpc.unary_unary_rpc_method_handler(lambda request, context: "other")
+    rewrapped = interceptor.intercept_service(lambda d: other, details)
+    assert rewrapped is not first
+    assert rewrapped.unary_unary(None, grpc_context()) == "other"
+
+def test_request_id_comes_from_metadata_or_is_generated(grpc_context):
+    seen = []
+    handler = grpc.unary_unary_rpc_method_handler(lambda request, context: seen.append(request_id_ctx_var.get()))
+    wrapped = GlobalGrpcInterceptor().intercept_service(lambda d: handler, MagicMock(method="/svc/M"))
+
+    wrapped.unary_unary(None, grpc_context([("user-agent", "node"), ("x-request-id", "gw-1")]))
+    wrapped.unary_unary(None, grpc_context())
+    wrapped.unary_unary(None, grpc_context())
+
+    assert seen[0] == "gw-1"
+    assert seen[1] != seen[2]
+    uuid.UUID(seen[1])
+    assert request_id_ctx_var.get() is None
+
+def test_metadata_value_and_new_request_id():
+    metadata = (("a", "1"), ("x-request-id", "r"))
+    assert metadata_value(metadata, "x-request-id") == "r"
+    assert metadata_value(metadata, "traceparent") is None
+
+    ids = {new_request_id() for _ in range(1000)}
+    assert len(ids) == 1000
+    assert all(len(i) == 36 for i in ids)
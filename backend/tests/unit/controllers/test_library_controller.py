@@ -95,9 +95,10 @@ def test_create_member(MockMemberService, mock_db_scope, controller, mock_contex
     
     assert response.name == "N1"
 
+@patch('backend.api.service.get_loaders')
 @patch('backend.api.service.db_scope')
 @patch('backend.api.service.LoanService')
-def test_borrow_book(MockLoanService, mock_db_scope, controller, mock_context):
+def test_borrow_book(MockLoanService, mock_db_scope, mock_get_loaders, controller, mock_context):
     mock_db = MagicMock()
     mock_db_scope.return_value.__enter__.return_value = mock_db
     mock_service_instance = MockLoanService.return_value
@@ -110,8 +111,8 @@ def test_borrow_book(MockLoanService, mock_db_scope, controller, mock_context):
     mock_loan.borrowed_at = now
     
     mock_service_instance.borrow_book.return_value = mock_loan
-    # Mock DB query for copy title
-    mock_db.query.return_value.filter_by.return_value.first.return_value = None
+    # Mock loader lookup for copy title
+    mock_get_loaders.return_value.copies.load.return_value = None
     
     request = library_pb2.BorrowBookRequest(book_id="b1", member_id="m1")
     response = controller.BorrowBook(request, mock_context)
@@ -233,9 +234,10 @@ def test_update_member(MockMemberService, mock_db_scope, controller, mock_contex
     
     assert response.name == "New N"
 
+@patch('backend.api.service.get_loaders')
 @patch('backend.api.service.db_scope')
 @patch('backend.api.service.LoanService')
-def test_return_book(MockLoanService, mock_db_scope, controller, mock_context):
+def test_return_book(MockLoanService, mock_db_scope, mock_get_loaders, controller, mock_context):
     mock_db = MagicMock()
     mock_db_scope.return_value.__enter__.return_value = mock_db
     mock_service_instance = MockLoanService.return_value
@@ -249,7 +251,7 @@ def test_return_book(MockLoanService, mock_db_scope, controller, mock_context):
     mock_loan.returned_at = now
     
     mock_service_instance.return_book.return_value = mock_loan
-    mock_db.query.return_value.filter_by.return_value.first.return_value = None
+    mock_get_loaders.return_value.copies.load.return_value = None
     
     request = library_pb2.ReturnBookRequest(loan_id="l1")
     response = controller.ReturnBook(request, mock_context)
@@ -288,3 +290,115 @@ def test_list_member_loans(MockLoanService, mock_db_scope, controller, mock_cont
     
     assert len(response.loans) == 1
     assert response.loans[0].member_email == "e1"
+
+@patch('backend.api.service.db_scope')
+@patch('backend.api.service.BookService')
+def test_stream_books(MockBookService, mock_db_scope, controller, mock_context):
+    mock_db = MagicMock()
+    mock_db_scope.return_value.__enter__.return_value = mock_db
+    mock_service_instance = MockBookService.return_value
+
+    mock_book = MagicMock()
+    mock_book.id = "b1"
+    mock_book.title = "T1"
+    mock_book.author = None
+    mock_book.genres = []
+    mock_book.copies = []
+    mock_book.isbn = "123"
+    mock_service_instance.stream_books.return_value = iter([mock_book])
+
+    request = library_pb2.StreamBooksRequest(chunk_size=50)
+    response = list(controller.StreamBooks(request, mock_context))
+
+    assert [b.title for b in response] == ["T1"]
+    mock_service_instance.stream_books.assert_called_with(50)
+
+@patch('backend.api.service.db_scope')
+@patch('backend.api.service.MemberService')
+def test_stream_members_default_chunk_size(MockMemberService, mock_db_scope, controller, mock_context):
+    mock_db = MagicMock()
+    mock_db_scope.return_value.__enter__.return_value = mock_db
+    mock_service_instance = MockMemberService.return_value
+    mock_service_instance.stream_members.return_value = iter([MemberModel(id="m1", name="N1", email="e1")])
+
+    response = list(controller.StreamMembers(library_pb2.StreamMembersRequest(), mock_context))
+
+    assert response[0].email == "e1"
+    mock_service_instance.stream_members.assert_called_with(500)
+
+@pytest.fixture
+def seeded_scope(db_session, monkeypatch):
+    # Real SQLite session behind the controller, so statements can be counted
+    from contextlib import contextmanager
+    from backend.core.database import BookCopyModel
+
+    @contextmanager
+    def scope():
+        yield db_session
+
+    monkeypatch.setattr("backend.api.service.db_scope", scope)
+    author = AuthorModel(name="Budget Author")
+    genres = [GenreModel(name=f"Budget Genre {i}") for i in range(3)]
+    member = MemberModel(name="Budget Member", email="budget@example.com")
+    db_session.add_all([author, member, *genres])
+    for i in range(5):
+        book = BookMetadataModel(title=f"Budget Book {i}", isbn=f"97800000000{i:02d}", author=author, genres=genres)
+        copy = BookCopyModel(metadata_rec=book, is_available=False)
+        db_session.add_all([book, copy, BookCopyModel(metadata_rec=book)])
+        db_session.add(LoanModel(copy=copy, member=member))
+    db_session.commit()
+    db_session.expunge_all()
+    return member
+
+def test_list_books_query_budget(seeded_scope, controller, mock_context, assert_max_queries):
+    # count + books/author join + genres + copies, independent of page size
+    with assert_max_queries(4):
+        response = controller.ListBooks(library_pb2.ListBooksRequest(page=1, limit=10), mock_context)
+
+    assert len(response.books) == 5
+    assert all(len(b.genres) == 3 and b.total_copies == 2 for b in response.books)
+
+def test_list_all_loans_query_budget(seeded_scope, controller, mock_context, assert_max_queries):
+    # count + loans + one batched lookup each for copies (with titles) and members
+    with assert_max_queries(4):
+        response = controller.ListAllLoans(library_pb2.ListAllLoansRequest(page=1, limit=10), mock_context)
+
+    assert len(response.loans) == 5
+    assert all(l.member_name == "Budget Member" and l.book_title.startswith("Budget Book") for l in response.loans)
+
+def test_create_rpcs_query_budget(seeded_scope, controller, mock_context, db_session, assert_max_queries):
+    # Ids are generated client-side, so a create is its INSERT with no refresh SELECT after it
+    book_id = db_session.query(BookMetadataModel.id).filter_by(title="Budget Book 0").scalar()
+    member_id = db_session.query(MemberModel.id).scalar()
+    db_session.expunge_all()
+
+    with assert_max_queries(2):  # duplicate-name check + insert
+        controller.CreateAuthor(library_pb2.CreateAuthorRequest(name="New Author"), mock_context)
+    with assert_max_queries(2):
+        controller.CreateGenre(library_pb2.CreateGenreRequest(name="New Genre"), mock_context)
+    with assert_max_queries(1):
+        controller.CreateMember(library_pb2.CreateMemberRequest(name="New", email="new@example.com"), mock_context)
+    with assert_max_queries(2):  # book lookup + insert
+        copy = controller.AddBookCopy(library_pb2.AddBookCopyRequest(book_id=book_id), mock_context)
+    # validators (book, available copy, member) + copy pick + book title + copy update + loan insert
+    # + circulation counter upsert
+    with assert_max_queries(8):
+        loan = controller.BorrowBook(library_pb2.BorrowBookRequest(book_id=book_id, member_id=member_id), mock_context)
+
+    assert copy.book_id == book_id and copy.is_available
+    assert loan.book_title == "Budget Book 0" and loan.borrowed_at
+
+def test_bulk_copy_creation(seeded_scope, controller, mock_context, db_session, assert_max_queries):
+    from backend.core.database import BookCopyModel
+    book_id = db_session.query(BookMetadataModel.id).filter_by(title="Budget Book 0").scalar()
+    db_session.expunge_all()
+
+    with assert_max_queries(2):  # book lookup + one batched insert
+        response = controller.AddBookCopies(library_pb2.AddBookCopiesRequest(book_id=book_id, count=500), mock_context)
+    assert len(set(response.copy_ids)) == 500
+    assert db_session.query(BookCopyModel).filter_by(book_metadata_id=book_id).count() == 502
+
+    # Each initial copy is inserted once
+    book = controller.CreateBook(library_pb2.CreateBookRequest(title="Stocked", isbn="9781111111111", initial_copies=5), mock_context)
+    assert (book.total_copies, book.available_copies) == (5, 5)
+    assert db_session.query(BookCopyModel).filter_by(book_metadata_id=book.id).count() == 5
@@ -56,13 +56,14 @@ class TestLoanService:
             assert response.loans[0].member_email == "Member Email"
             assert response.loans[0].returned_at == ""
             MockLoanService.assert_called_once()
-            mock_loan_service.list_all_loans.assert_called_with(page=1, limit=10)
+            mock_loan_service.list_all_loans.assert_called_with(page=1, limit=10, fields=None)
 
     def test_return_book(self, service, mock_db_scope):
         mock_db = MagicMock()
         mock_db_scope.return_value.__enter__.return_value = mock_db
         
-        with patch('backend.api.service.LoanService') as MockLoanService:
+        with patch('backend.api.service.LoanService') as MockLoanService, \
+                patch('backend.api.service.get_loaders') as mock_get_loaders:
             mock_loan_service = MockLoanService.return_value
             
             mock_loan = MagicMock()
@@ -75,13 +76,14 @@ class TestLoanService:
             
             mock_copy = MagicMock()
             mock_copy.metadata_rec.title = "Test Book"
-            mock_db.query.return_value.filter_by.return_value.first.return_value = mock_copy
+            mock_get_loaders.return_value.copies.load.return_value = mock_copy
 
             request = library_pb2.ReturnBookRequest(loan_id="loan1")
             response = service.ReturnBook(request, None)
             
             assert response.id == "loan1"
             assert response.returned_at != ""
+            assert response.book_title == "Test Book"
             mock_loan_service.return_book.assert_called_with("loan1")
 
     def test_list_member_loans(self, service, mock_db_scope):
@@ -101,4 +103,4 @@ class TestLoanService:
             response = service.ListMemberLoans(request, None)
             
             assert len(response.loans) == 0
-            mock_loan_service.list_member_loans.assert_called_with("m1", page=1, limit=10)
+            mock_loan_service.list_member_loans.assert_called_with("m1", page=1, limit=10, fields=None)
@@ -0,0 +1,103 @@
+import time
+import grpc
+import pytest
+from unittest.mock import MagicMock
+from backend.api.middleware import GlobalGrpcInterceptor
+from backend.core.admission import (AdaptiveLimit, AdmissionController, FixedLimit, QueueTimingExecutor, enqueued_at,
+                                    BULK, CRITICAL, DEFAULT)
+from backend.core.exceptions import OverloadedError
+
+def controller(limit=10, **kwargs):
+    return AdmissionController(FixedLimit(limit), ["BorrowBook", "ReturnBook"], **kwargs)
+
+def test_methods_are_assigned_to_lanes():
+    admission = controller()
+    assert admission.lane("BorrowBook") == CRITICAL
+    assert admission.lane("ListBooks") == BULK
+    assert admission.lane("StreamMembers") == BULK
+    assert admission.lane("CreateBook") == DEFAULT
+
+def test_bulk_lane_is_shed_before_critical():
+    admission = controller(limit=4, bulk_share=0.5)
+    admission.acquire("ListBooks")
+    admission.acquire("ListBooks")
+
+    with pytest.raises(OverloadedError):
+        admission.acquire("ListLoans")
+    # The remaining slots stay available to circulation
+    admission.acquire("BorrowBook")
+    admission.acquire("ReturnBook")
+    with pytest.raises(OverloadedError):
+        admission.acquire("BorrowBook")
+
+    admission.release("ListBooks")
+    assert admission.acquire("BorrowBook") == CRITICAL
+
+def test_per_method_limit():
+    admission = controller(method_limits={"StreamBooks": 1})
+    admission.acquire("StreamBooks")
+
+    with pytest.raises(OverloadedError):
+        admission.acquire("StreamBooks")
+    admission.acquire("StreamMembers")
+
+    admission.release("StreamBooks")
+    admission.acquire("StreamBooks")
+
+def test_adaptive_limit_backs_off_and_recovers():
+    limit = AdaptiveLimit(10, min_limit=2, max_limit=10, target_latency=0.1)
+    limit.on_sample("GetBook", 0.01)
+    for _ in range(5):
+        limit.on_sample("GetBook", 0.5)
+    assert limit.limit == 5
+
+    for _ in range(20):
+        limit.on_sample("GetBook", 0.5)
+    assert limit.limit == 2
+
+    for _ in range(200):
+        limit.on_sample("GetBook", 0.01)
+    assert limit.limit == 10
+
+def test_adaptive_limit_ignores_methods_slow_by_nature():
+    limit = AdaptiveLimit(10, min_limit=2, max_limit=10, target_latency=0.1)
+    for i in range(1000):
+        # One call in five is a report that always takes about a second
+        if i % 5 == 0:
+            limit.on_sample("GetLibraryStats", 1.0 + (i % 3) * 0.1)
+        else:
+            limit.on_sample("GetBook", 0.01)
+    assert limit.limit == 10
+
+def test_bulk_lane_latency_does_not_feed_the_limit():
+    limiter = MagicMock(limit=10)
+    admission = AdmissionController(limiter, ["BorrowBook"])
+    for name in ("ListBooks", "BorrowBook"):
+        admission.acquire(name)
+        admission.release(name, 5.0)
+
+    limiter.on_sample.assert_called_once_with("BorrowBook", 5.0)
+
+def test_queue_timing_executor_records_when_calls_were_queued():
+    with QueueTimingExecutor(max_workers=1) as executor:
+        before = time.perf_counter()
+        enqueued = executor.submit(enqueued_at).result()
+
+    assert before <= enqueued <= time.perf_counter()
+    assert enqueued_at() is None
+
+def test_interceptor_rejects_with_resource_exhausted_and_releases_slots(invoke_unary):
+    admission = controller(limit=2, bulk_share=0.5)
+    interceptor = GlobalGrpcInterceptor(admission)
+    admission.acquire("ListBooks")
+    behavior = MagicMock(return_value="ok")
+
+    _, context = invoke_unary(behavior, method="/library.LibraryService/ListMembers", interceptor=interceptor)
+
+    behavior.assert_not_called()
+    context.abort.assert_called_once()
+    assert context.abort.call_args[0][0] == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+    result, _ = invoke_unary(behavior, method="/library.LibraryService/BorrowBook", interceptor=interceptor)
+    assert result == "ok"
+    assert admission.inflight == 1
@@ -0,0 +1,28 @@
+import pytest
+from backend.core.config import Config, settings
+
+@pytest.fixture
+def db_settings(monkeypatch):
+    def apply(url, driver="psycopg", threshold=5):
+        monkeypatch.setattr(settings, "DATABASE_URL", url)
+        monkeypatch.setattr(settings, "DB_DRIVER", driver)
+        monkeypatch.setattr(settings, "DB_PREPARE_THRESHOLD", threshold)
+    return apply
+
+@pytest.mark.parametrize("url, driver, expected", [
+    ("postgresql://u:p@db:5432/lib", "psycopg", "postgresql+psycopg://u:p@db:5432/lib"),
+    ("postgres://u:p@db:5432/lib", "psycopg2", "postgresql+psycopg2://u:p@db:5432/lib"),
+    # An explicit driver in the URL is left alone
+    ("postgresql+psycopg2://u:p@db/lib", "psycopg", "postgresql+psycopg2://u:p@db/lib"),
+    ("sqlite:///:memory:", "psycopg", "sqlite:///:memory:"),
+])
+def test_database_url_applies_driver(db_settings, url, driver, expected):
+    db_settings(url, driver)
+    assert Config.get_database_url() == expected
+
+def test_negative_prepare_threshold_disables_prepares(db_settings):
+    db_settings("postgresql://db/lib", threshold=-1)
+    assert Config.get_prepare_threshold() is None
+
+    db_settings("postgresql://db/lib", threshold=0)
+    assert Config.get_prepare_threshold() == 0
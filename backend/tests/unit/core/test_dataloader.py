@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import MagicMock
+from backend.core.database.loaders import DataLoader, get_loaders
+from backend.core.database import AuthorModel, MemberModel
+
+def test_load_many_coalesces_into_one_batch():
+    batch_fn = MagicMock(side_effect=lambda ids: {i: i.upper() for i in ids if i != "missing"})
+    loader = DataLoader(batch_fn)
+
+    assert loader.load_many(["a", "b", "a", "missing"]) == ["A", "B", "A", None]
+    batch_fn.assert_called_once_with(["a", "b", "missing"])
+
+def test_results_and_misses_are_cached():
+    batch_fn = MagicMock(side_effect=lambda ids: {i: i for i in ids if i == "a"})
+    loader = DataLoader(batch_fn)
+    loader.load_many(["a", "missing"])
+
+    assert loader.load("a") == "a"
+    assert loader.load("missing") is None
+    batch_fn.assert_called_once()
+
+def test_enqueue_then_dispatch():
+    batch_fn = MagicMock(return_value={})
+    loader = DataLoader(batch_fn)
+    loader.enqueue(["x", None]).enqueue(["y"]).dispatch()
+
+    batch_fn.assert_called_once_with(["x", "y"])
+
+def test_prime_skips_lookup():
+    batch_fn = MagicMock(return_value={})
+    loader = DataLoader(batch_fn)
+    loader.prime("k", "v")
+
+    assert loader.load("k") == "v"
+    batch_fn.assert_not_called()
+
+def test_request_loaders_use_identity_map(db_session):
+    db_session.add_all([MemberModel(id="m1", name="N1", email="e1@x.com"), MemberModel(id="m2", name="N2", email="e2@x.com")])
+    db_session.commit()
+    db_session.expunge_all()
+
+    loaders = get_loaders(db_session)
+    assert get_loaders(db_session) is loaders
+
+    first = db_session.get(MemberModel, "m1")
+    members = loaders.members.load_many(["m1", "m2", "nope"])
+    assert members[0] is first
+    assert members[1].name == "N2"
+    assert members[2] is None
@@ -0,0 +1,96 @@
+import time
+import grpc
+import pytest
+import sqlite3
+from unittest.mock import MagicMock
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from backend.core import utils
+from backend.core.context import deadline_ctx_var
+from backend.core.database.infrastructure.session import DeadlineQueuePool
+from backend.core.exceptions import DeadlineExceededError
+
+@pytest.fixture
+def deadline():
+    tokens = []
+
+    def set_remaining(seconds):
+        tokens.append(deadline_ctx_var.set(time.monotonic() + seconds))
+
+    yield set_remaining
+    for token in reversed(tokens):
+        deadline_ctx_var.reset(token)
+
+def test_expired_call_is_rejected_before_the_handler_runs(invoke_unary):
+    behavior = MagicMock()
+
+    _, context = invoke_unary(behavior, method="/library.LibraryService/ListAllLoans", time_remaining=-0.01)
+
+    behavior.assert_not_called()
+    assert context.abort.call_args[0][0] == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert deadline_ctx_var.get() is None
+
+def test_handler_sees_the_request_deadline(invoke_unary):
+    seen = []
+    invoke_unary(lambda request, context: seen.append(utils.time_remaining()), time_remaining=5.0)
+
+    assert 4.0 < seen[0] <= 5.0
+
+def test_db_scope_fails_fast_after_the_deadline(deadline, monkeypatch):
+    scoped = MagicMock()
+    monkeypatch.setattr(utils, "ScopedSession", scoped)
+    deadline(-1)
+
+    with pytest.raises(DeadlineExceededError):
+        with utils.db_scope():
+            pass
+    scoped.assert_not_called()
+
+def test_pool_wait_is_bounded_by_the_deadline(deadline):
+    pool = DeadlineQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=30)
+    held = pool.connect()
+    deadline(0.05)
+
+    start = time.perf_counter()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+
+    assert time.perf_counter() - start < 1
+    assert pool.timeout() == 30
+    held.close()
+
+def test_statement_timeout_is_set_from_remaining_time(deadline):
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    deadline(2.5)
+
+    utils._apply_statement_timeout(session)
+
+    statement, params = session.execute.call_args[0]
+    assert "set_config('statement_timeout'" in str(statement)
+    assert 2000 < int(params["ms"]) <= 2500
+
+def test_statement_timeout_is_skipped_on_sqlite(deadline):
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "sqlite"
+    deadline(2.5)
+
+    utils._apply_statement_timeout(session)
+
+    session.execute.assert_not_called()
+
+def test_call_without_a_deadline_has_no_deadline(invoke_unary):
+    # A real server reports ~9.2e18 s remaining, not None, when the client set no deadline
+    seen = []
+    _, context = invoke_unary(lambda request, context: seen.append(utils.time_remaining()))
+
+    assert seen == [None]
+    context.abort.assert_not_called()
+
+def test_statement_timeout_is_capped_at_the_postgres_maximum(deadline):
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    deadline(10 ** 7)
+
+    utils._apply_statement_timeout(session)
+
+    assert int(session.execute.call_args[0][1]["ms"]) == 2**31 - 1
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from backend.core.config import settings
+from backend.core.database import diagnostics
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:")
+    diagnostics.install(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (name) VALUES ('a'), ('b'), ('c')"))
+    return engine
+
+def test_statement_shape_collapses_in_lists():
+    assert diagnostics.statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?)") == \
+        diagnostics.statement_shape("SELECT * FROM t WHERE id IN (?)")
+
+def test_watch_request_flags_repeated_statements(engine, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_REPEAT_THRESHOLD", 2)
+    with patch.object(diagnostics, "logger") as logger:
+        with diagnostics.watch_request("/library.LibraryService/ListAllLoans") as recorder:
+            with engine.connect() as conn:
+                for i in range(1, 4):
+                    conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": i})
+
+    assert recorder.count == 3
+    message = logger.warning.call_args[0]
+    assert message[0].startswith("Possible N+1")
+    assert message[2] == 3
+
+def test_watch_request_flags_budget_overrun(engine, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET", 1)
+    with patch.object(diagnostics, "logger") as logger:
+        with diagnostics.watch_request("/svc/Method"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+    assert "budget" in logger.warning.call_args_list[0][0][0]
+
+def test_slow_statement_logged_with_params_and_plan(engine, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_SLOW_MS", 0.0)
+    with patch.object(diagnostics, "logger") as logger:
+        with diagnostics.record():
+            with engine.connect() as conn:
+                conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": 2})
+
+    args = logger.warning.call_args[0]
+    assert args[0].startswith("Slow statement")
+    assert args[3] == (2,)
+    assert "SCAN" in args[4] or "SEARCH" in args[4]
+
+def test_failed_explain_leaves_the_transaction_usable(engine):
+    with engine.connect() as conn:
+        conn.execute(text("INSERT INTO items (name) VALUES ('d')"))
+        plan = diagnostics._explain(conn, "SELECT missing FROM items", ())
+
+        assert "EXPLAIN failed" in plan
+        assert conn.execute(text("SELECT count(*) FROM items")).scalar() == 4
+        conn.rollback()
+        assert conn.execute(text("SELECT count(*) FROM items")).scalar() == 3
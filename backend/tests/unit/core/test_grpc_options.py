@@ -0,0 +1,69 @@
+import grpc
+from unittest.mock import MagicMock, patch
+from backend.api.middleware import GlobalGrpcInterceptor
+from backend.core import grpc_options
+from backend.core.grpc_options import CompressionPolicy
+from backend.generated import library_pb2
+
+def grpc_config(**overrides):
+    config = {
+        "compression": "none", "compression_min_bytes": 4096, "compression_methods": [],
+        "max_message_bytes": 1024, "keepalive_time_ms": 30000, "keepalive_timeout_ms": 5000,
+        "keepalive_permit_without_calls": False, "max_connection_idle_ms": 0,
+        "max_connection_age_ms": 0, "max_connection_age_grace_ms": 0,
+        "http2_bdp_probe": True, "http2_stream_window_bytes": 0,
+    }
+    config.update(overrides)
+    return patch.object(grpc_options.Config, "get_grpc_config", return_value=config)
+
+def test_policy_compresses_only_large_responses(grpc_context):
+    policy = CompressionPolicy(grpc.Compression.Gzip, min_bytes=100)
+    small, large = grpc_context(), grpc_context()
+
+    policy.compress_response(small, library_pb2.Book(title="x"))
+    policy.compress_response(large, library_pb2.Book(title="x" * 200))
+
+    small.set_compression.assert_not_called()
+    large.set_compression.assert_called_once_with(grpc.Compression.Gzip)
+
+def test_policy_method_selection():
+    assert CompressionPolicy(grpc.Compression.Gzip).applies_to("GetBook")
+    policy = CompressionPolicy(grpc.Compression.Deflate, methods=["ListBooks"])
+    assert policy.applies_to("ListBooks")
+    assert not policy.applies_to("GetBook")
+
+def test_compression_policy_from_config():
+    with grpc_config():
+        assert grpc_options.compression_policy() is None
+    with grpc_config(compression="deflate", compression_min_bytes=10, compression_methods=["ListBooks"]):
+        policy = grpc_options.compression_policy()
+    assert policy.algorithm == grpc.Compression.Deflate
+    assert policy.min_bytes == 10
+    assert policy.methods == {"ListBooks"}
+
+def test_server_and_channel_options():
+    with grpc_config(max_connection_age_ms=600000, http2_stream_window_bytes=1 << 20):
+        server = dict(grpc_options.server_options())
+        channel = dict(grpc_options.channel_options())
+
+    assert server["grpc.max_receive_message_length"] == channel["grpc.max_send_message_length"] == 1024
+    assert server["grpc.max_connection_age_ms"] == 600000
+    assert "grpc.max_connection_idle_ms" not in server
+    # The server tolerates pings as often as clients send them
+    assert server["grpc.http2.min_ping_interval_without_data_ms"] == channel["grpc.keepalive_time_ms"] == 30000
+    assert channel["grpc.http2.lookahead_bytes"] == 1 << 20
+
+def test_interceptor_compresses_selected_methods(grpc_context):
+    interceptor = GlobalGrpcInterceptor(compression=CompressionPolicy(grpc.Compression.Gzip, methods=["ListBooks"]))
+    handler = grpc.unary_unary_rpc_method_handler(lambda request, context: library_pb2.Book(title="x"))
+    stream = grpc.unary_stream_rpc_method_handler(lambda request, context: iter([library_pb2.Book()]))
+    listed, other, streamed = grpc_context(), grpc_context(), grpc_context()
+
+    interceptor.intercept_service(lambda d: handler, MagicMock(method="/svc/ListBooks")).unary_unary(None, listed)
+    interceptor.intercept_service(lambda d: handler, MagicMock(method="/svc/GetBook")).unary_unary(None, other)
+    list(GlobalGrpcInterceptor(compression=CompressionPolicy(grpc.Compression.Deflate))
+         .intercept_service(lambda d: stream, MagicMock(method="/svc/StreamBooks")).unary_stream(None, streamed))
+
+    listed.set_compression.assert_called_once_with(grpc.Compression.Gzip)
+    other.set_compression.assert_not_called()
+    streamed.set_compression.assert_called_once_with(grpc.Compression.Deflate)
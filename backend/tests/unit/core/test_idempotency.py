@@ -0,0 +1,76 @@
+import pytest
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+from backend.api.service import LibraryService
+from backend.core import idempotency
+from backend.core.idempotency import IdempotencyKeys
+from backend.core.exceptions import ConflictError
+from backend.core.database import BookMetadataModel, BookCopyModel, MemberModel, LoanModel
+from backend.generated import library_pb2
+
+def keyed_context(key):
+    context = MagicMock()
+    context.invocation_metadata.return_value = (("x-idempotency-key", key),)
+    return context
+
+def test_repeated_key_replays_the_stored_response(db_session):
+    keys = IdempotencyKeys(ttl_seconds=60, purge_interval_seconds=60)
+    handler = MagicMock(return_value=library_pb2.Loan(id="loan-1"))
+    request = library_pb2.ReturnBookRequest(loan_id="loan-1")
+
+    first = keys.run(db_session, keyed_context("k1"), "ReturnBook", request, library_pb2.Loan, handler)
+    again = keys.run(db_session, keyed_context("k1"), "ReturnBook", request, library_pb2.Loan, handler)
+
+    assert first == again and again.id == "loan-1"
+    assert handler.call_count == 1
+    # Same key on another method is a different key
+    keys.run(db_session, keyed_context("k1"), "BorrowBook", request, library_pb2.Loan, handler)
+    assert handler.call_count == 2
+
+def test_key_reused_for_a_different_request_is_rejected(db_session):
+    keys = IdempotencyKeys(ttl_seconds=60, purge_interval_seconds=60)
+    handler = MagicMock(return_value=library_pb2.Loan(id="loan-1"))
+    keys.run(db_session, keyed_context("k1"), "ReturnBook", library_pb2.ReturnBookRequest(loan_id="a"), library_pb2.Loan, handler)
+
+    with pytest.raises(ConflictError):
+        keys.run(db_session, keyed_context("k1"), "ReturnBook", library_pb2.ReturnBookRequest(loan_id="b"), library_pb2.Loan, handler)
+
+def test_expired_keys_are_reclaimed_and_purged(db_session):
+    keys = IdempotencyKeys(ttl_seconds=60, purge_interval_seconds=30)
+    request = library_pb2.ReturnBookRequest(loan_id="a")
+    with patch.object(idempotency.time, "time", return_value=1000.0):
+        keys.run(db_session, keyed_context("old"), "ReturnBook", request, library_pb2.Loan, lambda: library_pb2.Loan(id="1"))
+        keys.run(db_session, keyed_context("k"), "ReturnBook", request, library_pb2.Loan, lambda: library_pb2.Loan(id="1"))
+    with patch.object(idempotency.time, "time", return_value=1061.0):
+        # Past the TTL the key runs again, and the purge dropped the other expired row
+        response = keys.run(db_session, keyed_context("k"), "ReturnBook", request, library_pb2.Loan, lambda: library_pb2.Loan(id="2"))
+
+    assert response.id == "2"
+    assert db_session.execute(idempotency.text("SELECT key FROM idempotency_keys")).scalars().all() == ["ReturnBook:k"]
+
+def test_retried_borrow_and_return_have_no_side_effects(db_session, monkeypatch):
+    @contextmanager
+    def scope():
+        try:
+            yield db_session
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
+
+    monkeypatch.setattr("backend.api.service.db_scope", scope)
+    book = BookMetadataModel(title="Retry", isbn="9780000000001", copies=[BookCopyModel(), BookCopyModel()])
+    member = MemberModel(name="Retry", email="retry@example.com")
+    db_session.add_all([book, member])
+    db_session.commit()
+    service = LibraryService(IdempotencyKeys(ttl_seconds=60, purge_interval_seconds=60))
+    borrow = library_pb2.BorrowBookRequest(book_id=book.id, member_id=member.id)
+
+    loan = service.BorrowBook(borrow, keyed_context("b1"))
+    assert service.BorrowBook(borrow, keyed_context("b1")) == loan
+    assert db_session.query(LoanModel).count() == 1
+
+    returned = service.ReturnBook(library_pb2.ReturnBookRequest(loan_id=loan.id), keyed_context("r1"))
+    # The loan row is gone, but the retry gets the first response instead of NOT_FOUND
+    assert service.ReturnBook(library_pb2.ReturnBookRequest(loan_id=loan.id), keyed_context("r1")) == returned
+    assert db_session.query(LoanModel).count() == 0
@@ -0,0 +1,78 @@
+import io
+import json
+import logging
+import queue
+from backend.core.context import request_id_ctx_var
+from backend.core.logger import BoundedQueueHandler, ContextFilter, JsonFormatter, configure_logging, stop_logging
+
+def make_logger(name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addFilter(ContextFilter())
+    return logger
+
+def test_async_json_output_keeps_request_id():
+    stream = io.StringIO()
+    logger = configure_logging(make_logger("test_async_json"), fmt="json", use_queue=True, stream=stream)
+
+    token = request_id_ctx_var.set("req-123")
+    try:
+        logger.info("Processing request: %s", "/library.LibraryService/ListBooks")
+    finally:
+        request_id_ctx_var.reset(token)
+    stop_logging(logger)
+
+    entry = json.loads(stream.getvalue())
+    assert entry["request_id"] == "req-123"
+    assert entry["level"] == "INFO"
+    assert entry["msg"] == "Processing request: /library.LibraryService/ListBooks"
+
+def test_full_queue_drops_and_counts():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), policy="drop")
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "msg %s", ("a",), None)
+
+    handler.handle(record)
+    handler.handle(record)
+
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+def test_drops_are_reported_once_the_queue_has_room():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), policy="drop")
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "msg %s", ("a",), None)
+    for _ in range(4):
+        handler.handle(record)
+    handler.queue.get_nowait()
+    handler.queue.get_nowait()
+
+    handler.handle(record)
+
+    warning, queued = handler.queue.get_nowait(), handler.queue.get_nowait()
+    assert warning.levelno == logging.WARNING
+    assert warning.getMessage() == "Dropped 2 log records: log queue full"
+    assert queued is record
+    assert handler.reported == handler.dropped == 2
+
+def test_records_are_queued_unformatted():
+    handler = BoundedQueueHandler(queue.Queue(), policy="block")
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "copies: %d", (3,), None)
+
+    handler.handle(record)
+    queued = handler.queue.get_nowait()
+
+    assert queued.msg == "copies: %d" and queued.args == (3,)
+    assert queued.getMessage() == "copies: 3"
+
+def test_exception_text_rendered_before_enqueue():
+    handler = BoundedQueueHandler(queue.Queue(), policy="drop")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        import sys
+        record = logging.LogRecord("x", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+    handler.handle(record)
+
+    queued = handler.queue.get_nowait()
+    assert queued.exc_info is None
+    assert "RuntimeError: boom" in JsonFormatter().format(queued)
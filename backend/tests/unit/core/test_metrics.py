@@ -0,0 +1,52 @@
+import urllib.request
+from backend.core import metrics
+from backend.core.metrics import Counter, Histogram, Gauge, Registry
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    hist = registry.register(Histogram("rpc_seconds", "RPC time.", ("method",), buckets=(0.1, 1)))
+    hist.observe(0.05, "/Get")
+    hist.observe(0.1, "/Get")
+    hist.observe(5, "/Get")
+
+    text = registry.render()
+    assert '# TYPE rpc_seconds histogram' in text
+    assert 'rpc_seconds_bucket{method="/Get",le="0.1"} 2' in text
+    assert 'rpc_seconds_bucket{method="/Get",le="1.0"} 2' in text
+    assert 'rpc_seconds_bucket{method="/Get",le="+Inf"} 3' in text
+    assert 'rpc_seconds_count{method="/Get"} 3' in text
+
+def test_counter_and_gauge_render():
+    registry = Registry()
+    counter = registry.register(Counter("errors_total", "Errors.", ("code",)))
+    counter.inc('NOT"FOUND')
+    registry.register(Gauge("pool_size", "Pool size.", lambda: 5))
+
+    text = registry.render()
+    assert 'errors_total{code="NOT\\"FOUND"} 1' in text
+    assert 'pool_size 5' in text
+
+def test_request_accounting_collects_statements():
+    before = metrics.REQUEST_STATEMENTS.count("/test.Accounting")
+    token = metrics.start_request()
+    metrics.record_statement(0.002)
+    metrics.record_statement(0.003)
+    metrics.finish_request(token, "/test.Accounting", "OK", 0.01)
+
+    assert metrics.REQUEST_STATEMENTS.count("/test.Accounting") == before + 1
+    assert metrics.RPC_HANDLED.value("/test.Accounting", "OK") >= 1
+    # Statements outside a request still count globally but not per request
+    metrics.record_statement(0.001)
+    assert metrics.REQUEST_STATEMENTS.count("/test.Accounting") == before + 1
+
+def test_metrics_endpoint_serves_registry():
+    server = metrics.start_metrics_server(0, host="127.0.0.1")
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            body = response.read().decode()
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert "# TYPE grpc_server_handling_seconds histogram" in body
+    finally:
+        server.shutdown()
+        server.server_close()
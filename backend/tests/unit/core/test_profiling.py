@@ -0,0 +1,64 @@
+import pstats
+import time
+import pytest
+from unittest.mock import patch
+from backend.core import profiling
+from backend.core.config import Config, Settings, settings
+
+@pytest.fixture
+def profile_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILE_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "s3cret")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    return tmp_path
+
+def busy(request, context):
+    return sum(i * i for i in range(20000))
+
+def test_flagged_request_writes_pstats_keyed_by_request_id(profile_settings, invoke_unary):
+    invoke_unary(busy, [("x-profile", "1"), ("x-profile-token", "s3cret"), ("x-request-id", "req-42")])
+
+    stats = pstats.Stats(str(profile_settings / "req-42.pstats"))
+    assert any(func[2] == "busy" for func in stats.stats)
+
+def test_unflagged_request_is_not_profiled(profile_settings, invoke_unary):
+    invoke_unary(busy, [("x-request-id", "req-43")])
+
+    assert list(profile_settings.iterdir()) == []
+
+def test_token_required(profile_settings):
+    assert not profiling.should_profile({"x-profile": "1"})
+    assert not profiling.should_profile({"x-profile": "1", "x-profile-token": "guess"})
+    assert profiling.should_profile({"x-profile": "1", "x-profile-token": "s3cret"})
+
+def test_profiling_cannot_be_enabled_without_a_token(profile_settings, monkeypatch):
+    with pytest.raises(ValueError, match="PROFILE_TOKEN"):
+        Settings(PROFILE_ENABLED=True, PROFILE_TOKEN=None)
+
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", None)
+    assert not Config.is_profiling_enabled()
+    assert not profiling.should_profile({"x-profile": "1"})
+
+def test_disabled_interceptor_never_calls_profiler(profile_settings, monkeypatch, invoke_unary):
+    monkeypatch.setattr(settings, "PROFILE_ENABLED", False)
+    with patch.object(profiling, "should_profile") as should_profile:
+        invoke_unary(busy, [("x-profile", "1")])
+
+    should_profile.assert_not_called()
+
+def test_sampling_mode_writes_collapsed_stacks(profile_settings, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_MODE", "sample")
+    monkeypatch.setattr(settings, "PROFILE_INTERVAL_MS", 1.0)
+
+    def slow():
+        time.sleep(0.05)
+
+    with profiling.profile_request("../evil id", "/svc/Method"):
+        slow()
+
+    [path] = profile_settings.iterdir()
+    assert path.name == ".._evil_id.collapsed"
+    lines = path.read_text().splitlines()
+    assert lines and any("slow (" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
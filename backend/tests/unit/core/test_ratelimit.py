@@ -0,0 +1,85 @@
+import grpc
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from backend.api.middleware import GlobalGrpcInterceptor
+from backend.core import ratelimit
+from backend.core.ratelimit import DatabaseBucketStore, MemoryBucketStore, RateLimiter, client_identity
+from backend.core.exceptions import RateLimitedError
+
+def test_memory_bucket_allows_burst_then_refills():
+    store = MemoryBucketStore(shards=4)
+    with patch.object(ratelimit.time, "monotonic", return_value=100.0):
+        assert [store.take("k", rate=2, burst=3) for _ in range(3)] == [0, 0, 0]
+        assert store.take("k", rate=2, burst=3) == pytest.approx(0.5)
+    with patch.object(ratelimit.time, "monotonic", return_value=100.5):
+        assert store.take("k", rate=2, burst=3) == 0
+        assert store.take("k", rate=2, burst=3) > 0
+
+def test_memory_store_forgets_full_buckets():
+    store = MemoryBucketStore(shards=1, max_keys_per_shard=2)
+    with patch.object(ratelimit.time, "monotonic", return_value=0.0):
+        store.take("a", rate=1, burst=1)
+        store.take("b", rate=1, burst=1)
+    with patch.object(ratelimit.time, "monotonic", return_value=10.0):
+        store.take("c", rate=1, burst=1)
+
+    assert list(store._shards[0][1]) == ["c"]
+
+def test_database_bucket_is_shared_and_refills(db_session):
+    store = DatabaseBucketStore(db_session.get_bind())
+    other_process = DatabaseBucketStore(db_session.get_bind())
+    with patch.object(ratelimit.time, "time", return_value=1000.0):
+        assert store.take("client:kiosk", rate=1, burst=2) == 0
+        assert other_process.take("client:kiosk", rate=1, burst=2) == 0
+        assert store.take("client:kiosk", rate=1, burst=2) == pytest.approx(1.0)
+    with patch.object(ratelimit.time, "time", return_value=1001.0):
+        assert other_process.take("client:kiosk", rate=1, burst=2) == 0
+
+def test_database_bucket_store_purges_buckets_idle_past_refill(db_session):
+    engine = db_session.get_bind()
+    store = DatabaseBucketStore(engine, idle_seconds=10, purge_interval_seconds=60)
+    with patch.object(ratelimit.time, "time", return_value=1000.0):
+        store.take("client:gone", rate=1, burst=10)
+    with patch.object(ratelimit.time, "time", return_value=1005.0):
+        store.take("client:active", rate=1, burst=10)
+    with patch.object(ratelimit.time, "time", return_value=1070.0):
+        store.take("client:active", rate=1, burst=10)
+    with engine.connect() as conn:
+        keys = {row.key for row in conn.execute(ratelimit.text("SELECT key FROM rate_limit_buckets"))}
+    assert keys == {"client:active"}
+
+def test_loan_rpcs_are_limited_per_member_across_clients():
+    limiter = RateLimiter(MemoryBucketStore(), 100, 100, member_rate=0.001, member_burst=1, member_methods=["BorrowBook"])
+    request = SimpleNamespace(member_id="m1")
+    limiter.check("BorrowBook", "kiosk-1", request)
+
+    with pytest.raises(RateLimitedError):
+        limiter.check("BorrowBook", "kiosk-2", request)
+    limiter.check("BorrowBook", "kiosk-2", SimpleNamespace(member_id="m2"))
+    limiter.check("ListBooks", "kiosk-2", request)
+
+def test_store_failure_fails_open():
+    store = MagicMock()
+    store.take.side_effect = RuntimeError("database down")
+
+    RateLimiter(store, 1, 1, 1, 1).check("ListBooks", "kiosk")
+
+def test_client_identity_prefers_metadata_over_peer():
+    context = MagicMock()
+    context.peer.return_value = "ipv4:10.0.0.7:53211"
+
+    assert client_identity((("user-agent", "grpc"), ("x-client-id", "kiosk-3")), context) == "kiosk-3"
+    assert client_identity((), context) == "ipv4:10.0.0.7"
+
+def test_interceptor_rejects_over_limit_client(invoke_unary):
+    limiter = RateLimiter(MemoryBucketStore(), client_rate=0.001, client_burst=1, member_rate=1, member_burst=1)
+    behavior = MagicMock(return_value="ok")
+    interceptor = GlobalGrpcInterceptor(rate_limiter=limiter)
+
+    result, _ = invoke_unary(behavior, [("x-client-id", "kiosk-9")], interceptor=interceptor)
+    assert result == "ok"
+    _, context = invoke_unary(behavior, [("x-client-id", "kiosk-9")], interceptor=interceptor)
+
+    assert behavior.call_count == 1
+    assert context.abort.call_args[0][0] == grpc.StatusCode.RESOURCE_EXHAUSTED
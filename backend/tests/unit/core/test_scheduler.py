@@ -0,0 +1,41 @@
+import threading
+from backend.core.scheduler import PeriodicTask, WriteVolumeTrigger
+
+def test_periodic_task_keeps_running_after_a_failure():
+    calls = []
+    done = threading.Event()
+
+    def job():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        done.set()
+
+    task = PeriodicTask("test-task", 0.01, job).start()
+    assert done.wait(2)
+    task.stop()
+    assert len(calls) >= 2
+
+def test_trigger_runs_the_task_before_the_interval():
+    done = threading.Event()
+    task = PeriodicTask("test-trigger", 3600, done.set).start()
+    task.trigger()
+    assert done.wait(2)
+    task.stop()
+
+def test_write_volume_trigger_counts_rows_in_watched_tables(db_session):
+    from backend.core.database import BookMetadataModel, MemberModel, BookRepository
+    fired = []
+    engine = db_session.get_bind()
+    trigger = WriteVolumeTrigger({"books_metadata", "book_copies"}, 5, lambda: fired.append(1)).install(engine)
+    try:
+        db_session.add(MemberModel(name="Not watched", email="nw@example.com"))
+        book = BookMetadataModel(title="Watched", isbn="9786666666601")
+        db_session.add(book)
+        db_session.flush()
+        assert trigger.pending == 1 and not fired
+
+        BookRepository(db_session).add_copies(book.id, 4)
+        assert fired == [1] and trigger.pending == 0
+    finally:
+        trigger.uninstall(engine)
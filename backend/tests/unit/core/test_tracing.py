@@ -0,0 +1,94 @@
+import json
+import uuid
+import pytest
+from sqlalchemy import create_engine, event, text
+from backend.core import tracing
+from backend.core.database.infrastructure import session as db_session_module
+from backend.core.tracing import InMemoryExporter, OtlpJsonFileExporter, Tracer, traced
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemoryExporter()
+    monkeypatch.setattr(tracing.tracer, "exporter", exporter)
+    monkeypatch.setattr(tracing.tracer, "sample_ratio", 1.0)
+    return exporter
+
+@traced
+class Catalog:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def count(self):
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT 1")).scalar()
+
+def test_rpc_span_continues_traceparent_with_service_and_sql_children(exporter, invoke_unary):
+    engine = create_engine("sqlite:///:memory:")
+    event.listen(engine, "before_cursor_execute", db_session_module._before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", db_session_module._after_cursor_execute)
+
+    result, _ = invoke_unary(lambda request, context: Catalog(engine).count(),
+                             [("traceparent", f"00-{TRACE_ID}-{PARENT_ID}-01"), ("x-request-id", "req-1")])
+
+    assert result == 1
+    spans = {s.name: s for s in exporter.spans}
+    server, method, sql = spans["/library.LibraryService/ListBooks"], spans["Catalog.count"], spans["db.query"]
+    assert {s.trace_id for s in exporter.spans} == {TRACE_ID}
+    assert server.parent_id == PARENT_ID
+    assert method.parent_id == server.span_id
+    assert sql.parent_id == method.span_id
+    assert sql.attributes["db.statement"] == "SELECT 1"
+    assert server.attributes["rpc.grpc.status_code"] == "OK"
+
+def test_trace_id_derived_from_request_id(exporter, invoke_unary):
+    request_id = "0b5e3f4a-8f1e-4c6a-9b2d-3c4d5e6f7a8b"
+    invoke_unary(lambda request, context: None, [("x-request-id", request_id)])
+
+    assert exporter.spans[0].trace_id == request_id.replace("-", "")
+
+def test_unsampled_parent_records_nothing(exporter, invoke_unary):
+    invoke_unary(lambda request, context: None, [("traceparent", f"00-{TRACE_ID}-{PARENT_ID}-00")])
+
+    assert exporter.spans == []
+
+def test_sample_ratio_zero_records_nothing(exporter, monkeypatch, invoke_unary):
+    monkeypatch.setattr(tracing.tracer, "sample_ratio", 0.0)
+    invoke_unary(lambda request, context: None, [])
+
+    assert exporter.spans == []
+
+def test_locally_minted_request_ids_sample_at_the_configured_ratio(exporter, monkeypatch, invoke_unary):
+    monkeypatch.setattr(tracing.tracer, "sample_ratio", 0.1)
+    for _ in range(2000):
+        invoke_unary(lambda request, context: None, [])
+
+    assert 100 < len(exporter.spans) < 300
+
+@pytest.mark.parametrize("ratio", [0.1, 0.4, 0.6, 0.8])
+def test_uuid4_trace_ids_sample_at_the_configured_ratio(ratio):
+    tracer = Tracer(sample_ratio=ratio)
+    sampled = sum(tracer._sampled(uuid.uuid4().hex) for _ in range(4000))
+
+    assert abs(sampled / 4000 - ratio) < 0.05
+
+def test_traced_methods_skip_spans_outside_requests(exporter):
+    engine = create_engine("sqlite:///:memory:")
+    assert Catalog(engine).count() == 1
+    assert exporter.spans == []
+
+def test_otlp_file_exporter_writes_one_line_per_trace(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(OtlpJsonFileExporter(str(path)))
+    with tracer.server_span("/svc/Method", traceparent=f"00-{TRACE_ID}-{PARENT_ID}-01") as root:
+        root.set_attribute("rows", 3)
+        with tracer.span("child"):
+            pass
+
+    [line] = path.read_text().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["child", "/svc/Method"]
+    assert spans[1]["parentSpanId"] == PARENT_ID
+    assert {"key": "rows", "value": {"intValue": "3"}} in spans[1]["attributes"]
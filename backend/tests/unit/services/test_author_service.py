@@ -14,7 +14,7 @@ def author_service(mock_session):
 
 def test_create_author_success(author_service, mock_session):
     # Setup
-    mock_session.query.return_value.filter_by.return_value.first.return_value = None
+    mock_session.scalars.return_value.first.return_value = None
     
     # Execute
     result = author_service.create_author(name="New Author", bio="Bio")
@@ -23,11 +23,12 @@ def test_create_author_success(author_service, mock_session):
     assert result.name == "New Author"
     mock_session.add.assert_called_once()
     mock_session.commit.assert_called_once()
-    mock_session.refresh.assert_called_once()
+    mock_session.flush.assert_called_once()
+    mock_session.refresh.assert_not_called()
 
 def test_create_author_duplicate(author_service, mock_session):
     existing = AuthorModel(name="Tolkien")
-    mock_session.query.return_value.filter_by.return_value.first.return_value = existing
+    mock_session.scalars.return_value.first.return_value = existing
 
     with pytest.raises(ValidationError) as exc:
         author_service.create_author(name="Tolkien")
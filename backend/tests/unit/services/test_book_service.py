@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 from backend.services.book_service import BookService
 from backend.core.database import BookMetadataModel
 from backend.core.exceptions import ValidationError, ConflictError
+from backend.core.constants import Limits
 
 @pytest.fixture
 def mock_session():
@@ -18,8 +19,8 @@ def book_service(mock_session):
 
 def test_create_book_success(book_service, mock_session):
     # Mock Repository behavior via session
-    # get_by_isbn calls session.query...
-    mock_session.query.return_value.filter_by.return_value.first.return_value = None 
+    # get_by_isbn calls session.scalars(...).first()
+    mock_session.scalars.return_value.first.return_value = None 
     
     book = book_service.create_book(title="Test", isbn="1234567890")
     
@@ -34,7 +35,7 @@ def test_create_book_invalid_isbn(book_service):
 def test_create_book_conflict(book_service, mock_session):
     # Mock existing book
     existing_book = BookMetadataModel(isbn="1234567890")
-    mock_session.query.return_value.filter_by.return_value.first.return_value = existing_book
+    mock_session.scalars.return_value.first.return_value = existing_book
     
     with pytest.raises(ConflictError):
         book_service.create_book(title="Test", isbn="1234567890")
@@ -75,3 +76,9 @@ def test_list_copies(book_service):
     
     assert len(result['copies']) == 2
     assert result['total_count'] == 2
+
+def test_stream_books_caps_chunk_size(book_service):
+    book_service.repo = MagicMock()
+    book_service.stream_books(10**9)
+
+    book_service.repo.stream_all.assert_called_once_with(Limits.STREAM_CHUNK_SIZE_MAX)
@@ -15,7 +15,7 @@ def genre_service(mock_session):
     return GenreService(mock_session)
 
 def test_create_genre_success(genre_service, mock_session):
-    mock_session.query.return_value.filter_by.return_value.first.return_value = None
+    mock_session.scalars.return_value.first.return_value = None
     
     genre = genre_service.create_genre(name="Fiction")
     
@@ -36,7 +36,7 @@ def test_create_genre_name_too_long(genre_service):
 
 def test_create_genre_existing(genre_service, mock_session):
     existing = GenreModel(name="Fiction")
-    mock_session.query.return_value.filter_by.return_value.first.return_value = existing
+    mock_session.scalars.return_value.first.return_value = existing
     
     with pytest.raises(ValidationError) as exc:
         genre_service.create_genre(name="Fiction")
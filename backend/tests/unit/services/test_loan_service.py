@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import MagicMock
 from datetime import datetime
 from backend.services.loan_service import LoanService
-from backend.core.database import LoanModel, BookCopyModel
+from backend.core.database import LoanModel, BookCopyModel, BookMetadataModel
 from backend.core.exceptions import ValidationError, EntityNotFoundError
 
 @pytest.fixture
@@ -89,3 +89,26 @@ def test_list_member_loans(loan_service):
     assert len(result['loans']) == 2
     assert result['total_count'] == 2
     assert result['total_pages'] == 1
+
+def test_batch_borrow_validates_basket_and_member(loan_service):
+    with pytest.raises(ValidationError):
+        loan_service.batch_borrow("mem1", [])
+    with pytest.raises(ValidationError):
+        loan_service.batch_borrow("mem1", [("book1", None)] * 51)
+
+    loan_service.member_repo.get_by_id = MagicMock(return_value=None)
+    with pytest.raises(EntityNotFoundError):
+        loan_service.batch_borrow("missing", [("book1", None)])
+
+def test_batch_borrow_retries_copies_lost_to_a_concurrent_checkout(loan_service, mock_session):
+    loan_service.member_repo.get_by_id = MagicMock(return_value=MagicMock())
+    loan_service.book_repo.list_by_ids = MagicMock(return_value=[BookMetadataModel(id="book1", title="T")])
+    loan_service.book_repo.pick_available_copies = MagicMock(side_effect=[{"book1": ["c1"]}, {"book1": ["c2"]}])
+    # c1 was claimed elsewhere between the pick and the claim
+    loan_service.book_repo.claim_copies = MagicMock(side_effect=[set(), {"c2"}])
+
+    [result] = loan_service.batch_borrow("mem1", [("book1", None)])
+
+    assert result["error"] is None
+    assert result["loan"].copy_id == "c2" and result["book_title"] == "T"
+    mock_session.flush.assert_called_once()
@@ -15,8 +15,8 @@ def test_list_authors_pagination_logic(mock_session):
     # Logic: limit=5, total=12 -> pages = ceil(12/5) = 3
     
     fake_items = [AuthorModel(id=str(i), name=f"A{i}") for i in range(5)]
-    mock_session.query.return_value.count.return_value = 12
-    mock_session.query.return_value.offset.return_value.limit.return_value.all.return_value = fake_items
+    mock_session.scalar.return_value = 12
+    mock_session.scalars.return_value.all.return_value = fake_items
     
     result = service.list_authors(page=1, limit=5)
     
@@ -27,8 +27,8 @@ def test_list_authors_pagination_logic(mock_session):
 def test_list_authors_empty_pagination(mock_session):
     service = AuthorService(mock_session)
     
-    mock_session.query.return_value.count.return_value = 0
-    mock_session.query.return_value.offset.return_value.limit.return_value.all.return_value = []
+    mock_session.scalar.return_value = 0
+    mock_session.scalars.return_value.all.return_value = []
     
     result = service.list_authors(page=1, limit=10)
     
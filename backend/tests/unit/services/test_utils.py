@@ -1,5 +1,7 @@
 import pytest
-from backend.core.utils import build_paginated_response, db_scope
+from backend.core.utils import build_paginated_response, db_scope, parse_field_mask
+from backend.core.database.infrastructure.session import SessionLocal
+from backend.core.exceptions import ValidationError
 from unittest.mock import MagicMock, patch
 
 def test_build_paginated_response():
@@ -16,26 +18,56 @@ def test_build_paginated_response_zero_limit():
 
 def test_db_scope_success():
     mock_session = MagicMock()
-    mock_gen = iter([mock_session])
-    
-    with patch('backend.core.utils.get_db', return_value=mock_gen):
+    mock_session.in_transaction.return_value = False
+
+    with patch('backend.core.utils.ScopedSession', return_value=mock_session):
         with db_scope() as session:
             assert session == mock_session
+    mock_session.commit.assert_called_once()
 
 def test_db_scope_exception():
     mock_session = MagicMock()
-    # Generator that raises Exception when next() is called the second time
-    def mock_gen_func():
-        yield mock_session
-        raise Exception("Force fallback")
+    mock_session.in_transaction.return_value = False
 
-    with patch('backend.core.utils.get_db', return_value=mock_gen_func()):
-        try:
+    with patch('backend.core.utils.ScopedSession', return_value=mock_session):
+        with pytest.raises(ValueError):
             with db_scope() as session:
                 raise ValueError("Context Error")
-        except ValueError:
-            pass
-    
-    # In utils.py, the Exception("Force fallback") will be caught by "except Exception:", 
-    # and session.close() will be called.
+
+    mock_session.rollback.assert_called()
     mock_session.close.assert_called()
+
+def test_db_scope_reuses_the_thread_session(db_session):
+    import threading
+    from backend.core.utils import ScopedSession
+    ScopedSession.remove()
+    ScopedSession.configure(bind=db_session.get_bind())
+    try:
+        with db_scope() as first:
+            first.info["loaders"] = object()
+            with db_scope() as nested:
+                assert nested is not first
+        with db_scope() as second:
+            assert second is first
+            assert second.info == {}
+            assert len(second.identity_map) == 0
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(ScopedSession()))
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+    finally:
+        ScopedSession.remove()
+        ScopedSession.configure(bind=SessionLocal.kw["bind"])
+
+def test_parse_field_mask_empty_means_all():
+    assert parse_field_mask([], ["id", "title"]) is None
+
+def test_parse_field_mask_top_level_fields():
+    fields = parse_field_mask(["title", "author.name"], ["id", "title", "author"])
+    assert fields == {"id", "title", "author"}
+
+def test_parse_field_mask_unknown_field():
+    with pytest.raises(ValidationError):
+        parse_field_mask(["title", "nope"], ["id", "title"])
@@ -7,13 +7,14 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'backend/generated'))
 
 import library_pb2
 import library_pb2_grpc
+from backend.core.grpc_options import create_channel
 
 def run():
     grpc_host = os.getenv("GRPC_HOST", "localhost")
     grpc_port = os.getenv("GRPC_PORT", "50051")
     target = f"{grpc_host}:{grpc_port}"
     print(f"Connecting to server at {target}...")
-    with grpc.insecure_channel(target) as channel:
+    with create_channel(target) as channel:
         stub = library_pb2_grpc.LibraryServiceStub(channel)
         
         # 1. Create Book
@@ -106,6 +106,9 @@ export const api = {
         listMemberLoans: (memberId, params) => fetchWithContext(`${API_URL}/api/loans/${memberId}${getQueryString(params)}`).then(handleResponse),
         listAll: (params) => fetchWithContext(`${API_URL}/api/loans${getQueryString(params)}`).then(handleResponse),
     },
+    stats: {
+        get: () => fetchWithContext(`${API_URL}/api/stats`).then(handleResponse),
+    },
 };
 
 export default api;
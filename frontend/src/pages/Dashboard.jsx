@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { api } from '../api';
 import { Link } from 'react-router-dom';
-import { FaBook, FaUsers, FaPenNib, FaTags } from 'react-icons/fa';
+import { FaBook, FaUsers, FaPenNib, FaTags, FaCopy, FaExchangeAlt } from 'react-icons/fa';
 
 const StatCard = ({ title, count, icon, link, color }) => (
     <Link to={link} className={`bg-white overflow-hidden shadow rounded-lg p-5 hover:shadow-md transition duration-300 border-l-4 ${color}`}>
@@ -22,30 +22,13 @@ const StatCard = ({ title, count, icon, link, color }) => (
 );
 
 const Dashboard = () => {
-    const [stats, setStats] = useState({
-        books: null,
-        members: null,
-        authors: null,
-        genres: null
-    });
+    const [stats, setStats] = useState(null);
 
     useEffect(() => {
         const fetchStats = async () => {
-            // Fetch page 1 of each to get total_count
+            // One server-side snapshot instead of a list call per entity
             try {
-                const [books, members, authors, genres] = await Promise.all([
-                    api.books.list({ limit: 1 }),
-                    api.members.list({ limit: 1 }),
-                    api.authors.list({ limit: 1 }),
-                    api.genres.list({ limit: 1 })
-                ]);
-
-                setStats({
-                    books: books.total_count,
-                    members: members.total_count,
-                    authors: authors.total_count,
-                    genres: genres.total_count
-                });
+                setStats(await api.stats.get());
             } catch (e) {
                 console.error("Failed to fetch stats", e);
             }
@@ -53,16 +36,62 @@ const Dashboard = () => {
         fetchStats();
     }, []);
 
+    const value = (key) => (stats ? stats[key] : null);
+    const busiestDay = Math.max(1, ...(stats ? stats.loans_per_day.map(d => d.loans) : []));
+
     return (
         <div className="container mx-auto px-4 py-8">
-            <h1 className="text-3xl font-bold text-gray-800 mb-8">Dashboard</h1>
-            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
-                <StatCard title="Total Books" count={stats.books} icon={<FaBook />} link="/books" color="border-indigo-500" />
-                <StatCard title="Members" count={stats.members} icon={<FaUsers />} link="/members" color="border-green-500" />
-                <StatCard title="Authors" count={stats.authors} icon={<FaPenNib />} link="/authors" color="border-purple-500" />
-                <StatCard title="Genres" count={stats.genres} icon={<FaTags />} link="/genres" color="border-yellow-500" />
+            <h1 className="text-3xl font-bold text-gray-800 mb-2">Dashboard</h1>
+            <p className="text-sm text-gray-500 mb-8">
+                {stats ? `Updated ${new Date(stats.refreshed_at).toLocaleTimeString()}` : '\u00a0'}
+            </p>
+            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
+                <StatCard title="Total Books" count={value('total_books')} icon={<FaBook />} link="/books" color="border-indigo-500" />
+                <StatCard title="Copies Available" count={stats ? `${stats.available_copies} / ${stats.total_copies}` : null} icon={<FaCopy />} link="/books" color="border-blue-500" />
+                <StatCard title="Active Loans" count={value('active_loans')} icon={<FaExchangeAlt />} link="/loans" color="border-red-500" />
+                <StatCard title="Members" count={value('total_members')} icon={<FaUsers />} link="/members" color="border-green-500" />
+                <StatCard title="Authors" count={value('total_authors')} icon={<FaPenNib />} link="/authors" color="border-purple-500" />
+                <StatCard title="Genres" count={value('total_genres')} icon={<FaTags />} link="/genres" color="border-yellow-500" />
             </div>
 
+            {stats && (
+                <div className="mt-12 grid grid-cols-1 lg:grid-cols-2 gap-6">
+                    <div className="bg-white shadow rounded-lg p-6">
+                        <h2 className="text-xl font-semibold mb-4 text-gray-800">Most Borrowed</h2>
+                        {stats.top_titles.length === 0 ? (
+                            <p className="text-gray-500">No loans yet.</p>
+                        ) : (
+                            <ol className="space-y-2">
+                                {stats.top_titles.map((t, i) => (
+                                    <li key={t.book_id} className="flex justify-between">
+                                        <span className="text-gray-700">{i + 1}. {t.title}</span>
+                                        <span className="font-medium text-gray-900">{t.loans}</span>
+                                    </li>
+                                ))}
+                            </ol>
+                        )}
+                    </div>
+                    <div className="bg-white shadow rounded-lg p-6">
+                        <h2 className="text-xl font-semibold mb-4 text-gray-800">Loans per Day</h2>
+                        {stats.loans_per_day.length === 0 ? (
+                            <p className="text-gray-500">No loans yet.</p>
+                        ) : (
+                            <div className="space-y-1">
+                                {stats.loans_per_day.map(d => (
+                                    <div key={d.day} className="flex items-center text-sm">
+                                        <span className="w-24 text-gray-500">{d.day}</span>
+                                        <div className="flex-1 bg-gray-100 rounded h-3 mx-2">
+                                            <div className="bg-indigo-500 h-3 rounded" style={{ width: `${(d.loans / busiestDay) * 100}%` }} />
+                                        </div>
+                                        <span className="w-10 text-right text-gray-900">{d.loans}</span>
+                                    </div>
+                                ))}
+                            </div>
+                        )}
+                    </div>
+                </div>
+            )}
+
             <div className="mt-12 bg-white shadow rounded-lg p-6">
                 <h2 className="text-xl font-semibold mb-4 text-gray-800">Quick Actions</h2>
                 <div className="flex space-x-4">
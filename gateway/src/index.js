@@ -7,6 +7,11 @@ const routes = require('./routes');
 const app = express();
 const PORT = process.env.PORT;
 
+// Proxies whose X-Forwarded-For / X-Client-Id are believed (e.g. "loopback, 10.0.0.0/8"); none by default
+if (process.env.TRUST_PROXY) {
+    app.set('trust proxy', process.env.TRUST_PROXY);
+}
+
 // Middleware
 app.use(cors());
 app.use(express.json());
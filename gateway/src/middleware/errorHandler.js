@@ -26,6 +26,10 @@ const errorHandler = (err, req, res, next) => {
                 statusCode = 400;
                 errorCode = errorCode === "INTERNAL_ERROR" ? "INVALID_ARGUMENT" : errorCode;
                 break;
+            case 4: // DEADLINE_EXCEEDED
+                statusCode = 504;
+                errorCode = errorCode === "INTERNAL_ERROR" ? "DEADLINE_EXCEEDED" : errorCode;
+                break;
             case 5: // NOT_FOUND
                 statusCode = 404;
                 errorCode = errorCode === "INTERNAL_ERROR" ? "NOT_FOUND" : errorCode;
@@ -40,6 +44,10 @@ const errorHandler = (err, req, res, next) => {
             case 16: // UNAUTHENTICATED
                 statusCode = 401;
                 break;
+            case 8: // RESOURCE_EXHAUSTED (admission control shed the request)
+                statusCode = 429;
+                errorCode = errorCode === "INTERNAL_ERROR" ? "RESOURCE_EXHAUSTED" : errorCode;
+                break;
             case 14: // UNAVAILABLE
                 statusCode = 503;
                 message = "Service unavailable, please try again later";
@@ -16,8 +16,8 @@ router.get('/authors', asyncHandler(async (req, res) => {
 }));
 
 router.post('/authors', asyncHandler(async (req, res) => {
-    const { name, bio } = req.body;
-    const response = await grpcAsync(client, 'CreateAuthor', { name, bio }, req);
+    const { name, bio, upsert } = req.body;
+    const response = await grpcAsync(client, 'CreateAuthor', { name, bio, upsert: Boolean(upsert) }, req);
     res.status(201).json(response);
 }));
 
@@ -29,8 +29,8 @@ router.get('/genres', asyncHandler(async (req, res) => {
 }));
 
 router.post('/genres', asyncHandler(async (req, res) => {
-    const { name } = req.body;
-    const response = await grpcAsync(client, 'CreateGenre', { name }, req);
+    const { name, upsert } = req.body;
+    const response = await grpcAsync(client, 'CreateGenre', { name, upsert: Boolean(upsert) }, req);
     res.status(201).json(response);
 }));
 
@@ -70,8 +70,25 @@ router.put('/books/:id', asyncHandler(async (req, res) => {
     res.json(response);
 }));
 
+router.post('/books/batch', asyncHandler(async (req, res) => {
+    const { ids = [] } = req.body;
+    const response = await grpcAsync(client, 'BatchGetBooks', { ids }, req);
+    res.json(response);
+}));
+
 // --- Copies ---
+router.post('/copies/batch', asyncHandler(async (req, res) => {
+    const { ids = [] } = req.body;
+    const response = await grpcAsync(client, 'BatchGetCopies', { ids }, req);
+    res.json(response);
+}));
+
 router.post('/books/:id/copies', asyncHandler(async (req, res) => {
+    const count = parseInt((req.body || {}).count) || 1;
+    if (count > 1) {
+        const response = await grpcAsync(client, 'AddBookCopies', { book_id: req.params.id, count }, req);
+        return res.status(201).json(response);
+    }
     const response = await grpcAsync(client, 'AddBookCopy', { book_id: req.params.id }, req);
     res.status(201).json(response);
 }));
@@ -84,8 +101,8 @@ router.get('/books/:id/copies', asyncHandler(async (req, res) => {
 
 // --- Members ---
 router.post('/members', asyncHandler(async (req, res) => {
-    const { name, email } = req.body;
-    const response = await grpcAsync(client, 'CreateMember', { name, email }, req);
+    const { name, email, upsert } = req.body;
+    const response = await grpcAsync(client, 'CreateMember', { name, email, upsert: Boolean(upsert) }, req);
     res.status(201).json(response);
 }));
 
@@ -102,6 +119,12 @@ router.get('/members', asyncHandler(async (req, res) => {
     res.json(response);
 }));
 
+router.post('/members/batch', asyncHandler(async (req, res) => {
+    const { ids = [] } = req.body;
+    const response = await grpcAsync(client, 'BatchGetMembers', { ids }, req);
+    res.json(response);
+}));
+
 // --- Loans ---
 router.post('/borrow', asyncHandler(async (req, res) => {
     const { member_id, book_id, copy_id } = req.body;
@@ -115,6 +138,19 @@ router.post('/return', asyncHandler(async (req, res) => {
     res.json(response);
 }));
 
+// Checkout desk baskets: items = [{ book_id, copy_id? }], one transaction, per-item results
+router.post('/borrow/batch', asyncHandler(async (req, res) => {
+    const { member_id, items = [], all_or_nothing } = req.body;
+    const response = await grpcAsync(client, 'BatchBorrow', { member_id, items, all_or_nothing: Boolean(all_or_nothing) }, req);
+    res.json(response);
+}));
+
+router.post('/return/batch', asyncHandler(async (req, res) => {
+    const { loan_ids = [], all_or_nothing } = req.body;
+    const response = await grpcAsync(client, 'BatchReturn', { loan_ids, all_or_nothing: Boolean(all_or_nothing) }, req);
+    res.json(response);
+}));
+
 router.get('/loans', asyncHandler(async (req, res) => {
     const { page = 1, limit = 10 } = req.query;
     const response = await grpcAsync(client, 'ListAllLoans', { page: parseInt(page), limit: parseInt(limit) }, req);
@@ -127,4 +163,23 @@ router.get('/loans/:member_id', asyncHandler(async (req, res) => {
     res.json(response);
 }));
 
+// --- Dashboard ---
+router.get('/stats', asyncHandler(async (req, res) => {
+    const response = await grpcAsync(client, 'GetLibraryStats', {}, req);
+    res.json(response);
+}));
+
+// --- Reporting ---
+router.get('/reports/availability/genres', asyncHandler(async (req, res) => {
+    const { page = 1, limit = 10 } = req.query;
+    const response = await grpcAsync(client, 'ListGenreAvailability', { page: parseInt(page), limit: parseInt(limit) }, req);
+    res.json(response);
+}));
+
+router.get('/reports/availability/authors', asyncHandler(async (req, res) => {
+    const { page = 1, limit = 10 } = req.query;
+    const response = await grpcAsync(client, 'ListAuthorAvailability', { page: parseInt(page), limit: parseInt(limit) }, req);
+    res.json(response);
+}));
+
 module.exports = router;
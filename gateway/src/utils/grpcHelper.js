@@ -1,18 +1,46 @@
 const grpc = require('@grpc/grpc-js');
 
+// Per-call deadline; the backend turns the remaining time into pool and SQL statement timeouts
+const GRPC_DEADLINE_MS = parseInt(process.env.GRPC_DEADLINE_MS || '10000', 10);
+
+/**
+ * Rate-limit identity of the caller: its address (forwarded addresses are only
+ * believed from TRUST_PROXY hops). X-Client-Id is honoured only when a trusted
+ * proxy sent it; from anyone else a new value per request would mean a fresh
+ * token bucket per request.
+ */
+const clientIdentity = (req) => {
+    const trusted = req.app.get('trust proxy fn');
+    if (req.headers['x-client-id'] && trusted && trusted(req.socket.remoteAddress, 0)) {
+        return req.headers['x-client-id'];
+    }
+    return req.ip || 'gateway';
+};
+
 /**
  * Wraps a gRPC method call in a Promise for async/await usage.
  * Automatically extracts error details if they exist.
  */
 const grpcAsync = (client, method, request, req) => {
     return new Promise((resolve, reject) => {
-        // Propagate Request ID
+        // Propagate Request ID and W3C trace context
         const metadata = new grpc.Metadata();
         if (req.headers['x-request-id']) {
             metadata.add('x-request-id', req.headers['x-request-id']);
         }
+        // Client identity for per-client rate limiting
+        metadata.add('x-client-id', clientIdentity(req));
+        if (req.headers['traceparent']) {
+            metadata.add('traceparent', req.headers['traceparent']);
+        }
+        // Retry-safe borrow/return RPCs (single and batch): repeated keys get the first call's response
+        if (req.headers['idempotency-key']) {
+            metadata.add('x-idempotency-key', req.headers['idempotency-key']);
+        }
+
+        const options = GRPC_DEADLINE_MS > 0 ? { deadline: Date.now() + GRPC_DEADLINE_MS } : {};
 
-        client[method](request, metadata, (err, response) => {
+        client[method](request, metadata, options, (err, response) => {
             if (err) {
                 // Attach req for context if needed
                 err.req = req;
@@ -1,12 +1,20 @@
 import urllib.request
 import json
+import os
+
+# Send our own W3C trace context so the trace is easy to find in the backend's
+# OTLP file (run the backend with TRACING_EXPORTER=otlp_file)
+TRACE_ID = os.urandom(16).hex()
+TRACEPARENT = f"00-{TRACE_ID}-{os.urandom(8).hex()}-01"
 
 try:
     print("Sending request to Gateway...")
-    with urllib.request.urlopen('http://localhost:3001/api/books?limit=1') as response:
+    request = urllib.request.Request('http://localhost:3001/api/books?limit=1', headers={"traceparent": TRACEPARENT})
+    with urllib.request.urlopen(request) as response:
         print(f"Response Status: {response.status}")
         if response.status == 200:
             print("Success! detailed logs should be in backend container.")
+            print(f"Trace id: {TRACE_ID} (grep the TRACING_FILE for it)")
         else:
             print(f"Failed: {response.read().decode('utf-8')}")
 except Exception as e: